@@ -0,0 +1,102 @@
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class PresentationSnapshot:
+    """一次性读取的演示状态快照"""
+    connected: bool = False
+    slideshow_active: bool = False
+    current_index: int = 0
+    total_slides: int = 0
+    pointer_type: int = 0
+    presentation_path: str = ""
+
+    def diff(self, previous):
+        """返回与上一次快照相比发生变化的字段名集合"""
+        if previous is None:
+            return {f.name for f in fields(self)}
+        return {f.name for f in fields(self)
+                if getattr(self, f.name) != getattr(previous, f.name)}
+
+
+class PresentationBackend:
+    """演示程序后端接口
+
+    控制器只通过这些方法控制演示程序。各实现（Office COM、WPS COM、
+    键盘模拟、纯 Python 模拟）可以只实现自己支持的部分，未实现的操作
+    返回 False 或空值。
+    """
+    name = "base"
+
+    def __init__(self):
+        # 底层 COM Application 对象；非 COM 后端为 None
+        self.app = None
+
+    def connect(self):
+        return False
+
+    def ensure_connected(self):
+        """已连接时直接返回，否则尝试连接"""
+        return self.connect()
+
+    def ensure_alive(self):
+        """确认连接仍然可用（演示程序可能已重启），必要时重新连接"""
+        return self.ensure_connected()
+
+    def is_app_running(self):
+        """演示程序是否在运行；返回 None 表示需要控制器自行扫描进程"""
+        return None
+
+    def notify_process_appeared(self):
+        """演示进程刚出现，可立即尝试连接"""
+        pass
+
+    def snapshot(self):
+        return PresentationSnapshot()
+
+    def invalidate_view(self):
+        pass
+
+    def on_slideshow_begin(self):
+        pass
+
+    def on_slideshow_end(self):
+        pass
+
+    def next_slide(self):
+        return False
+
+    def prev_slide(self):
+        return False
+
+    def goto_slide(self, index):
+        return False
+
+    def step_slides(self, delta):
+        """相对翻页 delta 页，供合并后的连续点击使用"""
+        result = False
+        for _ in range(abs(delta)):
+            result = self.next_slide() if delta > 0 else self.prev_slide()
+        return result
+
+    def get_pointer_type(self):
+        return 0
+
+    def set_pointer_type(self, type_id):
+        return False
+
+    def set_pen_color(self, rgb_color):
+        return False
+
+    def erase_ink(self):
+        return False
+
+    def exit_show(self):
+        return False
+
+    def has_ink(self):
+        return False
+
+    def close(self):
+        """后端被替换或工作线程退出时释放资源（如按键注入线程）"""
+        pass
@@ -1,55 +1,31 @@
 import sys
 import os
-import winreg
-import psutil
-import pyautogui
 import time
+try:
+    import winreg
+except ImportError:
+    # 非 Windows 平台（如无头性能测试）没有注册表，设置使用默认值
+    winreg = None
 
 from PyQt6.QtWidgets import QApplication, QWidget, QSystemTrayIcon
-from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
 from qfluentwidgets import setTheme, Theme, SystemTrayMenu, Action
-from ui.widgets import TimerWindow, LoadingOverlay, BoardInBoardWindow
+from ui.widgets import TimerWindow, BoardInBoardWindow
+from ui.pixmap_cache import pixmap_cache
 from .ppt_client import PPTClient
-import pythoncom
-import win32gui
-import win32con
+from .keyboard_backend import KeyboardBackend
+from .com_worker import ComWorker
+from .com_metrics import metrics
+from .navigation import NavigationScheduler
+from .ppt_events import EventLatencyStats
+from .presentation_monitor import PresentationMonitor
+from .slide_export import SlideExportThread, SlideExportService
+from .thumbnail_cache import thumbnail_cache
 import os
 
-class SlideExportThread(QThread):
-    def __init__(self, cache_dir):
-        super().__init__()
-        self.cache_dir = cache_dir
-        
-    def run(self):
-        pythoncom.CoInitialize()
-        try:
-            import win32com.client
-            try:
-                app = win32com.client.GetActiveObject("PowerPoint.Application")
-            except:
-                app = win32com.client.Dispatch("PowerPoint.Application")
-                
-            if app.SlideShowWindows.Count > 0:
-                presentation = app.ActivePresentation
-                slides_count = presentation.Slides.Count
-                
-                if not os.path.exists(self.cache_dir):
-                    os.makedirs(self.cache_dir)
-                    
-                for i in range(1, slides_count + 1):
-                    thumb_path = os.path.join(self.cache_dir, f"slide_{i}.jpg")
-                    if not os.path.exists(thumb_path):
-                        try:
-                            presentation.Slides(i).Export(thumb_path, "JPG", 320, 180)
-                        except:
-                            pass
-        except Exception as e:
-            print(f"Slide export error: {e}")
-        pythoncom.CoUninitialize()
-
 class BusinessLogicController(QWidget):
-    def __init__(self):
+    def __init__(self, event_source=None, backend_factory=None):
         super().__init__()
         self.theme_mode = self.load_theme_setting()
         setTheme(self.theme_mode)
@@ -59,15 +35,31 @@ class BusinessLogicController(QWidget):
         self.setFixedSize(1, 1)
         self.move(-100, -100) 
         
-        self.ppt_client = PPTClient()
-        
         # WPS兼容模式设置
         self.wps_compatibility_mode = self.load_wps_compatibility_setting()
         
+        # 演示后端：默认按模式创建 COM 或键盘模拟后端，也可注入模拟后端
+        self.backend_factory = backend_factory or self.create_backend
+        # 演示控制命令在独立的 COM 工作线程中执行，避免阻塞界面
+        self.com_worker = ComWorker(self.backend_factory, self)
+        self.com_worker.start()
+        
+        # 连续翻页合并器，负责预测页码
+        self.navigator = NavigationScheduler(self.com_worker, self)
+        self.navigator.predicted_page_changed.connect(self.show_page_num)
+        
+        # COM调用统计（默认关闭，关闭时几乎没有额外开销）
+        metrics.enabled = self.load_com_metrics_setting()
+        
         # UI组件
         self.timer_window = None
         self.board_in_board_window = None
-        self.loading_overlay = None
+        self.loader_thread = None
+        self.export_service = None
+        
+        # 缩略图磁盘缓存：按预算淘汰最久未用的演示文稿。启动时的整理等监视线程
+        # 第一次检查之后进行，届时正在放映的演示文稿已通过 set_active 受到保护
+        thumbnail_cache.budget_bytes = self.load_thumbnail_cache_limit_setting() * 1024 * 1024
         
         # UI组件引用（将在主程序中设置）
         self.toolbar = None
@@ -75,12 +67,30 @@ class BusinessLogicController(QWidget):
         self.nav_right = None
         self.spotlight = None
         
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_state)
-        self.timer.start(500)
-        
         self.widgets_visible = False
         self.slides_loaded = False
+        
+        # 演示状态监视线程：进程检测、放映事件订阅和状态采集都不在界面线程进行。
+        # 事件源可替换为脚本化的假事件源以便测试
+        self.monitor = PresentationMonitor(backend_factory or PPTClient, event_source)
+        self.monitor.wps_compatibility_mode = self.wps_compatibility_mode
+        self.monitor.slideshow_started.connect(self.on_slideshow_started)
+        self.monitor.slideshow_ended.connect(self.on_slideshow_ended)
+        self.monitor.page_changed.connect(self.update_page_num)
+        self.monitor.pointer_changed.connect(self.sync_state)
+        # 放映事件从通知到界面线程收到更新的延迟
+        self.event_latency = EventLatencyStats()
+        self.monitor.event_delivered.connect(self.on_event_delivered)
+        self.navigator.command_completed.connect(self.on_navigation_done)
+        self.navigator.resync_requested.connect(self.monitor.request_sync)
+        self.monitor.first_check_done.connect(self.on_first_check_done)
+        self.monitor.start()
+    
+    def create_backend(self):
+        """按当前模式创建演示控制后端"""
+        if self.wps_compatibility_mode:
+            return KeyboardBackend()
+        return PPTClient()
     
     def setup_connections(self):
         """设置UI组件与业务逻辑之间的信号连接"""
@@ -126,6 +136,16 @@ class BusinessLogicController(QWidget):
         self.wps_compatibility_action = Action(self, text="WPS兼容模式", checkable=True, triggered=self.toggle_wps_compatibility_mode)
         self.wps_compatibility_action.setChecked(self.wps_compatibility_mode)
 
+        # COM调用统计选项
+        self.com_metrics_action = Action(self, text="COM调用统计", checkable=True, triggered=self.toggle_com_metrics)
+        self.com_metrics_action.setChecked(metrics.enabled)
+        export_metrics_action = Action(self, text="导出COM调用统计", triggered=self.export_com_metrics)
+
+        # 缩略图缓存统计（打开菜单时刷新）
+        self.cache_stats_action = Action(self, text="缩略图缓存")
+        self.cache_stats_action.setEnabled(False)
+        tray_menu.aboutToShow.connect(self.update_cache_stats_action)
+
         timer_action = Action(self, text="计时器", triggered=self.toggle_timer_window)
 
         self.theme_auto_action = Action(self, text="跟随系统", checkable=True, triggered=self.set_theme_auto)
@@ -138,6 +158,10 @@ class BusinessLogicController(QWidget):
         tray_menu.addSeparator()
         tray_menu.addAction(self.wps_compatibility_action)
         tray_menu.addSeparator()
+        tray_menu.addAction(self.com_metrics_action)
+        tray_menu.addAction(export_metrics_action)
+        tray_menu.addAction(self.cache_stats_action)
+        tray_menu.addSeparator()
         tray_menu.addAction(timer_action)
         tray_menu.addSeparator()
         tray_menu.addAction(self.theme_auto_action)
@@ -151,16 +175,15 @@ class BusinessLogicController(QWidget):
         self.tray_icon.show()
 
     def closeEvent(self, event):
-        self.timer.stop()
-        if self.ppt_client.app:
-            try:
-                # self.ppt_client.app.Quit() # Should not quit PPT app on helper exit?
-                pass
-            except:
-                pass
+        self.stop_loading_slides()
+        self.monitor.stop()
+        self.com_worker.stop()
+        pixmap_cache.shutdown()
         event.accept()
     
     def load_theme_setting(self):
+        if winreg is None:
+            return Theme.AUTO
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_READ)
             value, _ = winreg.QueryValueEx(key, "ThemeMode")
@@ -173,25 +196,59 @@ class BusinessLogicController(QWidget):
                     return Theme.DARK
                 if v == "auto":
                     return Theme.AUTO
-        except WindowsError:
+        except OSError:
             pass
         return Theme.AUTO
     
     def load_wps_compatibility_setting(self):
         """加载WPS兼容模式设置"""
+        if winreg is None:
+            return False
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_READ)
             value, _ = winreg.QueryValueEx(key, "WPSCompatibilityMode")
             winreg.CloseKey(key)
             return bool(value)
-        except WindowsError:
+        except OSError:
             pass
         return False  # 默认为不启用
     
+    def load_com_metrics_setting(self):
+        """加载COM调用统计开关"""
+        if winreg is None:
+            return False
+        try:
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_READ)
+            value, _ = winreg.QueryValueEx(key, "ComMetricsEnabled")
+            winreg.CloseKey(key)
+            return bool(value)
+        except OSError:
+            pass
+        return False
+    
+    def load_thumbnail_cache_limit_setting(self):
+        """加载缩略图缓存上限（MB）"""
+        default = thumbnail_cache.DEFAULT_BUDGET_MB
+        if winreg is None:
+            return default
+        try:
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_READ)
+            value, _ = winreg.QueryValueEx(key, "ThumbnailCacheLimitMB")
+            winreg.CloseKey(key)
+            # 值可能被手动写成 REG_SZ
+            value = int(value)
+            if value > 0:
+                return value
+        except (OSError, ValueError, TypeError):
+            pass
+        return default
+    
     def save_theme_setting(self, theme):
+        if winreg is None:
+            return
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_ALL_ACCESS)
-        except WindowsError:
+        except OSError:
             key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant")
         
         try:
@@ -205,9 +262,11 @@ class BusinessLogicController(QWidget):
     
     def save_wps_compatibility_setting(self, enabled):
         """保存WPS兼容模式设置"""
+        if winreg is None:
+            return
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_ALL_ACCESS)
-        except WindowsError:
+        except OSError:
             key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant")
         
         try:
@@ -216,6 +275,21 @@ class BusinessLogicController(QWidget):
         except Exception as e:
             print(f"Error saving WPS compatibility setting: {e}")
     
+    def save_com_metrics_setting(self, enabled):
+        """保存COM调用统计开关"""
+        if winreg is None:
+            return
+        try:
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant", 0, winreg.KEY_ALL_ACCESS)
+        except OSError:
+            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\SeiraiPPTAssistant")
+        
+        try:
+            winreg.SetValueEx(key, "ComMetricsEnabled", 0, winreg.REG_DWORD, 1 if enabled else 0)
+            winreg.CloseKey(key)
+        except Exception as e:
+            print(f"Error saving COM metrics setting: {e}")
+    
     def set_theme_mode(self, theme):
         self.theme_mode = theme
         setTheme(theme)
@@ -257,6 +331,8 @@ class BusinessLogicController(QWidget):
         """切换WPS兼容模式"""
         self.wps_compatibility_mode = checked
         self.save_wps_compatibility_setting(checked)
+        self.com_worker.replace_client(self.backend_factory)
+        self.monitor.set_wps_compatibility_mode(checked)
         if hasattr(self, "wps_compatibility_action"):
             self.wps_compatibility_action.setChecked(checked)
         
@@ -269,104 +345,53 @@ class BusinessLogicController(QWidget):
         else:
             self.tray_icon.showMessage("WPS兼容模式", "WPS兼容模式已禁用", QSystemTrayIcon.MessageIcon.Information, 2000)
     
-    def find_presentation_window(self):
-        """查找WPS或PowerPoint的放映窗口"""
-        windows = []
-        
-        def enum_windows_callback(hwnd, extra):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd) or ""
-                class_name = win32gui.GetClassName(hwnd) or ""
-                # 查找WPS或PowerPoint的放映窗口
-                if (any(keyword in window_text.lower() for keyword in ['wps', 'powerpoint', '演示']) or 
-                    any(keyword in class_name.lower() for keyword in ['wpp', 'powerpnt', 'presentation'])):
-                    extra.append(hwnd)
-            return True
-            
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows[0] if windows else None
+    def toggle_com_metrics(self, checked=False):
+        """切换COM调用统计"""
+        metrics.enabled = checked
+        self.save_com_metrics_setting(checked)
+        if hasattr(self, "com_metrics_action"):
+            self.com_metrics_action.setChecked(checked)
     
-    def simulate_pen_key(self):
-        """模拟笔按键"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.3)    
-            # 模拟按下Ctrl+P
-            pyautogui.hotkey('ctrl', 'p')
-        
-    def simulate_eraser_key(self):
-        """模拟橡皮按键"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.3)    
-            # 模拟按下Ctrl+E
-            pyautogui.hotkey('ctrl', 'e')
-            
-    def simulate_esc_key(self):
-        """模拟esc按键"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            
-        # 模拟按下Esc键
-        pyautogui.press('esc')
-    
-    def simulate_prev_key(self):
-        """模拟上一页按键"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.1)
-            
-        # 模拟按下左箭头键或Page Up键
-        pyautogui.press('left')
-    
-    def simulate_next_key(self):
-        """模拟下一页按键"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.1)
-            
-        # 模拟按下右箭头键或Page Down键
-        pyautogui.press('right')
-    
-    def simulate_goto_slide_key(self, index):
-        """模拟跳转到指定幻灯片"""
-        # 查找并激活演示窗口
-        hwnd = self.find_presentation_window()
-        if hwnd:
-            # 激活窗口
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.3)
-            
-            # 模拟按下Home键回到开始，然后按指定次数的右箭头键
-            pyautogui.press('home')
-            time.sleep(0.1)
-            
-            # 移动到指定幻灯片（从第1页开始）
-            for i in range(index - 1):
-                pyautogui.press('right')
-                time.sleep(0.05)
+    def export_com_metrics(self):
+        """将COM调用统计导出为JSON文件"""
+        try:
+            export_dir = os.path.join(os.environ['APPDATA'], 'PPTAssistant')
+            if not os.path.exists(export_dir):
+                os.makedirs(export_dir)
+            path = os.path.join(export_dir, 'com_metrics.json')
+            extra = {}
+            monitor_backend = self.monitor.backend
+            if hasattr(monitor_backend, "get_connection_metrics"):
+                extra["connection"] = monitor_backend.get_connection_metrics()
+            # 监视线程和 COM 工作线程各自缓存放映视图
+            view_cache = {}
+            for name, client in (("monitor", monitor_backend), ("worker", self.com_worker.client)):
+                if hasattr(client, "get_view_cache_stats"):
+                    view_cache[name] = client.get_view_cache_stats()
+            extra["view_cache"] = view_cache
+            extra["polling"] = self.monitor.poll_scheduler.get_stats()
+            extra["event_latency"] = self.event_latency.get_stats()
+            extra["process_watcher"] = self.monitor.process_watcher.get_stats()
+            extra["page_tracker"] = self.monitor.page_tracker.get_stats()
+            if self.loader_thread is not None:
+                extra["thumbnails"] = self.loader_thread.get_stats()
+            extra["thumbnail_cache"] = thumbnail_cache.get_stats()
+            extra["pixmap_cache"] = pixmap_cache.get_stats()
+            extra["publish"] = self.monitor.get_publish_stats()
+            metrics.dump_json(path, extra)
+            self.tray_icon.showMessage("COM调用统计", f"已导出到 {path}", QSystemTrayIcon.MessageIcon.Information, 2000)
+        except Exception as e:
+            print(f"Error exporting COM metrics: {e}")
+            self.show_warning(None, "导出COM调用统计失败")
     
+    def update_cache_stats_action(self):
+        stats = thumbnail_cache.get_stats()
+        pixmaps = pixmap_cache.get_stats()
+        self.cache_stats_action.setText(
+            f"缩略图缓存：{stats['entries']} 个文稿，{stats['bytes'] / 1024 / 1024:.1f} MB，"
+            f"命中率 {stats['hit_rate']:.0%}；内存 {pixmaps['resident_bytes'] / 1024 / 1024:.1f} MB，"
+            f"命中率 {pixmaps['hit_rate']:.0%}")
+
     def toggle_timer_window(self):
         if not self.timer_window:
             self.timer_window = TimerWindow()
@@ -396,36 +421,20 @@ class BusinessLogicController(QWidget):
                 self.board_in_board_window.activateWindow()
                 self.board_in_board_window.raise_()
     
-    def check_presentation_processes(self):
-        """检查演示进程并控制窗口显示"""
-        presentation_detected = False
-        
-        # 检查PowerPoint或WPS进程
-        for proc in psutil.process_iter(['name']):
-            try:
-                proc_name = proc.info.get('name', '') or ""
-                proc_name_lower = proc_name.lower()
-                
-                # 检查是否为PowerPoint或WPS演示相关进程
-                if any(keyword in proc_name_lower for keyword in ['powerpnt', 'wpp', 'wps']):
-                    presentation_detected = True
-                    break
-                    
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        return presentation_detected
-    
     def is_autorun(self):#设定程序自启动
+        if winreg is None:
+            return False
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run", 0, winreg.KEY_READ)
             winreg.QueryValueEx(key, "SeiraiPPTAssistant")
             winreg.CloseKey(key)
             return True
-        except WindowsError:
+        except OSError:
             return False
 
     def toggle_autorun(self, checked):#程序未编译下自启动
+        if winreg is None:
+            return
         app_path = os.path.abspath(sys.argv[0])
         # If running as script
         if app_path.endswith('.py'):
@@ -446,7 +455,7 @@ class BusinessLogicController(QWidget):
             else:
                 try:
                     winreg.DeleteValue(key, "SeiraiPPTAssistant")
-                except WindowsError:
+                except OSError:
                     pass
             winreg.CloseKey(key)
         except Exception as e:
@@ -463,48 +472,41 @@ class BusinessLogicController(QWidget):
             else:
                 self.tray_icon.showMessage("自启动已关闭", "程序将不会在开机时自动启动", QSystemTrayIcon.MessageIcon.Information, 2000)
 
-    def check_state(self):
-        # 检查演示进程
-        has_process = self.check_presentation_processes()
-        
-        # 在WPS兼容模式下，即使无法获取COM视图，只要检测到进程就显示控件
+    def on_user_action(self):
+        """用户点击后短时间内加快轮询，尽快反映操作结果"""
+        self.monitor.burst()
+
+    def on_first_check_done(self):
+        # 排在第一次检查发出的 slideshow_started 之后，正在放映的演示文稿已受保护
+        thumbnail_cache.compact_in_background()
+
+    def on_event_delivered(self, kind, timestamp):
+        self.event_latency.record(kind, time.perf_counter() - timestamp)
+
+    def on_slideshow_started(self, snapshot):
+        # 每次放映开始都保护正在放映的演示文稿，不依赖缩略图是否需要重新导出
+        if snapshot.presentation_path:
+            thumbnail_cache.set_active(thumbnail_cache.pack_path(snapshot.presentation_path))
         if self.wps_compatibility_mode:
-            if has_process:
-                if not self.widgets_visible:
-                    self.show_widgets_wps_mode()
-                # 在WPS模式下，我们不更新页面信息，因为使用键盘模拟
-            else:
-                if self.widgets_visible:
-                    self.hide_widgets()
+            self.show_widgets_wps_mode()
         else:
-            # 正常模式：仅在有活动放映视图时显示控件
-            view = None
-            if has_process:
-                view = self.ppt_client.get_active_view()
-                
-            if view:
-                if not self.widgets_visible:
-                    self.show_widgets()
-                
-                if self.ppt_client.app:
-                    self.nav_left.ppt_app = self.ppt_client.app
-                    self.nav_right.ppt_app = self.ppt_client.app
-                    self.update_page_num(view)
-                    self.sync_state(view)
-            else:
-                if self.widgets_visible:
-                    self.hide_widgets()
+            self.show_widgets(snapshot)
 
-    def show_widgets(self):
+    def on_slideshow_ended(self):
+        self.navigator.reset()
+        thumbnail_cache.clear_active()
+        if self.widgets_visible:
+            self.hide_widgets()
+
+    def show_widgets(self, snapshot):
         self.toolbar.show()
         self.nav_left.show()
         self.nav_right.show()
         self.adjust_positions()
         self.widgets_visible = True
         
-        # Trigger slide loading with overlay
-        if not self.slides_loaded:
-            self.start_loading_slides()
+        # 每次放映开始都检查演示文稿是否换了或保存过，由 start_loading_slides 决定是否重新导出
+        self.start_loading_slides(snapshot.presentation_path)
 
     def show_widgets_wps_mode(self):
         """在WPS兼容模式下显示控件"""
@@ -525,48 +527,59 @@ class BusinessLogicController(QWidget):
         self.wps_compatibility_shown = True
         self.tray_icon.showMessage("WPS兼容模式", "WPS兼容模式已启用，正在监听演示操作", QSystemTrayIcon.MessageIcon.Information, 2000)
 
-    def start_loading_slides(self):
+    def start_loading_slides(self, presentation_path):
+        # 演示文稿路径取自监视线程的快照，界面线程不访问 COM；幻灯片由导出线程
+        # 和按需导出服务在各自的线程中读取
         try:
-            if not self.ppt_client.app:
+            if not presentation_path:
                 return
                 
-            presentation = self.ppt_client.app.ActivePresentation
-            presentation_path = presentation.FullName
+            deck = thumbnail_cache.deck(presentation_path)
+            for nav in (self.nav_left, self.nav_right):
+                nav.slide_deck = deck
             
-            # Reset if path changed (simple check)
-            if hasattr(self, 'last_presentation_path') and self.last_presentation_path != presentation_path:
+            # 演示文稿换了或保存过（版本戳变化）时重新导出
+            if getattr(self, 'last_deck_key', None) != (deck.pack_path, deck.stamp):
                 self.slides_loaded = False
-            self.last_presentation_path = presentation_path
+            self.last_deck_key = (deck.pack_path, deck.stamp)
             
             if self.slides_loaded:
                 return
 
-            import hashlib
-            path_hash = hashlib.md5(presentation_path.encode('utf-8')).hexdigest()
-            cache_dir = os.path.join(os.environ['APPDATA'], 'PPTAssistant', 'Cache', path_hash)
-            
-            if not self.loading_overlay:
-                self.loading_overlay = LoadingOverlay()
-            
-            # Force show overlay
-            self.loading_overlay.show()
-            QApplication.processEvents() # Ensure it renders
-            
-            self.loader_thread = SlideExportThread(cache_dir)
+            # 缩略图按优先级逐张导出，不再用遮罩等待全部完成
+            self.stop_loading_slides()
+            self.loader_thread = SlideExportThread(deck, self.navigator.confirmed_index or 1)
             self.loader_thread.finished.connect(self.on_slides_loaded)
+            # 整体导出结束后，选择器缺失的缩略图由按需导出服务在后台补齐
+            self.export_service = SlideExportService()
+            for nav in (self.nav_left, self.nav_right):
+                nav.slide_exporter = self.loader_thread
+                nav.export_service = self.export_service
             self.loader_thread.start()
+            self.slides_loaded = True
             
         except Exception as e:
             print(f"Error starting slide load: {e}")
             self.slides_loaded = True # Prevent loop
 
+    def stop_loading_slides(self):
+        if self.loader_thread is not None:
+            self.loader_thread.cancel()
+            self.loader_thread.wait(2000)
+            self.loader_thread = None
+        if self.export_service is not None:
+            self.export_service.stop()
+            self.export_service = None
+        # 写入缩略图包中尚未落盘的索引
+        thumbnail_cache.close()
+
     def on_slides_loaded(self):
-        if self.loading_overlay:
-            self.loading_overlay.hide()
-        self.slides_loaded = True
+        # 新导出的缩略图可能使缓存超出预算
+        thumbnail_cache.compact_in_background()
 
     def change_pointer_mode(self, mode):
-        self.ppt_client.set_pointer_type(mode)
+        self.on_user_action()
+        self.com_worker.submit("set_pointer_type", mode)
         # Update button state if needed, but toolbar handles its own exclusive group
         # We might want to sync back if PPT changes mode externally, but that's for sync_state
 
@@ -605,40 +618,31 @@ class BusinessLogicController(QWidget):
             nav_w, nav_h
         )
 
-    def sync_state(self, view):
-        try:
-            pt = view.PointerType
-            if pt == 1:
-                self.toolbar.btn_arrow.setChecked(True)
-            elif pt == 2:
-                self.toolbar.btn_pen.setChecked(True)
-            elif pt == 5: # Eraser
-                self.toolbar.btn_eraser.setChecked(True)
-        except:
-            pass
+    def sync_state(self, pt):
+        self.toolbar.set_pointer_mode(pt)
 
-    def update_page_num(self, view):
-        try:
-            current = view.Slide.SlideIndex
-            total = self.ppt_client.get_slide_count()
-            self.nav_left.update_page(current, total)
-            self.nav_right.update_page(current, total)
-        except:
-            pass
+    def update_page_num(self, current, total):
+        # 页码经由翻页合并器校准，有未完成的翻页时显示预测值
+        self.navigator.confirm(current, total)
+        if self.loader_thread is not None and current:
+            self.loader_thread.set_current(current)
+
+    def on_navigation_done(self, command, args):
+        # WPS兼容模式下监视线程据此推算页码
+        self.monitor.record_command(command, *args)
+
+    def show_page_num(self, current, total):
+        self.nav_left.update_page(current, total)
+        self.nav_right.update_page(current, total)
 
     def go_prev(self):
-        # 如果启用了WPS兼容模式，使用键盘模拟
-        if self.wps_compatibility_mode:
-            self.simulate_prev_key()
-        else:
-            self.ppt_client.prev_slide()
+        # 连续点击会被合并为一次跳转（WPS兼容模式下为最少的按键序列）
+        self.on_user_action()
+        self.navigator.step(-1)
 
     def go_next(self):
-        # 如果启用了WPS兼容模式，使用键盘模拟
-        if self.wps_compatibility_mode:
-            self.simulate_next_key()
-        else:
-            self.ppt_client.next_slide()
+        self.on_user_action()
+        self.navigator.step(1)
                 
     def next_page(self):
         """下一页"""
@@ -649,45 +653,42 @@ class BusinessLogicController(QWidget):
         self.go_prev()
                 
     def jump_to_slide(self, index):
-        # 如果启用了WPS兼容模式，使用键盘模拟
-        if self.wps_compatibility_mode:
-            # 在WPS模式下，跳转到指定幻灯片比较复杂，这里简单处理为翻页
-            self.simulate_goto_slide_key(index)
-        else:
-            self.ppt_client.goto_slide(index)
+        self.on_user_action()
+        self.navigator.jump(index)
 
     def set_pointer_type(self, type_id):
-        # 如果启用了WPS兼容模式，使用模拟按键
+        # WPS兼容模式下笔和橡皮由键盘后端模拟按键，其他模式仍使用COM接口
         if self.wps_compatibility_mode:
-            if type_id == 2:  # 笔模式
-                self.simulate_pen_key()
-            elif type_id == 5:  # 橡皮模式
-                self.simulate_eraser_key()
-            else:
-                # 对于其他模式（如箭头），仍然使用COM接口
-                if not self.ppt_client.set_pointer_type(type_id):
-                    self.show_warning(None, "无法设置指针类型")
+            self.com_worker.submit("set_pointer_type", type_id, callback=self.on_pointer_type_set)
             return
         
         # 正常模式使用COM接口
         if type_id == 5:
             # Check for ink but DO NOT BLOCK
-            if not self.ppt_client.has_ink():
-                self.show_warning(None, "当前页没有笔迹")
+            self.com_worker.submit("has_ink", callback=self.on_ink_checked)
         
-        self.ppt_client.set_pointer_type(type_id)
+        self.com_worker.submit("set_pointer_type", type_id)
+    
+    def on_pointer_type_set(self, ok):
+        if not ok:
+            self.show_warning(None, "无法设置指针类型")
+    
+    def on_ink_checked(self, has_ink):
+        if not has_ink:
+            self.show_warning(None, "当前页没有笔迹")
     
     def set_pen_color(self, color):
-        self.ppt_client.set_pen_color(color)
+        self.on_user_action()
+        self.com_worker.submit("set_pen_color", color)
                 
     def change_pen_color(self, color):
         """更改笔颜色"""
         self.set_pen_color(color)
                 
     def clear_ink(self):
-        if not self.ppt_client.has_ink():
-            self.show_warning(None, "当前页没有笔迹")
-        self.ppt_client.erase_ink()
+        self.on_user_action()
+        self.com_worker.submit("has_ink", callback=self.on_ink_checked)
+        self.com_worker.submit("erase_ink")
                 
     def toggle_spotlight(self):
         if self.spotlight.isVisible():
@@ -696,15 +697,17 @@ class BusinessLogicController(QWidget):
             self.spotlight.showFullScreen()
             
     def exit_slideshow(self):
-        # 如果启用了WPS兼容模式，使用模拟按键
-        if self.wps_compatibility_mode:
-            self.simulate_esc_key()
-        else:
-            self.ppt_client.exit_show()
+        self.on_user_action()
+        self.com_worker.submit("exit_show")
                 
     def exit_application(self):
         """退出应用程序"""
         self.exit_slideshow()
+        # 等待排队中的命令（包括结束放映）执行完毕
+        self.com_worker.stop()
+        self.monitor.stop()
+        self.stop_loading_slides()
+        pixmap_cache.shutdown()
         app = QApplication.instance()
         if app is not None:
             app.quit()
@@ -0,0 +1,101 @@
+import functools
+import json
+import threading
+import time
+
+
+class ComCallMetrics:
+    """跨进程 COM 调用的耗时直方图与错误统计（线程安全）"""
+    # 直方图桶上界（毫秒），最后一个桶收集所有更慢的调用
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, name):
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = {
+                "calls": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "histogram": [0] * (len(self.BUCKETS_MS) + 1),
+                "last_error": None,
+            }
+            self._stats[name] = entry
+        return entry
+
+    def record(self, name, elapsed):
+        elapsed_ms = elapsed * 1000.0
+        bucket = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            entry = self._entry(name)
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["histogram"][bucket] += 1
+
+    def record_error(self, name, exc):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._entry(name)
+            entry["errors"] += 1
+            entry["last_error"] = type(exc).__name__
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self):
+        """返回当前统计的副本，便于运行时查询"""
+        with self._lock:
+            result = {}
+            for name, entry in self._stats.items():
+                data = dict(entry)
+                data["histogram"] = list(entry["histogram"])
+                calls = entry["calls"]
+                data["avg_ms"] = entry["total_ms"] / calls if calls else 0.0
+                result[name] = data
+            return result
+
+    def dump_json(self, path, extra=None):
+        data = {
+            "buckets_ms": list(self.BUCKETS_MS),
+            "methods": self.snapshot(),
+        }
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# 进程级共享实例，界面线程与 COM 工作线程的客户端都记录到这里
+metrics = ComCallMetrics()
+
+
+def instrumented(func):
+    """记录被装饰方法的耗时；统计关闭时只多一次属性判断"""
+    name = func.__name__.lstrip("_")
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            metrics.record_error(name, e)
+            raise
+        finally:
+            metrics.record(name, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,100 @@
+import queue
+from concurrent.futures import Future
+
+try:
+    import pythoncom
+except ImportError:
+    # 非 Windows 平台只会运行模拟后端，不需要初始化 COM
+    pythoncom = None
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ComWorker(QThread):
+    """独占 COM 代理的单线程套间 (STA) 工作线程
+
+    所有可能阻塞的演示程序调用都排队到这里执行，界面线程只负责提交命令，
+    结果通过 Future 或在界面线程上回调的 callback 返回。
+    """
+    command_finished = pyqtSignal(str, object)
+    _deliver = pyqtSignal(object, object)
+
+    def __init__(self, client_factory, parent=None):
+        super().__init__(parent)
+        self.client_factory = client_factory
+        self.client = None
+        self._queue = queue.Queue()
+        # 本对象属于界面线程，因此 _deliver 会以排队方式回到界面线程执行
+        self._deliver.connect(self._on_deliver)
+
+    def submit(self, command, *args, callback=None):
+        """提交客户端方法名对应的命令，例如 submit("goto_slide", 3)"""
+        future = Future()
+        self._queue.put((command, args, future, callback))
+        return future
+
+    def submit_call(self, func, *args, callback=None):
+        """提交任意可调用对象（如键盘模拟），在工作线程中执行"""
+        future = Future()
+        self._queue.put((func, args, future, callback))
+        return future
+
+    def replace_client(self, client_factory):
+        """切换后端（例如开关WPS兼容模式），新客户端在工作线程中创建"""
+        self.client_factory = client_factory
+        return self.submit_call(self._replace_client, client_factory)
+
+    def _replace_client(self, client_factory):
+        if self.client is not None:
+            self.client.close()
+        self.client = client_factory()
+
+    def pending_count(self):
+        return self._queue.qsize()
+
+    def stop(self, timeout=2000):
+        self._queue.put(None)
+        self.wait(timeout)
+
+    def run(self):
+        if pythoncom:
+            pythoncom.CoInitialize()
+        try:
+            self.client = self.client_factory()
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                self._execute(*item)
+        finally:
+            if self.client is not None:
+                self.client.close()
+            self.client = None
+            if pythoncom:
+                pythoncom.CoUninitialize()
+
+    def _execute(self, command, args, future, callback):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        if callable(command):
+            name = getattr(command, "__name__", "call")
+        else:
+            name = command
+
+        result = None
+        try:
+            if callable(command):
+                result = command(*args)
+            else:
+                result = getattr(self.client, command)(*args)
+            future.set_result(result)
+        except Exception as e:
+            print(f"COM worker command {name} failed: {e}")
+            future.set_exception(e)
+
+        self.command_finished.emit(name, result)
+        if callback is not None:
+            self._deliver.emit(callback, result)
+
+    def _on_deliver(self, callback, result):
+        callback(result)
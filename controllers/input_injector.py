@@ -0,0 +1,272 @@
+import heapq
+import itertools
+import sys
+import threading
+import time
+
+try:
+    import pyautogui
+except ImportError:
+    pyautogui = None
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    win32gui = None
+
+
+class InputSink:
+    """按键输出端接口；batch 为 (键名, 是否按下) 的列表
+
+    未实现的操作返回 False。
+    """
+
+    def send(self, batch):
+        return False
+
+    def activate(self, hwnd):
+        if win32gui is None:
+            return False
+        try:
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(hwnd)
+            return True
+        except Exception:
+            return False
+
+
+class SendInputSink(InputSink):
+    """通过一次 SendInput 调用发送整批按键（仅 Windows）"""
+    VK_CODES = {
+        'ctrl': 0x11, 'shift': 0x10, 'alt': 0x12,
+        'enter': 0x0D, 'esc': 0x1B, 'home': 0x24, 'end': 0x23,
+        'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+    }
+    EXTENDED_KEYS = {'home', 'end', 'left', 'up', 'right', 'down'}
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                        ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        class HARDWAREINPUT(ctypes.Structure):
+            _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD),
+                        ("wParamH", wintypes.WORD)]
+
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+        self._ctypes = ctypes
+        self._INPUT = INPUT
+        self._user32 = ctypes.windll.user32
+
+    def _vk(self, key):
+        if key in self.VK_CODES:
+            return self.VK_CODES[key]
+        if len(key) == 1 and key.isalnum():
+            return ord(key.upper())
+        return None
+
+    def send(self, batch):
+        inputs = []
+        for key, down in batch:
+            item = self._INPUT(type=1) # INPUT_KEYBOARD
+            vk = self._vk(key)
+            flags = 0 if down else 0x0002 # KEYEVENTF_KEYUP
+            if vk is None:
+                # 其他字符按 Unicode 发送
+                item.union.ki.wScan = ord(key)
+                flags |= 0x0004 # KEYEVENTF_UNICODE
+            else:
+                item.union.ki.wVk = vk
+                if key in self.EXTENDED_KEYS:
+                    flags |= 0x0001 # KEYEVENTF_EXTENDEDKEY
+            item.union.ki.dwFlags = flags
+            inputs.append(item)
+        if not inputs:
+            return True
+        array = (self._INPUT * len(inputs))(*inputs)
+        sent = self._user32.SendInput(len(inputs), array, self._ctypes.sizeof(self._INPUT))
+        return sent == len(inputs)
+
+
+class PyAutoGuiSink(InputSink):
+    """SendInput 不可用时退回 pyautogui 逐键发送"""
+
+    def send(self, batch):
+        for key, down in batch:
+            if down:
+                pyautogui.keyDown(key)
+            else:
+                pyautogui.keyUp(key)
+        return True
+
+
+class RecordingSink(InputSink):
+    """记录发送的按键及时间，用于测试和无头性能测试"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.events = []
+
+    def send(self, batch):
+        self.events.append((self.clock(), "keys", list(batch)))
+        return True
+
+    def activate(self, hwnd):
+        self.events.append((self.clock(), "activate", hwnd))
+        return True
+
+    def keys(self):
+        """按下的键序列（不含抬起）"""
+        return [key for _, kind, batch in self.events if kind == "keys"
+                for key, down in batch if down]
+
+
+def default_sink():
+    if sys.platform == "win32":
+        try:
+            return SendInputSink()
+        except Exception:
+            pass
+    if pyautogui is not None:
+        return PyAutoGuiSink()
+    return None
+
+
+class InputInjector:
+    """带定时队列的按键注入器
+
+    按键在独立线程中发送，调用方立即返回。激活窗口后的焦点稳定等待通过
+    定时队列安排，而不是在调用线程上 sleep；同一时刻到期的连续按键合并为
+    一次 sink.send 调用。接口与 pyautogui 的 press/hotkey/write 保持一致。
+    """
+
+    def __init__(self, sink=None, clock=time.monotonic):
+        self.sink = sink or default_sink()
+        self.clock = clock
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._ready_at = 0.0
+        self._thread = None
+        self._stopped = False
+        self.batches_sent = 0
+
+    def _schedule(self, kind, payload, delay=0.0):
+        with self._cond:
+            due = max(self.clock() + delay, self._ready_at)
+            heapq.heappush(self._queue, (due, next(self._seq), kind, payload))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="InputInjector", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return due
+
+    def activate(self, hwnd, settle=0.1):
+        """激活窗口；之后排队的按键在激活完成后至少等待 settle 秒再发送"""
+        due = self._schedule("activate", (hwnd, settle))
+        with self._cond:
+            # 先按计划时间估算，激活实际完成后由 _defer 重新安排
+            self._ready_at = max(self._ready_at, due + settle)
+
+    def press(self, key, presses=1):
+        batch = []
+        for _ in range(presses):
+            batch += [(key, True), (key, False)]
+        self._schedule("keys", batch)
+
+    def hotkey(self, *keys):
+        batch = [(key, True) for key in keys] + [(key, False) for key in reversed(keys)]
+        self._schedule("keys", batch)
+
+    def write(self, text):
+        batch = []
+        for ch in text:
+            batch += [(ch, True), (ch, False)]
+        self._schedule("keys", batch)
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._queue)
+
+    def stop(self, timeout=1.0):
+        """发送完已排队的按键（如结束放映的 Esc）后停止工作线程"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._queue:
+                        wait = self._queue[0][0] - self.clock()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    elif self._stopped:
+                        return
+                    else:
+                        self._cond.wait()
+                items = self._pop_due()
+            self._dispatch(items)
+
+    def _pop_due(self):
+        """取出所有已到期的操作"""
+        now = self.clock()
+        items = []
+        while self._queue and self._queue[0][0] <= now:
+            items.append(heapq.heappop(self._queue))
+        return items
+
+    def _dispatch(self, items):
+        if self.sink is None:
+            return
+        batch = []
+        for position, (_, _, kind, payload) in enumerate(items):
+            if kind == "keys":
+                batch += payload
+                continue
+            if batch:
+                self._send(batch)
+                batch = []
+            hwnd, settle = payload
+            self.sink.activate(hwnd)
+            self._defer(items[position + 1:], settle)
+            return
+        if batch:
+            self._send(batch)
+
+    def _defer(self, rest, settle):
+        """激活可能晚于计划执行，或本身耗时较长；焦点等待从激活完成时重新起算"""
+        with self._cond:
+            ready = self.clock() + settle
+            self._ready_at = max(self._ready_at, ready)
+            queue = [(max(due, ready), seq, kind, payload) for due, seq, kind, payload in self._queue]
+            # 已取出的后续操作保留原序号，仍排在之后提交的操作前面
+            queue += [(max(due, ready), seq, kind, payload) for due, seq, kind, payload in rest]
+            heapq.heapify(queue)
+            self._queue = queue
+            self._cond.notify()
+
+    def _send(self, batch):
+        self.batches_sent += 1
+        try:
+            self.sink.send(batch)
+        except Exception as e:
+            print(f"Input injection failed: {e}")
@@ -0,0 +1,131 @@
+from .backend import PresentationBackend
+from .input_injector import InputInjector
+from .ppt_client import PPTClient
+from .window_resolver import WindowResolver
+
+
+class KeyboardBackend(PresentationBackend):
+    """WPS兼容模式：通过激活放映窗口并模拟按键控制演示
+
+    键盘无法完成的操作（箭头指针、笔颜色、清除笔迹）仍交给 COM 客户端。
+    """
+    name = "keyboard"
+    # 激活窗口后等待焦点稳定的时间（秒），由注入器的定时队列处理
+    FOCUS_SETTLE = 0.1
+    TOOL_FOCUS_SETTLE = 0.3
+
+    def __init__(self, com_client=None, injector=None):
+        super().__init__()
+        self.com = com_client or PPTClient()
+        self.window_resolver = WindowResolver()
+        # 按键注入器，需提供 activate/press/hotkey/write；可替换为使用 RecordingSink 的注入器
+        self.injector = injector or InputInjector()
+
+    def close(self):
+        if self.injector is not None:
+            self.injector.stop()
+
+    def find_presentation_window(self):
+        """查找WPS或PowerPoint的放映窗口（优先使用缓存的窗口句柄）"""
+        return self.window_resolver.resolve()
+
+    def activate_presentation_window(self, settle=FOCUS_SETTLE):
+        """查找演示窗口并排队激活，之后的按键在 settle 秒后发送，调用方不等待"""
+        hwnd = self.find_presentation_window()
+        if hwnd:
+            self.injector.activate(hwnd, settle)
+        return hwnd
+
+    def set_pointer_type(self, type_id):
+        if type_id == 2:  # 笔模式
+            return self.simulate_pen_key()
+        if type_id == 5:  # 橡皮模式
+            return self.simulate_eraser_key()
+        # 对于其他模式（如箭头），仍然使用COM接口
+        return self.com.set_pointer_type(type_id)
+
+    def set_pen_color(self, rgb_color):
+        return self.com.set_pen_color(rgb_color)
+
+    def erase_ink(self):
+        return self.com.erase_ink()
+
+    def has_ink(self):
+        return self.com.has_ink()
+
+    def next_slide(self):
+        return self.simulate_next_key()
+
+    def prev_slide(self):
+        return self.simulate_prev_key()
+
+    def goto_slide(self, index):
+        return self.simulate_goto_slide_key(index)
+
+    def step_slides(self, delta):
+        """只激活一次窗口，然后连续按方向键"""
+        if self.injector is None or delta == 0:
+            return False
+        self.activate_presentation_window()
+        self.injector.press('right' if delta > 0 else 'left', presses=abs(delta))
+        return True
+
+    def exit_show(self):
+        return self.simulate_esc_key()
+
+    def simulate_pen_key(self):
+        """模拟笔按键"""
+        if self.activate_presentation_window(self.TOOL_FOCUS_SETTLE):
+            # 模拟按下Ctrl+P
+            self.injector.hotkey('ctrl', 'p')
+            return True
+        return False
+
+    def simulate_eraser_key(self):
+        """模拟橡皮按键"""
+        if self.activate_presentation_window(self.TOOL_FOCUS_SETTLE):
+            # 模拟按下Ctrl+E
+            self.injector.hotkey('ctrl', 'e')
+            return True
+        return False
+
+    def simulate_esc_key(self):
+        """模拟esc按键"""
+        if self.injector is None:
+            return False
+        self.activate_presentation_window()
+        # 模拟按下Esc键
+        self.injector.press('esc')
+        return True
+
+    def simulate_prev_key(self):
+        """模拟上一页按键"""
+        if self.injector is None:
+            return False
+        self.activate_presentation_window()
+        # 模拟按下左箭头键或Page Up键
+        self.injector.press('left')
+        return True
+
+    def simulate_next_key(self):
+        """模拟下一页按键"""
+        if self.injector is None:
+            return False
+        self.activate_presentation_window()
+        # 模拟按下右箭头键或Page Down键
+        self.injector.press('right')
+        return True
+
+    def simulate_goto_slide_key(self, index):
+        """模拟跳转到指定幻灯片
+
+        PowerPoint 和 WPS 放映时都支持“输入页码 + 回车”直接跳转，最多四五个
+        按键。不用方向键：方向键会逐个播放动画，而且键盘模式读不到真实页码，
+        点击器或鼠标翻页后从推算位置出发会跳错页。
+        """
+        if self.injector is None or not self.activate_presentation_window():
+            return False
+
+        self.injector.write(str(index))
+        self.injector.press('enter')
+        return True
@@ -0,0 +1,110 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class NavigationScheduler(QObject):
+    """合并连续的翻页点击
+
+    短时间内的多次上一页/下一页会被累加成一个相对位移，只向后端发出一条
+    命令。在命令完成并被快照确认之前，界面显示预测的页码。
+    """
+    predicted_page_changed = pyqtSignal(int, int)
+    # 命令成功执行后发出 (命令名, 参数元组)，供WPS兼容模式推算页码
+    command_completed = pyqtSignal(str, object)
+    # 所有命令执行完毕后请求一次新的快照，用真实页码取代预测值
+    resync_requested = pyqtSignal()
+    # 合并窗口（毫秒）：最后一次点击后等待这么久才真正发出命令
+    COALESCE_MS = 120
+
+    def __init__(self, worker, parent=None):
+        super().__init__(parent)
+        self.worker = worker
+        self.confirmed_index = 0
+        self.total = 0
+        self.predicted_index = 0
+        self.pending_delta = 0
+        self.in_flight = False
+        self._in_flight_command = None
+        self._shown = None
+        self.clicks = 0
+        self.commands_sent = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def is_busy(self):
+        return self.pending_delta != 0 or self.in_flight
+
+    def confirm(self, current, total):
+        """用后端快照校准页码；有未完成的翻页时先记下，界面保留预测值"""
+        self.total = total
+        self.confirmed_index = current
+        if self.is_busy():
+            return
+        self._set_predicted(current)
+
+    def reset(self):
+        self._timer.stop()
+        self.confirmed_index = 0
+        self.predicted_index = 0
+        self.total = 0
+        self.pending_delta = 0
+        self._shown = None
+
+    def step(self, delta):
+        """记录一次相对翻页（+1 下一页，-1 上一页）"""
+        self.clicks += 1
+        self.pending_delta += delta
+        if self.predicted_index:
+            self._set_predicted(self._clamp(self.predicted_index + delta))
+        self._timer.start(self.COALESCE_MS)
+
+    def jump(self, index):
+        """直接跳转，丢弃尚未发出的相对翻页"""
+        self._timer.stop()
+        self.pending_delta = 0
+        self._set_predicted(self._clamp(index))
+        self._send("goto_slide", index)
+
+    def flush(self):
+        if self.in_flight:
+            # 上一条命令仍在执行，完成后会继续发送累积的位移
+            return
+        delta = self.pending_delta
+        self.pending_delta = 0
+        if delta:
+            self._send("step_slides", delta)
+
+    def _send(self, command, *args):
+        self.in_flight = True
+        self._in_flight_command = (command, args)
+        self.commands_sent += 1
+        self.worker.submit(command, *args, callback=self._on_command_done)
+
+    def _on_command_done(self, result):
+        self.in_flight = False
+        command, args = self._in_flight_command
+        if result:
+            self.command_completed.emit(command, args)
+        if self.pending_delta:
+            self.flush()
+            return
+        # 命令失败时预测值一定不对，先退回最近一次确认的页码；成功时预测值
+        # 也可能不准（例如 Next 只播放了动画），都需要新的快照来校准
+        if not result and self.confirmed_index:
+            self._set_predicted(self.confirmed_index)
+        self.resync_requested.emit()
+
+    def _clamp(self, index):
+        index = max(1, index)
+        if self.total:
+            index = min(self.total, index)
+        return index
+
+    def _set_predicted(self, index):
+        self.predicted_index = index
+        # 总页数未知（WPS兼容模式读不到）时仍显示推算页码
+        if not index or self._shown == (index, self.total):
+            return
+        self._shown = (index, self.total)
+        self.predicted_page_changed.emit(index, self.total)
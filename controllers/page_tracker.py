@@ -0,0 +1,99 @@
+import time
+
+
+class PageTracker:
+    """WPS兼容模式下推算当前页码
+
+    键盘后端无法读取放映位置，因此根据已执行的翻页命令推算页码；COM 部分
+    可用时定期做一次廉价探测，探测结果与推算不一致就以探测为准（纠正漂移）。
+    页码为 0 表示未知，总页数为 0 表示未知。
+    """
+    # 两次探测之间的最小间隔（秒）
+    PROBE_INTERVAL = 1.0
+    # 命令执行后按键由注入器异步发送，这段时间内的探测结果可能还是旧页码
+    COMMAND_SETTLE = 0.5
+
+    def __init__(self, clock=time.monotonic, probe_interval=None):
+        self.clock = clock
+        self.probe_interval = self.PROBE_INTERVAL if probe_interval is None else probe_interval
+        self.index = 0
+        self.total = 0
+        self._last_probe = None
+        self._last_command = None
+        self.commands_applied = 0
+        self.probes = 0
+        self.corrections = 0
+        self.max_drift = 0
+
+    def reset(self):
+        self.index = 0
+        self.total = 0
+        self._last_probe = None
+
+    def start(self):
+        """放映开始；没有探测结果时假定从第 1 页开始"""
+        if not self.index:
+            self.index = 1
+
+    def apply_command(self, command, *args):
+        """根据一条已成功执行的导航命令更新推算页码"""
+        if command == "next_slide":
+            self._move(1)
+        elif command == "prev_slide":
+            self._move(-1)
+        elif command == "step_slides":
+            self._move(args[0])
+        elif command == "goto_slide":
+            self.index = self._clamp(args[0])
+        elif command == "exit_show":
+            self.reset()
+            return
+        else:
+            return
+        self._last_command = self.clock()
+        self.commands_applied += 1
+
+    def _move(self, delta):
+        if self.index:
+            self.index = self._clamp(self.index + delta)
+
+    def _clamp(self, index):
+        index = max(1, index)
+        if self.total:
+            index = min(self.total, index)
+        return index
+
+    def probe_due(self):
+        return self._last_probe is None or self.clock() - self._last_probe >= self.probe_interval
+
+    def apply_probe(self, index, total):
+        """用探测结果校准，index/total 为 0 表示该项读不到；返回是否纠正了漂移"""
+        now = self.clock()
+        self._last_probe = now
+        self.probes += 1
+        if total:
+            self.total = total
+            if self.index:
+                self.index = self._clamp(self.index)
+        if self._last_command is not None and now - self._last_command < self.COMMAND_SETTLE:
+            return False
+        if not index or index == self.index:
+            return False
+        if self.index:
+            self.corrections += 1
+            self.max_drift = max(self.max_drift, abs(index - self.index))
+        self.index = index
+        return True
+
+    def position(self):
+        return self.index, self.total
+
+    def get_stats(self):
+        return {
+            "index": self.index,
+            "total": self.total,
+            "commands_applied": self.commands_applied,
+            "probes": self.probes,
+            "corrections": self.corrections,
+            "max_drift": self.max_drift,
+        }
@@ -0,0 +1,80 @@
+import time
+from collections import deque
+
+
+class PollScheduler:
+    """按演示状态调整控制器心跳频率
+
+    idle：没有演示程序在运行；app_open：程序已打开但未放映；
+    slideshow：正在放映；用户点击后的几秒内进入 burst 快速轮询。
+    订阅到放映事件后，状态变化由事件推送，轮询只作为慢速心跳。
+    """
+    IDLE = "idle"
+    APP_OPEN = "app_open"
+    SLIDESHOW = "slideshow"
+    BURST = "burst"
+
+    # 各状态的轮询间隔（毫秒）
+    DEFAULT_INTERVALS = {
+        IDLE: 5000,
+        APP_OPEN: 1000,
+        SLIDESHOW: 500,
+        BURST: 100,
+    }
+    HEARTBEAT_INTERVAL = 3000
+    BURST_DURATION = 3.0
+
+    def __init__(self, intervals=None, min_interval=100, max_interval=10000,
+                 burst_duration=None, clock=time.monotonic):
+        self.intervals = dict(self.DEFAULT_INTERVALS)
+        if intervals:
+            self.intervals.update(intervals)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.burst_duration = self.BURST_DURATION if burst_duration is None else burst_duration
+        self.clock = clock
+        self.state = self.IDLE
+        self.events_active = False
+        self._burst_until = 0.0
+        self._wakeups = deque()
+
+    def set_state(self, state):
+        self.state = state
+
+    def set_events_active(self, active):
+        self.events_active = active
+
+    def burst(self):
+        """用户操作后短时间内快速轮询，尽快反映结果"""
+        self._burst_until = self.clock() + self.burst_duration
+
+    def current_mode(self):
+        if self.clock() < self._burst_until:
+            return self.BURST
+        return self.state
+
+    def interval(self):
+        mode = self.current_mode()
+        interval = self.intervals[mode]
+        if self.events_active and mode in (self.APP_OPEN, self.SLIDESHOW):
+            interval = max(interval, self.HEARTBEAT_INTERVAL)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def record_wakeup(self):
+        now = self.clock()
+        self._wakeups.append(now)
+        while self._wakeups and now - self._wakeups[0] > 60.0:
+            self._wakeups.popleft()
+
+    def wakeups_per_minute(self):
+        now = self.clock()
+        while self._wakeups and now - self._wakeups[0] > 60.0:
+            self._wakeups.popleft()
+        return len(self._wakeups)
+
+    def get_stats(self):
+        return {
+            "mode": self.current_mode(),
+            "interval_ms": self.interval(),
+            "wakeups_per_minute": self.wakeups_per_minute(),
+        }
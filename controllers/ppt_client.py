@@ -1,39 +1,150 @@
-import win32com.client
-import pythoncom
-import win32gui
-import win32con
+import time
 
-class PPTClient:
-    def __init__(self):
-        self.app = None
+try:
+    import win32com.client
+    import win32gui
+    import win32con
+except ImportError:
+    # 非 Windows 平台（如无头性能测试）只能使用模拟后端
+    win32com = None
+
+from .backend import PresentationBackend, PresentationSnapshot
+from .com_metrics import metrics, instrumented
+
+
+class ConnectionState:
+    """COM 连接状态"""
+    DISCONNECTED = "disconnected"
+    PROBING = "probing"
+    CONNECTED = "connected"
+    STALE = "stale"
+
+
+class PPTClient(PresentationBackend):
+    """通过 COM 控制 PowerPoint 或 WPS 演示"""
+    name = "com"
+    # 依次尝试的 (ProgID, app_type)
+    PROG_IDS = [
+        ("PowerPoint.Application", 'office'),
+        # WPS 有多种 ProgID: Kwpp.Application, Wpp.Application
+        ("Kwpp.Application", 'wps'),
+        ("Wpp.Application", 'wps'),
+    ]
+    # 探测失败后的指数退避（秒）。常驻的 WPS 辅助进程也会被进程检测当作演示
+    # 进程，演示程序启动时不一定有“进程出现”的时机，因此上限不能太长
+    BACKOFF_INITIAL = 1.0
+    BACKOFF_MAX = 4.0
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__()
         self.app_type = None # 'office' or 'wps'
+        # 连接状态机：只有进程出现、连接失效或退避到期时才重新探测
+        self.clock = clock
+        self.state = ConnectionState.DISCONNECTED
+        self.last_prog_id = None
+        self._backoff = 0.0
+        self._next_probe_at = 0.0
+        self.probe_count = 0
+        self.probe_failures = 0
+        self.probe_time = 0.0
+        # 放映视图缓存：仅在 COM 调用失败、断开连接或放映开始/结束时重新解析
+        self._view = None
+        self._presentation = None
+        self._presentation_path = ""
+        self.view_cache_hits = 0
+        self.view_cache_misses = 0
+        # 笔迹索引：SlideID -> (形状数量, 是否有笔迹)，形状数量变化时才重新扫描
+        self._ink_index = {}
 
+    @instrumented
     def connect(self):
-        """尝试连接到 PowerPoint 或 WPS"""
+        """尝试连接到 PowerPoint 或 WPS，优先尝试上次成功的 ProgID"""
         self.app = None
         self.app_type = None
+        self.invalidate_view()
+        self._ink_index.clear()
+        if win32com is None:
+            return False
         
-        # 尝试连接 Office PowerPoint
+        self.state = ConnectionState.PROBING
+        self.probe_count += 1
+        start = self.clock()
         try:
-            self.app = win32com.client.GetActiveObject("PowerPoint.Application")
-            self.app_type = 'office'
+            for prog_id, app_type in self._ordered_prog_ids():
+                try:
+                    self.app = win32com.client.GetActiveObject(prog_id)
+                    self.app_type = app_type
+                    self.last_prog_id = prog_id
+                    self.state = ConnectionState.CONNECTED
+                    self._backoff = 0.0
+                    self._next_probe_at = 0.0
+                    return True
+                except Exception as e:
+                    metrics.record_error("connect", e)
+                    continue
+            
+            # 全部失败：进入退避，期间 ensure_connected 不再探测
+            self.probe_failures += 1
+            self.state = ConnectionState.DISCONNECTED
+            if self._backoff:
+                self._backoff = min(self._backoff * 2, self.BACKOFF_MAX)
+            else:
+                self._backoff = self.BACKOFF_INITIAL
+            self._next_probe_at = self.clock() + self._backoff
+            return False
+        finally:
+            self.probe_time += self.clock() - start
+
+    def _ordered_prog_ids(self):
+        if self.last_prog_id is None:
+            return list(self.PROG_IDS)
+        first = [item for item in self.PROG_IDS if item[0] == self.last_prog_id]
+        rest = [item for item in self.PROG_IDS if item[0] != self.last_prog_id]
+        return first + rest
+
+    def ensure_connected(self):
+        """已连接直接返回；否则仅在退避到期后才重新探测"""
+        if self.app is not None and self.state == ConnectionState.CONNECTED:
             return True
-        except Exception:
-            pass
+        if self.clock() < self._next_probe_at:
+            return False
+        return self.connect()
 
-        # 尝试连接 WPS Presentation
-        # WPS 有多种 ProgID: Kwpp.Application, Wpp.Application
-        wps_prog_ids = ["Kwpp.Application", "Wpp.Application"]
-        for prog_id in wps_prog_ids:
-            try:
-                self.app = win32com.client.GetActiveObject(prog_id)
-                self.app_type = 'wps'
-                return True
-            except Exception:
-                continue
-                
-        return False
+    def ensure_alive(self):
+        """已连接时用一次廉价调用校验代理；演示程序关闭重开后旧代理会失效，此时重新连接"""
+        if not self.ensure_connected():
+            return False
+        try:
+            self.app.SlideShowWindows.Count
+            return True
+        except Exception as e:
+            metrics.record_error("ensure_alive", e)
+            self.mark_stale()
+            return self.ensure_connected()
 
+    def mark_stale(self):
+        """COM 代理调用失败，连接可能已失效，允许立即重新探测一次"""
+        self.state = ConnectionState.STALE
+        self.app = None
+        self._next_probe_at = 0.0
+        self.invalidate_view()
+
+    def notify_process_appeared(self):
+        """检测到演示进程启动时调用，跳过剩余的退避时间"""
+        self._backoff = 0.0
+        self._next_probe_at = 0.0
+
+    def get_connection_metrics(self):
+        return {
+            "state": self.state,
+            "last_prog_id": self.last_prog_id,
+            "probe_count": self.probe_count,
+            "probe_failures": self.probe_failures,
+            "probe_time": self.probe_time,
+            "backoff": self._backoff,
+        }
+
+    @instrumented
     def activate_window(self):
         try:
             if self.app and self.app.SlideShowWindows.Count > 0:
@@ -41,86 +152,173 @@ class PPTClient:
                 win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
                 win32gui.SetForegroundWindow(hwnd)
                 return True
-        except:
-            pass
+        except Exception as e:
+            metrics.record_error("activate_window", e)
         return False
 
+    def invalidate_view(self):
+        """丢弃缓存的放映视图，下次访问时重新解析"""
+        self._view = None
+        self._presentation = None
+        self._presentation_path = ""
+
+    def on_slideshow_begin(self):
+        self.invalidate_view()
+
+    def on_slideshow_end(self):
+        self.invalidate_view()
+        self._ink_index.clear()
+
+    def _handle_com_error(self, name, exc):
+        # COM 调用失败说明视图可能已失效（放映结束或程序退出）
+        metrics.record_error(name, exc)
+        self.invalidate_view()
+
+    def get_view_cache_stats(self):
+        return {
+            "hits": self.view_cache_hits,
+            "misses": self.view_cache_misses,
+        }
+
     def get_active_view(self):
         """获取当前放映视图"""
+        if self._view is not None:
+            self.view_cache_hits += 1
+            return self._view
+
+        self.view_cache_misses += 1
+        self._view = self._resolve_view()
+        return self._view
+
+    @instrumented
+    def _resolve_view(self):
         if not self.app:
-            if not self.connect():
+            if not self.ensure_connected():
                 return None
 
         try:
             if self.app.SlideShowWindows.Count > 0:
                 # 无论是 Office 还是 WPS，通常 SlideShowWindows(1).View 都是可用的
                 return self.app.SlideShowWindows(1).View
-        except Exception:
+        except Exception as e:
             # 连接可能已断开，尝试重新连接
-            if self.connect():
+            metrics.record_error("resolve_view", e)
+            self.mark_stale()
+            if self.ensure_connected():
                 try:
                     if self.app.SlideShowWindows.Count > 0:
                         return self.app.SlideShowWindows(1).View
-                except Exception:
-                    pass
+                except Exception as e:
+                    metrics.record_error("resolve_view", e)
         return None
 
+    @instrumented
+    def snapshot(self):
+        """在一次遍历中读取放映状态，返回 PresentationSnapshot"""
+        for _ in range(2):
+            view = self.get_active_view()
+            if not view:
+                break
+            try:
+                if self._presentation is None:
+                    self._presentation = self.app.ActivePresentation
+                    self._presentation_path = self._presentation.FullName
+                return PresentationSnapshot(
+                    connected=True,
+                    slideshow_active=True,
+                    current_index=view.Slide.SlideIndex,
+                    total_slides=self._presentation.Slides.Count,
+                    pointer_type=view.PointerType,
+                    presentation_path=self._presentation_path,
+                )
+            except Exception as e:
+                # 视图失效后重新解析一次，仍失败则视为未在放映
+                self._handle_com_error("snapshot", e)
+        return PresentationSnapshot(connected=self.app is not None)
+
+    @instrumented
     def get_slide_count(self):
         try:
             if self.app and self.app.ActivePresentation:
                 return self.app.ActivePresentation.Slides.Count
-        except:
-            pass
+        except Exception as e:
+            metrics.record_error("get_slide_count", e)
         return 0
 
+    @instrumented
     def get_current_slide_index(self):
         view = self.get_active_view()
         if view:
             try:
                 return view.Slide.SlideIndex
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("get_current_slide_index", e)
         return 0
 
+    @instrumented
     def next_slide(self):
         view = self.get_active_view()
         if view:
             try:
                 view.Next()
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("next_slide", e)
         return False
 
+    @instrumented
     def prev_slide(self):
         view = self.get_active_view()
         if view:
             try:
                 view.Previous()
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("prev_slide", e)
         return False
 
+    @instrumented
     def goto_slide(self, index):
         view = self.get_active_view()
         if view:
             try:
                 view.GotoSlide(index)
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("goto_slide", e)
         return False
         
+    @instrumented
+    def step_slides(self, delta):
+        # 单步保持 Next/Previous 语义（会播放动画），多步合并为一次 GotoSlide
+        if delta == 1:
+            return self.next_slide()
+        if delta == -1:
+            return self.prev_slide()
+        view = self.get_active_view()
+        if view:
+            try:
+                # 超出范围的 GotoSlide 会失败，必须按总页数截断；工作线程上的客户端
+                # 不调用 snapshot，不能依赖缓存的 _presentation
+                total = self.app.ActivePresentation.Slides.Count
+                target = min(max(1, view.Slide.SlideIndex + delta), total)
+                view.GotoSlide(target)
+                return True
+            except Exception as e:
+                self._handle_com_error("step_slides", e)
+        return False
+
+    @instrumented
     def get_pointer_type(self):
         view = self.get_active_view()
         if view:
             try:
                 return view.PointerType
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("get_pointer_type", e)
         return 0
 
+    @instrumented
     def set_pointer_type(self, type_id):
         view = self.get_active_view()
         if view:
@@ -128,10 +326,11 @@ class PPTClient:
                 view.PointerType = type_id
                 self.activate_window()
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("set_pointer_type", e)
         return False
 
+    @instrumented
     def set_pen_color(self, rgb_color):
         view = self.get_active_view()
         if view:
@@ -141,41 +340,79 @@ class PPTClient:
                 view.PointerColor.RGB = rgb_color
                 self.activate_window()
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("set_pen_color", e)
         return False
 
+    @instrumented
     def erase_ink(self):
         view = self.get_active_view()
         if view:
             try:
                 view.EraseDrawing()
+                self._update_ink_index(view.Slide, False)
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("erase_ink", e)
         return False
 
+    @instrumented
     def exit_show(self):
         view = self.get_active_view()
         if view:
             try:
                 view.Exit()
                 return True
-            except:
-                pass
+            except Exception as e:
+                self._handle_com_error("exit_show", e)
         return False
 
+    @instrumented
     def has_ink(self):
         try:
             view = self.get_active_view()
             if not view:
                 return False
             slide = view.Slide
-            if slide.Shapes.Count == 0:
-                return False
-            for shape in slide.Shapes:
-                if shape.Type == 22: # msoInk
-                    return True
-            return False
-        except:
+            entry = self._ink_index.get(slide.SlideID)
+            shapes = slide.Shapes
+            count = shapes.Count
+            if entry is not None and entry[0] == count:
+                return entry[1]
+            if count == 0:
+                found = False
+            else:
+                found = self._scan_ink(shapes, count)
+            self._ink_index[slide.SlideID] = (count, found)
+            return found
+        except Exception as e:
+            self._handle_com_error("has_ink", e)
             return True # Fail safe
+
+    def _scan_ink(self, shapes, count):
+        # 笔迹总是追加在形状列表末尾，倒序扫描可以尽早命中
+        for i in range(count, 0, -1):
+            if shapes.Item(i).Type == 22: # msoInk
+                return True
+        return False
+
+    def _update_ink_index(self, slide, has_ink):
+        try:
+            self._ink_index[slide.SlideID] = (slide.Shapes.Count, has_ink)
+        except Exception:
+            pass
+
+
+class OfficeComBackend(PPTClient):
+    """仅连接 Microsoft PowerPoint"""
+    name = "office"
+    PROG_IDS = [("PowerPoint.Application", 'office')]
+
+
+class WpsComBackend(PPTClient):
+    """仅连接 WPS 演示"""
+    name = "wps"
+    PROG_IDS = [
+        ("Kwpp.Application", 'wps'),
+        ("Wpp.Application", 'wps'),
+    ]
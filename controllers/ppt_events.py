@@ -0,0 +1,113 @@
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class SlideShowEventSource(QObject):
+    """放映事件源基类
+
+    子类在收到演示程序的放映事件时发出对应信号，信号参数为事件发生时的
+    time.perf_counter() 时间戳，用于统计从通知到界面更新的延迟。
+    测试时可直接调用 emit_* 方法脚本化地驱动控制器。
+    """
+    slideshow_begin = pyqtSignal(float)
+    slide_changed = pyqtSignal(float)
+    slideshow_end = pyqtSignal(float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app = None
+
+    def start(self, app):
+        """订阅 app 的放映事件，成功返回 True"""
+        self.app = app
+        return True
+
+    def stop(self):
+        self.app = None
+
+    def is_active(self):
+        return self.app is not None
+
+    def emit_slideshow_begin(self):
+        self.slideshow_begin.emit(time.perf_counter())
+
+    def emit_slide_changed(self):
+        self.slide_changed.emit(time.perf_counter())
+
+    def emit_slideshow_end(self):
+        self.slideshow_end.emit(time.perf_counter())
+
+
+class EventLatencyStats:
+    """统计放映事件从通知到界面线程收到对应更新的延迟（秒），按事件名分别记录"""
+
+    def __init__(self):
+        self._stats = {}
+
+    def record(self, kind, latency):
+        stats = self._stats.setdefault(kind, {"count": 0, "last": 0.0, "max": 0.0, "total": 0.0})
+        stats["count"] += 1
+        stats["last"] = latency
+        stats["max"] = max(stats["max"], latency)
+        stats["total"] += latency
+
+    def get_stats(self):
+        return {
+            kind: {
+                "count": stats["count"],
+                "last": stats["last"],
+                "max": stats["max"],
+                "mean": stats["total"] / stats["count"],
+            }
+            for kind, stats in self._stats.items()
+        }
+
+
+class _ComEventHandler:
+    """由 win32com.client.WithEvents 实例化的事件接收器"""
+    source = None
+
+    def OnSlideShowBegin(self, Wn):
+        if self.source:
+            self.source.emit_slideshow_begin()
+
+    def OnSlideShowNextSlide(self, Wn):
+        if self.source:
+            self.source.emit_slide_changed()
+
+    def OnSlideShowEnd(self, Pres):
+        if self.source:
+            self.source.emit_slideshow_end()
+
+
+class ComSlideShowEventSource(SlideShowEventSource):
+    """通过 COM 连接点订阅 PowerPoint/WPS 的放映事件"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sink = None
+
+    def start(self, app):
+        self.stop()
+        try:
+            import win32com.client
+            self._sink = win32com.client.WithEvents(app, _ComEventHandler)
+            self._sink.source = self
+            self.app = app
+            return True
+        except Exception as e:
+            print(f"Slideshow event subscription failed: {e}")
+            self._sink = None
+            self.app = None
+            return False
+
+    def stop(self):
+        if self._sink is not None:
+            try:
+                self._sink.source = None
+                self._sink.close()
+            except Exception:
+                pass
+        self._sink = None
+        self.app = None
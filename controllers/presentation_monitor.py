@@ -0,0 +1,264 @@
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from .backend import PresentationSnapshot
+from .page_tracker import PageTracker
+from .poll_scheduler import PollScheduler
+from .ppt_events import ComSlideShowEventSource
+from .process_watcher import ProcessWatcher
+
+
+class PresentationMonitor(QObject):
+    """在独立线程中检测演示程序并采集放映状态
+
+    进程扫描、COM 视图查询和页码读取全部在监视线程完成，界面线程只接收
+    粗粒度的信号，因此演示程序卡顿不会让工具栏和动画停顿。
+    """
+    slideshow_started = pyqtSignal(object)
+    slideshow_ended = pyqtSignal()
+    page_changed = pyqtSignal(int, int)
+    pointer_changed = pyqtSignal(int)
+    snapshot_changed = pyqtSignal(object)
+    # 处理完一次放映事件后发出 (事件名, 事件时间戳)。它排在该事件引起的
+    # page_changed 等信号之后送达界面线程，接收方据此统计通知到界面更新的延迟
+    event_delivered = pyqtSignal(str, float)
+    # 第一次检查成功完成后发出一次；若启动时已在放映，slideshow_started 先于它送达
+    first_check_done = pyqtSignal()
+
+    _refresh_requested = pyqtSignal()
+    _sync_requested = pyqtSignal()
+    _command_observed = pyqtSignal(str, object)
+    _stop_requested = pyqtSignal()
+
+    def __init__(self, backend_factory, event_source=None, process_watcher=None, poll_scheduler=None,
+                 page_tracker=None):
+        super().__init__()
+        self.backend_factory = backend_factory
+        self.backend = None
+        # 传入的事件源（如测试用的脚本化事件源）属于界面线程，信号会排队送达
+        self.event_source = event_source
+        self.process_watcher = process_watcher or ProcessWatcher()
+        self.poll_scheduler = poll_scheduler or PollScheduler()
+        # WPS兼容模式下无法直接读取页码，由页码推算器根据命令和探测结果推算
+        self.page_tracker = page_tracker or PageTracker()
+        self.wps_compatibility_mode = False
+        self.last_snapshot = None
+        self.last_has_process = False
+        self.last_pid = None
+        self.active = False
+        self.event_app = None
+        self.timer = None
+        # 下一次发布快照时无条件发出 page_changed
+        self._force_page = False
+        self._first_check_done = False
+        # 发布的快照数，以及与上一次相同、没有发出任何更新信号的快照数
+        self.published = 0
+        self.unchanged = 0
+
+        self._thread = QThread()
+        self._thread.setObjectName("PresentationMonitor")
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._on_started)
+        self._refresh_requested.connect(self.check_state)
+        self._sync_requested.connect(self.sync)
+        self._command_observed.connect(self.on_command_executed)
+        self._stop_requested.connect(self._on_stop)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=2000):
+        if self._thread.isRunning():
+            self._stop_requested.emit()
+            self._thread.wait(timeout)
+
+    def request_refresh(self):
+        """从任意线程请求立即检查一次状态"""
+        self._refresh_requested.emit()
+
+    def request_sync(self):
+        """从任意线程请求一次完整检查，并重新发出当前页码（即使没有变化）"""
+        self._sync_requested.emit()
+
+    def sync(self):
+        self._force_page = True
+        self.check_state()
+
+    def burst(self):
+        """用户操作后加快轮询并立即刷新"""
+        self.poll_scheduler.burst()
+        self.request_refresh()
+
+    def record_command(self, command, *args):
+        """从任意线程报告一条已成功执行的导航命令"""
+        self._command_observed.emit(command, args)
+
+    def set_wps_compatibility_mode(self, enabled):
+        self.wps_compatibility_mode = enabled
+        self.request_refresh()
+
+    def _on_started(self):
+        if pythoncom:
+            pythoncom.CoInitialize()
+        self.backend = self.backend_factory()
+        if self.event_source is None:
+            self.event_source = ComSlideShowEventSource()
+        self.event_source.slideshow_begin.connect(self.on_slideshow_begin_event)
+        self.event_source.slide_changed.connect(self.on_slide_changed_event)
+        self.event_source.slideshow_end.connect(self.on_slideshow_end_event)
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check_state)
+        self.check_state()
+
+    def _on_stop(self):
+        if self.timer:
+            self.timer.stop()
+        if self.event_source:
+            self.event_source.stop()
+        self.backend = None
+        if pythoncom:
+            pythoncom.CoUninitialize()
+        self._thread.quit()
+
+    def check_state(self):
+        if self.backend is None:
+            return
+        try:
+            self._check_state()
+            if not self._first_check_done:
+                self._first_check_done = True
+                self.first_check_done.emit()
+        except Exception as e:
+            print(f"Presentation monitor error: {e}")
+        finally:
+            # 单次定时器必须重新启动，否则一次异常就会让监视永久停止
+            self.timer.start(self.poll_scheduler.interval())
+
+    def _check_state(self):
+        self.poll_scheduler.record_wakeup()
+
+        # 检查演示进程
+        has_process = self.backend.is_app_running()
+        pid = None
+        if has_process is None:
+            has_process = self.process_watcher.is_running()
+            pid = self.process_watcher.pid()
+        # 进程刚出现，或缓存的进程退出后换成了另一个演示进程时，跳过连接退避
+        if has_process and (not self.last_has_process or pid != self.last_pid):
+            self.backend.notify_process_appeared()
+        self.last_has_process = has_process
+        self.last_pid = pid
+
+        if self.wps_compatibility_mode:
+            snapshot = self.wps_snapshot(has_process)
+        elif has_process:
+            snapshot = self.backend.snapshot()
+        else:
+            snapshot = PresentationSnapshot()
+        self.publish(snapshot)
+
+        self.update_event_subscription()
+        if self.active:
+            self.poll_scheduler.set_state(PollScheduler.SLIDESHOW)
+        elif has_process:
+            self.poll_scheduler.set_state(PollScheduler.APP_OPEN)
+        else:
+            self.poll_scheduler.set_state(PollScheduler.IDLE)
+
+    def wps_snapshot(self, has_process):
+        """在WPS兼容模式下，即使无法获取COM视图，只要检测到进程就显示控件"""
+        if not has_process:
+            self.page_tracker.reset()
+            return PresentationSnapshot()
+        if self.page_tracker.probe_due():
+            self.page_tracker.apply_probe(*self.probe_position())
+        self.page_tracker.start()
+        return self.tracked_snapshot()
+
+    def probe_position(self):
+        """廉价探测当前页码和总页数，读不到的项为 0"""
+        probe = self.backend.snapshot()
+        if probe.slideshow_active:
+            return probe.current_index, probe.total_slides
+        get_slide_count = getattr(self.backend, "get_slide_count", None)
+        return 0, get_slide_count() if get_slide_count else 0
+
+    def tracked_snapshot(self):
+        index, total = self.page_tracker.position()
+        return PresentationSnapshot(connected=True, slideshow_active=True,
+                                    current_index=index, total_slides=total)
+
+    def on_command_executed(self, command, args):
+        if not self.wps_compatibility_mode:
+            return
+        self.page_tracker.apply_command(command, *args)
+        if self.active:
+            self.publish(self.tracked_snapshot())
+
+    def publish(self, snapshot):
+        """与上一次快照比较，只发出发生变化的信号"""
+        force_page = self._force_page
+        self._force_page = False
+        if not snapshot.slideshow_active:
+            if self.active:
+                self.active = False
+                self.backend.on_slideshow_end()
+                self.last_snapshot = None
+                self.slideshow_ended.emit()
+            return
+
+        changed = snapshot.diff(self.last_snapshot)
+        self.last_snapshot = snapshot
+        self.published += 1
+        if not changed and not force_page and self.active:
+            self.unchanged += 1
+        if not self.active:
+            self.active = True
+            self.slideshow_started.emit(snapshot)
+        if changed:
+            self.snapshot_changed.emit(snapshot)
+        if force_page or "current_index" in changed or "total_slides" in changed:
+            self.page_changed.emit(snapshot.current_index, snapshot.total_slides)
+        if "pointer_type" in changed and not self.wps_compatibility_mode:
+            self.pointer_changed.emit(snapshot.pointer_type)
+
+    def get_publish_stats(self):
+        return {
+            "published": self.published,
+            "unchanged": self.unchanged,
+        }
+
+    def update_event_subscription(self):
+        """跟随当前连接订阅放映事件，订阅成功后把轮询降为心跳"""
+        app = None if self.wps_compatibility_mode else self.backend.app
+        if app is not self.event_app:
+            self.event_app = app
+            if app is None:
+                self.event_source.stop()
+            else:
+                self.event_source.start(app)
+        self.poll_scheduler.set_events_active(self.event_source.is_active())
+
+    def on_slideshow_begin_event(self, timestamp):
+        self.backend.on_slideshow_begin()
+        self.process_watcher.request_rescan()
+        self.check_state()
+        self.event_delivered.emit("slideshow_begin", timestamp)
+
+    def on_slide_changed_event(self, timestamp):
+        if not self.active or self.wps_compatibility_mode:
+            return
+        snapshot = self.backend.snapshot()
+        if snapshot.slideshow_active:
+            self.publish(snapshot)
+        self.event_delivered.emit("slide_changed", timestamp)
+
+    def on_slideshow_end_event(self, timestamp):
+        self.backend.on_slideshow_end()
+        self.check_state()
+        self.event_delivered.emit("slideshow_end", timestamp)
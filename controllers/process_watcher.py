@@ -0,0 +1,89 @@
+import time
+
+import psutil
+
+
+class ProcessWatcher:
+    """检测演示程序进程
+
+    找到匹配的进程后只缓存其 Process 对象，每次检查只判断该进程是否存活；
+    只有在进程退出后、收到放映开始事件时（request_rescan）、或距离上次全量
+    扫描超过 rescan_interval 时才遍历全部进程。process_iter 可替换为假的进程表
+    以便测试。
+    """
+    KEYWORDS = ('powerpnt', 'wpp', 'wps')
+    # 未发现演示进程时全量扫描的最小间隔（秒）。空闲轮询每 5 秒一次，间隔取其
+    # 数倍，空闲时大部分周期不遍历进程表
+    RESCAN_INTERVAL = 30.0
+
+    def __init__(self, process_iter=psutil.process_iter, clock=time.monotonic, rescan_interval=None):
+        self.process_iter = process_iter
+        self.clock = clock
+        self.rescan_interval = self.RESCAN_INTERVAL if rescan_interval is None else rescan_interval
+        self.process = None
+        self.process_name = ""
+        self._last_scan = None
+        self.full_scans = 0
+        self.liveness_checks = 0
+        self.scan_time = 0.0
+
+    def request_rescan(self):
+        """下一次检查时立即全量扫描"""
+        self._last_scan = None
+
+    def is_running(self):
+        if self.process is not None:
+            if self._is_alive():
+                return True
+            # 进程已退出，立即重新扫描看是否还有其他实例
+            self.process = None
+            self.process_name = ""
+            self.request_rescan()
+
+        now = self.clock()
+        if self._last_scan is not None and now - self._last_scan < self.rescan_interval:
+            return False
+        self._last_scan = now
+        return self._scan()
+
+    def _is_alive(self):
+        self.liveness_checks += 1
+        try:
+            # is_running 同时比较进程创建时间，可识别 PID 被复用的情况
+            return self.process.is_running()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def _scan(self):
+        self.full_scans += 1
+        start = time.perf_counter()
+        try:
+            for proc in self.process_iter(['name']):
+                try:
+                    proc_name = proc.info.get('name', '') or ""
+                    proc_name_lower = proc_name.lower()
+
+                    # 检查是否为PowerPoint或WPS演示相关进程
+                    if any(keyword in proc_name_lower for keyword in self.KEYWORDS):
+                        self.process = proc
+                        self.process_name = proc_name
+                        return True
+
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+            return False
+        finally:
+            self.scan_time += time.perf_counter() - start
+
+    def pid(self):
+        """当前缓存的演示进程 PID，没有时为 None"""
+        return self.process.pid if self.process is not None else None
+
+    def get_stats(self):
+        return {
+            "pid": self.pid(),
+            "name": self.process_name,
+            "full_scans": self.full_scans,
+            "liveness_checks": self.liveness_checks,
+            "scan_time": self.scan_time,
+        }
@@ -0,0 +1,142 @@
+import threading
+import time
+
+from .backend import PresentationBackend, PresentationSnapshot
+
+
+class SimulatedBackend(PresentationBackend):
+    """纯 Python 的模拟演示后端
+
+    不依赖 Windows/COM，可在 Linux CI 上配合 Qt offscreen 平台无头运行整个
+    控制器和控件栈，用于性能测试。
+
+    slide_count: 幻灯片总数
+    latency: 每次调用的模拟跨进程延迟（秒）
+    script: 脚本化的用户操作列表，元素为 (相对开始的秒数, 操作名, *参数)，
+            操作名见 perform_user_action
+    """
+    name = "simulated"
+
+    def __init__(self, slide_count=20, latency=0.0, script=None, clock=time.monotonic):
+        super().__init__()
+        self.slide_count = slide_count
+        self.latency = latency
+        self.clock = clock
+        self.running = True
+        self.slideshow_active = True
+        self.current_index = 1
+        self.pointer_type = 1
+        self.presentation_path = "simulated.pptx"
+        self.ink_slides = set()
+        self.call_counts = {}
+        self._lock = threading.RLock()
+        self._script = sorted(script or [], key=lambda item: item[0])
+        self._start = clock()
+
+    def _call(self, name):
+        """统计调用次数、执行到期的脚本操作并模拟调用延迟"""
+        with self._lock:
+            self.call_counts[name] = self.call_counts.get(name, 0) + 1
+            self._run_due_script()
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _run_due_script(self):
+        elapsed = self.clock() - self._start
+        while self._script and self._script[0][0] <= elapsed:
+            _, action, *args = self._script.pop(0)
+            self.perform_user_action(action, *args)
+
+    def perform_user_action(self, action, *args):
+        """模拟用户在演示程序中直接进行的操作"""
+        with self._lock:
+            if action == "begin":
+                self.running = True
+                self.slideshow_active = True
+                self.current_index = args[0] if args else 1
+            elif action == "end":
+                self.slideshow_active = False
+            elif action == "quit":
+                self.running = False
+                self.slideshow_active = False
+            elif action == "next":
+                self._goto(self.current_index + 1)
+            elif action == "prev":
+                self._goto(self.current_index - 1)
+            elif action == "goto":
+                self._goto(args[0])
+            elif action == "pointer":
+                self.pointer_type = args[0]
+            elif action == "draw":
+                self.ink_slides.add(self.current_index)
+            elif action == "erase":
+                self.ink_slides.discard(self.current_index)
+            else:
+                raise ValueError(f"Unknown simulated action: {action}")
+
+    def _goto(self, index):
+        self.current_index = max(1, min(self.slide_count, index))
+
+    def connect(self):
+        self._call("connect")
+        return self.running
+
+    def is_app_running(self):
+        with self._lock:
+            self._run_due_script()
+            return self.running
+
+    def snapshot(self):
+        self._call("snapshot")
+        with self._lock:
+            if not self.slideshow_active:
+                return PresentationSnapshot(connected=self.running)
+            return PresentationSnapshot(
+                connected=True,
+                slideshow_active=True,
+                current_index=self.current_index,
+                total_slides=self.slide_count,
+                pointer_type=self.pointer_type,
+                presentation_path=self.presentation_path,
+            )
+
+    def _control(self, name, action, *args):
+        self._call(name)
+        with self._lock:
+            if not self.slideshow_active:
+                return False
+            self.perform_user_action(action, *args)
+            return True
+
+    def next_slide(self):
+        return self._control("next_slide", "next")
+
+    def prev_slide(self):
+        return self._control("prev_slide", "prev")
+
+    def goto_slide(self, index):
+        return self._control("goto_slide", "goto", index)
+
+    def step_slides(self, delta):
+        return self._control("step_slides", "goto", self.current_index + delta)
+
+    def get_pointer_type(self):
+        self._call("get_pointer_type")
+        return self.pointer_type
+
+    def set_pointer_type(self, type_id):
+        return self._control("set_pointer_type", "pointer", type_id)
+
+    def set_pen_color(self, rgb_color):
+        return self._control("set_pen_color", "pointer", 2)
+
+    def erase_ink(self):
+        return self._control("erase_ink", "erase")
+
+    def exit_show(self):
+        return self._control("exit_show", "end")
+
+    def has_ink(self):
+        self._call("has_ink")
+        with self._lock:
+            return self.current_index in self.ink_slides
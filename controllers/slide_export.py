@@ -0,0 +1,295 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .thumbnail_cache import thumbnail_cache
+
+
+def active_presentation():
+    """在当前线程获取正在放映的演示文稿，没有放映时返回 None"""
+    import win32com.client
+    try:
+        app = win32com.client.GetActiveObject("PowerPoint.Application")
+    except Exception:
+        app = win32com.client.Dispatch("PowerPoint.Application")
+    if app.SlideShowWindows.Count > 0:
+        return app.ActivePresentation
+    return None
+
+
+class SlideExportThread(QThread):
+    """按优先级逐张导出幻灯片缩略图
+
+    当前页及其前后几页最先导出，其次是幻灯片选择器中可见的页，最后是其余
+    页面。每张缩略图就绪（导出完成或已在缓存中）后立即发出 thumbnail_ready，
+    界面无需等待全部导出完成。优先级可以在导出过程中随时调整。
+    """
+    thumbnail_ready = pyqtSignal(int, str)
+
+    CURRENT = 0
+    VISIBLE = 1
+    REST = 2
+    # 当前页前后各导出几页作为“邻近页”
+    NEIGHBOURHOOD = 2
+    THUMB_SIZE = (320, 180)
+
+    def __init__(self, deck, current_index=1, presentation_factory=None):
+        super().__init__()
+        # DeckThumbnails：按 SlideID 和文件版本戳定位缩略图
+        self.deck = deck
+        # 页序号 -> SlideID，导出到该页时才读取，不在第一张导出前遍历整个演示文稿
+        self.slide_ids = {}
+        self.presentation_factory = presentation_factory or active_presentation
+        self._lock = threading.Lock()
+        self._heap = []
+        self._priority = {}
+        self._done = set()
+        self._neighbourhood = set()
+        self._cancelled = False
+        self.current_index = current_index
+        self.slides_count = 0
+        self.exported = 0
+        self.cached = 0
+        self.started_at = None
+        self.time_to_first = None
+        self.time_to_neighbourhood = None
+
+    def thumb_path(self, index):
+        return self.deck.path_for(self.slide_ids[index])
+
+    def known_slide_id(self, index):
+        """已读取过的 SlideID，尚未导出到该页时返回 None"""
+        with self._lock:
+            return self.slide_ids.get(index)
+
+    def _push(self, index, level, order):
+        """加入或提升一页的优先级（旧条目出队时按过期跳过）"""
+        if not 1 <= index <= self.slides_count or index in self._done:
+            return
+        key = (level, order)
+        if index in self._priority and self._priority[index] <= key:
+            return
+        self._priority[index] = key
+        heapq.heappush(self._heap, (level, order, index))
+
+    def set_current(self, index):
+        """放映位置变化后，优先导出新位置附近的页"""
+        with self._lock:
+            self.current_index = index
+            self._neighbourhood = set()
+            for offset in range(-self.NEIGHBOURHOOD, self.NEIGHBOURHOOD + 1):
+                target = index + offset
+                if 1 <= target <= self.slides_count:
+                    self._neighbourhood.add(target)
+                    self._push(target, self.CURRENT, abs(offset))
+
+    def request_visible(self, indices):
+        """幻灯片选择器中可见的页优先于其余页"""
+        with self._lock:
+            for order, index in enumerate(indices):
+                self._push(index, self.VISIBLE, order)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _pop(self):
+        with self._lock:
+            while self._heap:
+                level, order, index = heapq.heappop(self._heap)
+                if index in self._done or self._priority.get(index) != (level, order):
+                    continue
+                del self._priority[index]
+                return index
+            return None
+
+    def _mark_done(self, index):
+        now = time.perf_counter()
+        with self._lock:
+            self._done.add(index)
+            if self.time_to_first is None:
+                self.time_to_first = now - self.started_at
+            if self.time_to_neighbourhood is None and self._neighbourhood <= self._done:
+                self.time_to_neighbourhood = now - self.started_at
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        if pythoncom:
+            pythoncom.CoInitialize()
+        try:
+            presentation = self.presentation_factory()
+            if presentation is None:
+                return
+            slides = presentation.Slides
+            self.slides_count = slides.Count
+            with self._lock:
+                for index in range(1, self.slides_count + 1):
+                    self._push(index, self.REST, index)
+            self.set_current(self.current_index)
+
+            while not self._cancelled:
+                index = self._pop()
+                if index is None:
+                    break
+                try:
+                    slide = slides(index)
+                    slide_id = slide.SlideID
+                    with self._lock:
+                        self.slide_ids[index] = slide_id
+                    thumb_path = self.thumb_path(index)
+                    if self.deck.has(thumb_path):
+                        self.cached += 1
+                    else:
+                        self.deck.store(thumb_path, lambda tmp_path: slide.Export(tmp_path, "JPG", *self.THUMB_SIZE))
+                        self.exported += 1
+                except Exception as e:
+                    # 导出失败的页不再重试，卡片保持占位
+                    print(f"Slide {index} export error: {e}")
+                    self._mark_done(index)
+                    continue
+                self._mark_done(index)
+                self.thumbnail_ready.emit(index, thumb_path)
+            # 只有读到了每一页的 SlideID，才能确定哪些缩略图已经不再需要
+            if not self._cancelled and len(self.slide_ids) == self.slides_count:
+                self.deck.prune(self.slide_ids.values())
+            else:
+                self.deck.flush()
+        except Exception as e:
+            print(f"Slide export error: {e}")
+        finally:
+            if pythoncom:
+                pythoncom.CoUninitialize()
+
+    def is_done(self, index):
+        with self._lock:
+            return index in self._done
+
+    def get_stats(self):
+        return {
+            "slides": self.slides_count,
+            "exported": self.exported,
+            "cached": self.cached,
+            "time_to_first": self.time_to_first,
+            "time_to_neighbourhood": self.time_to_neighbourhood,
+        }
+
+
+class SlideExportService(QThread):
+    """按需导出缺失缩略图的后台服务
+
+    幻灯片选择器遇到缓存未命中时提交请求，不在界面线程导出；卡片滚出视野
+    或选择器关闭后，尚未开始的请求可以被取消。请求按 SlideID 定位幻灯片，
+    不受页序号变化影响。还不知道 SlideID 的页用 request_index 提交，由本线程
+    读取 SlideID 后发出 slide_resolved，界面线程不访问 COM。
+    """
+    thumbnail_ready = pyqtSignal(int, str)
+    slide_resolved = pyqtSignal(int, int, str)
+
+    THUMB_SIZE = SlideExportThread.THUMB_SIZE
+
+    def __init__(self, presentation_factory=None):
+        super().__init__()
+        self.presentation_factory = presentation_factory or active_presentation
+        self._cond = threading.Condition()
+        # 缩略图路径（SlideID 未知时为页序号）-> (页序号, SlideID, DeckThumbnails)，按提交顺序处理
+        self._pending = OrderedDict()
+        self._stopped = False
+        self.exported = 0
+        self.cancelled = 0
+
+    def request(self, index, slide_id, path):
+        self._submit(path, (index, slide_id, None))
+
+    def request_index(self, index, deck):
+        """SlideID 尚未读取的页：在服务线程读取后再按需导出"""
+        self._submit(index, (index, None, deck))
+
+    def _submit(self, key, item):
+        with self._cond:
+            if key not in self._pending:
+                self._pending[key] = item
+                self._cond.notify()
+        if not self.isRunning():
+            self.start()
+
+    def cancel(self, key):
+        with self._cond:
+            if self._pending.pop(key, None) is not None:
+                self.cancelled += 1
+
+    def retain(self, keys):
+        """只保留仍在视野内的请求（按缩略图路径或尚未解析的页序号）"""
+        with self._cond:
+            for key in [key for key in self._pending if key not in keys]:
+                del self._pending[key]
+                self.cancelled += 1
+
+    def cancel_all(self):
+        with self._cond:
+            self.cancelled += len(self._pending)
+            self._pending.clear()
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    def stop(self, timeout=2000):
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify()
+        self.wait(timeout)
+
+    def _next(self):
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return None
+            return self._pending.popitem(last=False)
+
+    def run(self):
+        if pythoncom:
+            pythoncom.CoInitialize()
+        try:
+            presentation = self.presentation_factory()
+            if presentation is None:
+                return
+            while True:
+                item = self._next()
+                if item is None:
+                    break
+                key, (index, slide_id, deck) = item
+                slide = None
+                if slide_id is None:
+                    try:
+                        slide = presentation.Slides(index)
+                        slide_id = slide.SlideID
+                    except Exception as e:
+                        print(f"Slide {index} lookup error: {e}")
+                        continue
+                    path = deck.path_for(slide_id)
+                    self.slide_resolved.emit(index, slide_id, path)
+                else:
+                    path = key
+                if not thumbnail_cache.contains(path, record=False):
+                    try:
+                        if slide is None:
+                            slide = presentation.Slides.FindBySlideID(slide_id)
+                        thumbnail_cache.store(path, lambda tmp_path: slide.Export(tmp_path, "JPG", *self.THUMB_SIZE))
+                        self.exported += 1
+                    except Exception as e:
+                        print(f"Slide {index} export error: {e}")
+                        continue
+                self.thumbnail_ready.emit(index, path)
+        except Exception as e:
+            print(f"Slide export service error: {e}")
+        finally:
+            if pythoncom:
+                pythoncom.CoUninitialize()
@@ -0,0 +1,262 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+from .thumbnail_pack import ThumbnailPack
+
+
+def default_cache_root():
+    return os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'PPTAssistant', 'Cache')
+
+
+class DeckThumbnails:
+    """一个演示文稿的缩略图
+
+    缩略图按 SlideID（而不是页序号）定位，插入、删除、调整顺序后已有的
+    缩略图仍然对应正确的幻灯片，只需导出新增的页。每张缩略图还带有演示
+    文稿文件的版本戳（路径、大小、修改时间）作为指纹：COM 没有提供单页的
+    修改标记，因此文件保存后旧版本的缩略图整体视为过期。
+
+    缩略图存放在每个演示文稿一个的缩略图包中；path_for 返回的“路径”是
+    形如旧版文件路径的缩略图键，其中编码了演示文稿、SlideID 和版本戳。
+    """
+    PREFIX = "slide_"
+    SUFFIX = ".jpg"
+
+    def __init__(self, deck_dir, stamp, cache):
+        # 旧版缓存目录的位置，同时作为缩略图键的前缀
+        self.deck_dir = deck_dir
+        self.pack_path = deck_dir + ThumbnailCache.PACK_SUFFIX
+        self.stamp = stamp
+        self.cache = cache
+
+    def path_for(self, slide_id):
+        return os.path.join(self.deck_dir, f"{self.PREFIX}{slide_id}_{self.stamp}{self.SUFFIX}")
+
+    def has(self, path):
+        """缩略图是否已在缓存中（计入命中率）"""
+        return self.cache.contains(path)
+
+    def store(self, path, export):
+        return self.cache.store(path, export)
+
+    def flush(self):
+        self.cache.pack(self.deck_dir).flush()
+
+    def prune(self, slide_ids):
+        """删除已删除的页和旧版本的缩略图"""
+        self.cache.pack(self.deck_dir).retain({slide_id: self.stamp for slide_id in slide_ids})
+
+    @classmethod
+    def parse_name(cls, name):
+        """从缩略图文件名解析 (SlideID, 版本戳)；旧格式（slide_{序号}.jpg）返回 None"""
+        if not (name.startswith(cls.PREFIX) and name.endswith(cls.SUFFIX)):
+            return None
+        parts = name[len(cls.PREFIX):-len(cls.SUFFIX)].rsplit("_", 1)
+        if len(parts) != 2 or not parts[0].isdigit():
+            return None
+        return int(parts[0]), parts[1]
+
+
+class ThumbnailCache:
+    """缩略图磁盘缓存，导出线程与幻灯片选择器共用同一套键
+
+    每个演示文稿对应根目录下的一个缩略图包（<md5(路径)>.pack），旧版的
+    JPG 目录在首次打开或启动整理时自动导入包中并删除。缓存总大小受
+    budget_bytes 限制，超出时按演示文稿以最近使用时间淘汰；正在放映的
+    演示文稿通过 set_active 保护，永远不会被淘汰。
+    """
+    DEFAULT_BUDGET_MB = 500
+    PACK_SUFFIX = ".pack"
+
+    def __init__(self, root=None, budget_bytes=None):
+        self.root = root or default_cache_root()
+        self.budget_bytes = self.DEFAULT_BUDGET_MB * 1024 * 1024 if budget_bytes is None else budget_bytes
+        self._lock = threading.RLock()
+        self._active = set()
+        self._packs = {}
+        self.entries = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.migrated = 0
+        self.compaction_time = 0.0
+
+    def deck_dir(self, presentation_path):
+        path_hash = hashlib.md5(presentation_path.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, path_hash)
+
+    def pack_path(self, presentation_path):
+        return self.deck_dir(presentation_path) + self.PACK_SUFFIX
+
+    def deck_stamp(self, presentation_path):
+        """演示文稿文件的版本戳；文件不存在（未保存的新文稿）时为 0"""
+        try:
+            stat = os.stat(presentation_path)
+        except OSError:
+            return "0"
+        key = f"{presentation_path}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.md5(key.encode('utf-8')).hexdigest()[:12]
+
+    def deck(self, presentation_path):
+        deck_dir = self.deck_dir(presentation_path)
+        try:
+            # 缩略图包的修改时间即最近使用时间
+            os.utime(self.pack_path(presentation_path))
+        except OSError:
+            pass
+        return DeckThumbnails(deck_dir, self.deck_stamp(presentation_path), self)
+
+    def pack(self, deck_dir):
+        """打开（必要时创建并迁移旧版目录）一个演示文稿的缩略图包"""
+        with self._lock:
+            pack = self._packs.get(deck_dir)
+            if pack is None:
+                os.makedirs(self.root, exist_ok=True)
+                pack = ThumbnailPack(deck_dir + self.PACK_SUFFIX)
+                if os.path.isdir(deck_dir):
+                    self.migrated += pack.import_directory(deck_dir, DeckThumbnails.parse_name)
+                    shutil.rmtree(deck_dir, ignore_errors=True)
+                self._packs[deck_dir] = pack
+            return pack
+
+    def _resolve(self, path):
+        """缩略图键 -> (缩略图包, SlideID, 版本戳)"""
+        key = DeckThumbnails.parse_name(os.path.basename(path))
+        if key is None:
+            return None
+        return self.pack(os.path.dirname(path)), key[0], key[1]
+
+    def contains(self, path, record=True):
+        resolved = self._resolve(path)
+        hit = resolved is not None and resolved[0].contains(resolved[1], resolved[2])
+        if record:
+            self.record_lookup(hit)
+        return hit
+
+    def store(self, path, export):
+        """export(临时文件路径) 导出图片后写入缩略图包"""
+        resolved = self._resolve(path)
+        if resolved is None:
+            return False
+        pack, slide_id, stamp = resolved
+        tmp_path = f"{os.path.dirname(path)}_{slide_id}_{threading.get_ident()}{DeckThumbnails.SUFFIX}"
+        try:
+            export(tmp_path)
+            with open(tmp_path, "rb") as f:
+                data = f.read()
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        pack.add(slide_id, stamp, data)
+        self.bytes += len(data)
+        return True
+
+    def read(self, path, consumer):
+        """以缩略图数据（memoryview）调用 consumer；未命中返回 None"""
+        resolved = self._resolve(path)
+        if resolved is None:
+            return None
+        pack, slide_id, stamp = resolved
+        return pack.read(slide_id, stamp, consumer)
+
+    def set_active(self, pack_path):
+        """标记正在放映的演示文稿，淘汰时跳过"""
+        with self._lock:
+            self._active = {pack_path}
+
+    def clear_active(self):
+        with self._lock:
+            self._active = set()
+
+    def record_lookup(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def scan(self):
+        """迁移旧版目录，返回 [(最近使用时间, 字节数, 缩略图包路径)]"""
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return []
+        for entry in entries:
+            if entry.is_dir():
+                self.pack(entry.path)
+        decks = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.endswith(self.PACK_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                decks.append((stat.st_mtime, stat.st_size, entry.path))
+        return decks
+
+    def compact(self):
+        """超出预算时从最久未使用的演示文稿开始删除，返回删除的缩略图包数"""
+        start = time.perf_counter()
+        decks = self.scan()
+        total = sum(size for _, size, _ in decks)
+        remaining = len(decks)
+        evicted = 0
+        for _, size, pack_path in sorted(decks):
+            if total <= self.budget_bytes:
+                break
+            with self._lock:
+                if pack_path in self._active:
+                    continue
+                pack = self._packs.pop(pack_path[:-len(self.PACK_SUFFIX)], None)
+                if pack is not None:
+                    pack.close()
+                try:
+                    os.remove(pack_path)
+                except OSError:
+                    continue
+            total -= size
+            remaining -= 1
+            evicted += 1
+        self.entries = remaining
+        self.bytes = total
+        self.evicted += evicted
+        self.compaction_time = time.perf_counter() - start
+        return evicted
+
+    def compact_in_background(self):
+        thread = threading.Thread(target=self.compact, name="ThumbnailCacheCompaction", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        with self._lock:
+            for pack in self._packs.values():
+                pack.close()
+            self._packs = {}
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        return {
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "evicted": self.evicted,
+            "migrated": self.migrated,
+            "compaction_time": self.compaction_time,
+        }
+
+
+# 全局缩略图缓存
+thumbnail_cache = ThumbnailCache()
+
@@ -0,0 +1,213 @@
+import mmap
+import os
+import struct
+import threading
+
+
+class ThumbnailPack:
+    """单文件缩略图包
+
+    文件结构：文件头（魔数、索引偏移、索引项数）+ 图片数据 + 索引表。
+    每个索引项为 (SlideID, 偏移, 长度, 指纹)，指纹即演示文稿文件的版本戳。
+    新缩略图只追加到文件末尾，索引表随后整体重写在数据之后，再更新文件头；
+    被替换或删除的数据和旧索引成为垃圾，垃圾超过有效数据时整体压缩重写。
+    读取通过 mmap 进行，按 SlideID 查找为 O(1)，交给解码器的是 mmap 上的
+    memoryview 切片，不额外复制。
+    """
+    MAGIC = b"PPTPACK1"
+    HEADER = struct.Struct("<8sQI4x")
+    FINGERPRINT_SIZE = 16
+    ENTRY = struct.Struct(f"<IQI{FINGERPRINT_SIZE}s")
+    # 每追加这么多张缩略图写一次索引
+    FLUSH_EVERY = 16
+    COMPACT_MIN_GARBAGE = 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._index = {}
+        self._file = None
+        self._map = None
+        self._end = self.HEADER.size
+        self._dirty = 0
+        self._index_size = 0
+        self.live_bytes = 0
+        self.garbage_bytes = 0
+        self._open()
+
+    def _open(self):
+        self._index = {}
+        self._index_size = 0
+        self.live_bytes = 0
+        self.garbage_bytes = 0
+        if os.path.exists(self.path):
+            self._file = open(self.path, "r+b")
+            if self._load():
+                return
+            self._file.close()
+        # 新文件或文件头损坏时重新创建
+        self._file = open(self.path, "w+b")
+        self._file.write(self.HEADER.pack(self.MAGIC, 0, 0))
+        self._file.flush()
+        self._end = self.HEADER.size
+
+    def _load(self):
+        header = self._file.read(self.HEADER.size)
+        if len(header) != self.HEADER.size:
+            return False
+        magic, index_offset, index_count = self.HEADER.unpack(header)
+        if magic != self.MAGIC:
+            return False
+        file_size = os.fstat(self._file.fileno()).st_size
+        if index_count:
+            self._file.seek(index_offset)
+            table = self._file.read(index_count * self.ENTRY.size)
+            if len(table) != index_count * self.ENTRY.size:
+                return False
+            for i in range(index_count):
+                slide_id, offset, length, fingerprint = self.ENTRY.unpack_from(table, i * self.ENTRY.size)
+                self._index[slide_id] = (offset, length, fingerprint.rstrip(b"\0").decode("ascii"))
+                self.live_bytes += length
+        # 索引之后的数据（上次退出前未写索引的追加）同样视为垃圾
+        self._end = file_size
+        self._index_size = index_count * self.ENTRY.size
+        self.garbage_bytes = file_size - self.HEADER.size - self.live_bytes - self._index_size
+        return True
+
+    def __len__(self):
+        return len(self._index)
+
+    def contains(self, slide_id, fingerprint):
+        entry = self._index.get(slide_id)
+        return entry is not None and entry[2] == fingerprint
+
+    def add(self, slide_id, fingerprint, data):
+        # 索引项中的指纹定长，更长的会被截断，之后再也匹配不上
+        if len(fingerprint.encode("ascii")) > self.FINGERPRINT_SIZE:
+            raise ValueError(f"Fingerprint too long: {fingerprint!r}")
+        with self._lock:
+            self._file.seek(self._end)
+            self._file.write(data)
+            old = self._index.get(slide_id)
+            if old is not None:
+                self.live_bytes -= old[1]
+                self.garbage_bytes += old[1]
+            self._index[slide_id] = (self._end, len(data), fingerprint)
+            self._end += len(data)
+            self.live_bytes += len(data)
+            self._dirty += 1
+            if self._dirty >= self.FLUSH_EVERY:
+                self.flush()
+
+    def flush(self):
+        """把索引表写到数据之后并更新文件头"""
+        with self._lock:
+            if not self._dirty or self._file is None:
+                return
+            index_offset = self._end
+            self._file.seek(index_offset)
+            for slide_id, (offset, length, fingerprint) in self._index.items():
+                self._file.write(self.ENTRY.pack(slide_id, offset, length, fingerprint.encode("ascii")))
+            index_size = len(self._index) * self.ENTRY.size
+            self._file.seek(0)
+            self._file.write(self.HEADER.pack(self.MAGIC, index_offset, len(self._index)))
+            self._file.flush()
+            # 下一次追加写在这份索引之后，上一份索引成为垃圾
+            self._end = index_offset + index_size
+            self.garbage_bytes += self._index_size
+            self._index_size = index_size
+            self._dirty = 0
+
+    def read(self, slide_id, fingerprint, consumer):
+        """以 memoryview 切片调用 consumer 并返回其结果；未命中返回 None
+
+        切片只在 consumer 执行期间有效。
+        """
+        with self._lock:
+            entry = self._index.get(slide_id)
+            if entry is None or entry[2] != fingerprint:
+                return None
+            offset, length, _ = entry
+            if self._map is None or offset + length > len(self._map):
+                self._remap()
+            whole = memoryview(self._map)
+            view = whole[offset:offset + length]
+            try:
+                return consumer(view)
+            finally:
+                view.release()
+                whole.release()
+
+    def _remap(self):
+        self._file.flush()
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def retain(self, valid):
+        """只保留 {SlideID: 指纹} 中仍然有效的缩略图"""
+        with self._lock:
+            for slide_id, (_, length, fingerprint) in list(self._index.items()):
+                if valid.get(slide_id) != fingerprint:
+                    del self._index[slide_id]
+                    self.live_bytes -= length
+                    self.garbage_bytes += length
+                    self._dirty += 1
+            self.flush()
+            if self.garbage_bytes >= self.COMPACT_MIN_GARBAGE and self.garbage_bytes > self.live_bytes:
+                self.compact()
+
+    def compact(self):
+        """只把有效数据重写到新文件，替换原文件"""
+        with self._lock:
+            self.flush()
+            if self._index:
+                self._remap()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as out:
+                out.write(self.HEADER.pack(self.MAGIC, 0, 0))
+                entries = []
+                for slide_id, (offset, length, fingerprint) in self._index.items():
+                    entries.append((slide_id, out.tell(), length, fingerprint))
+                    out.write(self._map[offset:offset + length])
+                index_offset = out.tell()
+                for slide_id, offset, length, fingerprint in entries:
+                    out.write(self.ENTRY.pack(slide_id, offset, length, fingerprint.encode("ascii")))
+                out.seek(0)
+                out.write(self.HEADER.pack(self.MAGIC, index_offset, len(entries)))
+            self._close_handles()
+            os.replace(tmp_path, self.path)
+            self._open()
+
+    def _close_handles(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._close_handles()
+
+    def import_directory(self, directory, parse_name):
+        """把旧版目录中的 JPG 导入包中；parse_name(文件名) 返回 (SlideID, 指纹) 或 None"""
+        imported = 0
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return 0
+        for name in names:
+            key = parse_name(name)
+            if key is None:
+                continue
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    self.add(key[0], key[1], f.read())
+                imported += 1
+            except OSError:
+                continue
+        self.flush()
+        return imported
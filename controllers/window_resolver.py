@@ -0,0 +1,91 @@
+try:
+    import win32gui
+except ImportError:
+    win32gui = None
+
+
+class WindowResolver:
+    """查找并缓存演示程序的放映窗口
+
+    缓存上次找到的放映窗口 HWND，复用前只做三次廉价校验（仍是窗口、仍可见、
+    窗口类未变）；校验失败才重新枚举所有窗口。候选窗口按固定规则排序，放映
+    窗口优先于编辑窗口；只找到编辑窗口等次优窗口时不走缓存，每次重新枚举，
+    以便放映窗口一出现就切换过去。window_api 可替换为假的窗口表以便测试，需提供
+    EnumWindows/IsWindow/IsWindowVisible/GetWindowText/GetClassName。
+    """
+    TITLE_KEYWORDS = ('wps', 'powerpoint', '演示')
+    CLASS_KEYWORDS = ('wpp', 'powerpnt', 'presentation')
+    # PowerPoint 放映窗口类为 screenClass，WPS 放映窗口类名包含 show
+    SLIDESHOW_CLASS_KEYWORDS = ('screenclass', 'show')
+    SLIDESHOW_TITLE_KEYWORDS = ('放映', 'slide show')
+
+    def __init__(self, window_api=None):
+        self.api = window_api or win32gui
+        self.hwnd = None
+        self.class_name = ""
+        self.priority = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        self.hwnd = None
+        self.class_name = ""
+        self.priority = None
+
+    def resolve(self):
+        if self.api is None:
+            return None
+        if self.hwnd is not None and self.priority == 0 and self._is_valid(self.hwnd):
+            self.hits += 1
+            return self.hwnd
+
+        self.misses += 1
+        self.invalidate()
+        candidates = self.enumerate_candidates()
+        if candidates:
+            priority, hwnd, class_name = candidates[0]
+            self.hwnd = hwnd
+            self.class_name = class_name
+            self.priority = priority
+        return self.hwnd
+
+    def _is_valid(self, hwnd):
+        try:
+            return (self.api.IsWindow(hwnd)
+                    and self.api.IsWindowVisible(hwnd)
+                    and (self.api.GetClassName(hwnd) or "") == self.class_name)
+        except Exception:
+            return False
+
+    def rank(self, title, class_name):
+        """返回排序键，越小越优先；不是演示窗口时返回 None"""
+        title_lower = title.lower()
+        class_lower = class_name.lower()
+        if not (any(keyword in title_lower for keyword in self.TITLE_KEYWORDS) or
+                any(keyword in class_lower for keyword in self.CLASS_KEYWORDS) or
+                'screenclass' in class_lower):
+            return None
+        if any(keyword in class_lower for keyword in self.SLIDESHOW_CLASS_KEYWORDS):
+            return 0
+        if any(keyword in title_lower for keyword in self.SLIDESHOW_TITLE_KEYWORDS):
+            return 1
+        if any(keyword in class_lower for keyword in self.CLASS_KEYWORDS):
+            return 2
+        return 3
+
+    def enumerate_candidates(self):
+        """枚举可见的演示窗口，返回按 (优先级, HWND) 排序的列表"""
+        candidates = []
+
+        def enum_windows_callback(hwnd, extra):
+            if self.api.IsWindowVisible(hwnd):
+                title = self.api.GetWindowText(hwnd) or ""
+                class_name = self.api.GetClassName(hwnd) or ""
+                priority = self.rank(title, class_name)
+                if priority is not None:
+                    extra.append((priority, hwnd, class_name))
+            return True
+
+        self.api.EnumWindows(enum_windows_callback, candidates)
+        candidates.sort(key=lambda item: (item[0], item[1]))
+        return candidates
@@ -0,0 +1,8 @@
+"""无头性能测试脚本
+
+每个脚本单独运行并打印结果，例如：
+
+    python -m tests.benchmarks.bench_snapshot
+
+它们不是 pytest 用例，不会在 python -m pytest 时执行。
+"""
@@ -0,0 +1,85 @@
+"""解码 500 张缓存缩略图（320x180 JPG）到卡片尺寸 130x73 的三种方式
+
+1. 界面线程完整解码后再缩放（原来的做法）
+2. 界面线程用 decode_scaled 按目标尺寸解码
+3. PixmapCache.load_async 交给解码线程池，只统计界面线程上的耗时（提交和转换）
+"""
+import os
+import tempfile
+import time
+
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImage
+
+from tests.support import (FakePresentation, fill_thumbnail_cache, get_app, process_until, save_jpeg,
+                           use_temp_thumbnail_cache)
+
+from controllers.thumbnail_cache import thumbnail_cache
+from ui.pixmap_cache import PixmapCache
+from ui.thumbnail_decoder import decode_scaled
+
+SLIDES = 500
+SIZE = QSize(130, 73)
+
+
+class TimedPixmapCache(PixmapCache):
+    """统计界面线程上把解码结果转成 QPixmap 的耗时"""
+
+    def __init__(self):
+        super().__init__()
+        self.gui_time = 0.0
+
+    def _on_decoded(self, key, image):
+        start = time.perf_counter()
+        super()._on_decoded(key, image)
+        self.gui_time += time.perf_counter() - start
+
+
+def gui_full_decode(paths):
+    start = time.perf_counter()
+    for path in paths:
+        image = QImage.fromData(thumbnail_cache.read(path, bytes))
+        image.scaled(SIZE, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return time.perf_counter() - start
+
+
+def gui_scaled_decode(paths):
+    start = time.perf_counter()
+    for path in paths:
+        decode_scaled(path, SIZE.width(), SIZE.height())
+    return time.perf_counter() - start
+
+
+def pool_decode(paths):
+    cache = TimedPixmapCache()
+    done = []
+    start = time.perf_counter()
+    for path in paths:
+        cache.load_async(path, SIZE, 1.0, lambda path, pixmap: done.append(path))
+    submit = time.perf_counter() - start
+    process_until(lambda: len(done) == len(paths), 30)
+    wall = time.perf_counter() - start
+    workers = cache.decoder._executor._max_workers
+    cache.shutdown()
+    return submit + cache.gui_time, wall, workers
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    with tempfile.TemporaryDirectory() as root:
+        use_temp_thumbnail_cache(root)
+        pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, render=save_jpeg)
+        thread = fill_thumbnail_cache(pres)
+        paths = [thread.thumb_path(index) for index in range(1, SLIDES + 1)]
+        full = gui_full_decode(paths)
+        scaled = gui_scaled_decode(paths)
+        gui, wall, workers = pool_decode(paths)
+        thumbnail_cache.close()
+    print(f"{SLIDES} thumbnails 320x180 -> {SIZE.width()}x{SIZE.height()}:")
+    print(f"  GUI thread, full decode then scale: {full * 1000:.0f} ms")
+    print(f"  GUI thread, scaled decode:          {scaled * 1000:.0f} ms")
+    print(f"  pool ({workers} workers): {gui * 1000:.0f} ms of GUI-thread time, {wall * 1000:.0f} ms wall")
+
+
+if __name__ == "__main__":
+    main()
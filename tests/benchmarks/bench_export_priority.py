@@ -0,0 +1,70 @@
+"""冷缓存下开始放映时的缩略图导出：按优先级导出 vs 基线的从第 1 页顺序导出
+
+假演示文稿 300 页，每次导出 10 ms，每次读取 Slides(i) 或 SlideID 1 ms，
+放映从第 150 页开始。“邻近页”为当前页及前后各两页。另外给出在第一张导出前
+读取全部 SlideID（之前的做法）所需的时间。
+"""
+import os
+import tempfile
+import time
+
+from tests.support import FakePresentation
+
+from controllers.slide_export import SlideExportThread
+from controllers.thumbnail_cache import ThumbnailCache
+
+SLIDES = 300
+EXPORT_DELAY = 0.01
+COM_DELAY = 0.001
+CURRENT = 150
+
+
+def run_prioritized(root):
+    pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, export_delay=EXPORT_DELAY,
+                            com_delay=COM_DELAY)
+    deck = ThumbnailCache(root=os.path.join(root, "prioritized")).deck(pres.FullName)
+    thread = SlideExportThread(deck, CURRENT, presentation_factory=lambda: pres)
+    # 直接在当前线程运行，测量的时间与后台线程中相同
+    thread.run()
+    return thread.time_to_first, thread.time_to_neighbourhood, thread.exported
+
+
+def run_sequential(root):
+    """基线版本：按页序号逐张导出，直到邻近页全部完成"""
+    pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, export_delay=EXPORT_DELAY,
+                            com_delay=COM_DELAY)
+    deck = ThumbnailCache(root=os.path.join(root, "sequential")).deck(pres.FullName)
+    start = time.perf_counter()
+    time_to_first = None
+    for index in range(1, CURRENT + SlideExportThread.NEIGHBOURHOOD + 1):
+        slide = pres.Slides(index)
+        deck.store(deck.path_for(slide.SlideID),
+                   lambda tmp_path: slide.Export(tmp_path, "JPG", *SlideExportThread.THUMB_SIZE))
+        if index == CURRENT and time_to_first is None:
+            time_to_first = time.perf_counter() - start
+    return time_to_first, time.perf_counter() - start
+
+
+def list_all_ids(root):
+    pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, com_delay=COM_DELAY)
+    start = time.perf_counter()
+    slides = pres.Slides
+    [slides(index).SlideID for index in range(1, slides.Count + 1)]
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        first, neighbourhood, exported = run_prioritized(root)
+        seq_current, seq_neighbourhood = run_sequential(root)
+        listing = list_all_ids(root)
+    print(f"{SLIDES} slides, {EXPORT_DELAY * 1000:.0f} ms per export, {COM_DELAY * 1000:.0f} ms per COM read, "
+          f"starting on slide {CURRENT}:")
+    print(f"  prioritized: first thumbnail (current slide) {first * 1000:.0f} ms, "
+          f"neighbourhood {neighbourhood * 1000:.0f} ms, {exported} slides exported in total")
+    print(f"  reading every SlideID up front would add {listing * 1000:.0f} ms before the first export")
+    print(f"  sequential:  current slide {seq_current * 1000:.0f} ms, neighbourhood {seq_neighbourhood * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""键盘模式跳页：输入页码 + 回车 vs 基线的 Home + 逐页右方向键
+
+200 页的演示中连续跳转五次。基线版本的按键数和耗时按其固定的 sleep 计算
+（激活后 0.3 秒、Home 后 0.1 秒、每个右方向键 0.05 秒），新版本用 RecordingSink
+实际运行并测量到最后一个按键发出为止的时间。
+"""
+import time
+
+from tests import support  # noqa: F401  设置 sys.path
+
+from controllers.input_injector import InputInjector, RecordingSink
+from controllers.keyboard_backend import KeyboardBackend
+
+TARGETS = [150, 3, 200, 77, 120]
+
+
+class FixedResolver:
+    def resolve(self):
+        return 1
+
+
+def legacy_cost(index):
+    """返回 (按键数, 秒)"""
+    return index, 0.3 + 0.1 + 0.05 * (index - 1)
+
+
+def main():
+    legacy_keys = sum(legacy_cost(index)[0] for index in TARGETS)
+    legacy_seconds = sum(legacy_cost(index)[1] for index in TARGETS)
+
+    sink = RecordingSink(clock=time.perf_counter)
+    backend = KeyboardBackend(injector=InputInjector(sink, clock=time.perf_counter))
+    backend.window_resolver = FixedResolver()
+    start = time.perf_counter()
+    for index in TARGETS:
+        backend.goto_slide(index)
+    submit_ms = (time.perf_counter() - start) * 1000
+    backend.close()
+    last_key = max(t for t, kind, _ in sink.events if kind == "keys")
+    print(f"jumps to {TARGETS} in a 200-slide deck:")
+    print(f"  legacy: {legacy_keys} keystrokes, {legacy_seconds:.1f} s blocking the caller")
+    print(f"  typed:  {len(sink.keys())} keystrokes, {(last_key - start) * 1000:.0f} ms until the last key, "
+          f"{submit_ms:.2f} ms blocking the caller")
+
+
+if __name__ == "__main__":
+    main()
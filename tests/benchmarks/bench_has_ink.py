@@ -0,0 +1,109 @@
+"""has_ink 在形状很多的幻灯片上的耗时：逐个遍历形状 vs 按幻灯片缓存的笔迹索引
+
+假 COM 对象每次属性读取计一次跨进程访问，并用 COM_CALL_COST 秒的忙等模拟往返开销。
+"""
+import time
+
+from tests import support  # noqa: F401  切换到 offscreen 并设置 sys.path
+
+from controllers.ppt_client import ConnectionState, PPTClient
+
+COM_CALL_COST = 20e-6
+
+
+class Com:
+    accesses = 0
+
+    @classmethod
+    def call(cls, value):
+        cls.accesses += 1
+        end = time.perf_counter() + COM_CALL_COST
+        while time.perf_counter() < end:
+            pass
+        return value
+
+
+class Shape:
+    def __init__(self, shape_type):
+        self._type = shape_type
+
+    @property
+    def Type(self):
+        return Com.call(self._type)
+
+
+class Shapes:
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def Count(self):
+        return Com.call(len(self.items))
+
+    def Item(self, index):
+        return Com.call(self.items[index - 1])
+
+    def __iter__(self):
+        for item in self.items:
+            yield Com.call(item)
+
+
+class Slide:
+    def __init__(self, shape_count, ink):
+        # 笔迹总是追加在最后
+        self.shapes = Shapes([Shape(1) for _ in range(shape_count)] + ([Shape(22)] if ink else []))
+
+    @property
+    def Shapes(self):
+        return Com.call(self.shapes)
+
+    @property
+    def SlideID(self):
+        return Com.call(256)
+
+
+class View:
+    def __init__(self, slide):
+        self.slide = slide
+
+    @property
+    def Slide(self):
+        return Com.call(self.slide)
+
+
+def legacy_has_ink(view):
+    """基线版本：每次都遍历当前页的全部形状"""
+    slide = view.Slide
+    if slide.Shapes.Count == 0:
+        return False
+    for shape in slide.Shapes:
+        if shape.Type == 22:
+            return True
+    return False
+
+
+def measure(func, repeats):
+    Com.accesses = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000, Com.accesses / repeats
+
+
+def main(shape_count=5000, repeats=20):
+    for ink in (False, True):
+        view = View(Slide(shape_count, ink))
+        client = PPTClient()
+        client.app = object()
+        client.state = ConnectionState.CONNECTED
+        client._view = view
+        legacy_ms, legacy_calls = measure(lambda: legacy_has_ink(view), repeats)
+        client.has_ink()  # 第一次扫描建立索引
+        indexed_ms, indexed_calls = measure(client.has_ink, repeats)
+        label = "ink" if ink else "no ink"
+        print(f"{shape_count} shapes, {label}: legacy {legacy_ms:.2f} ms ({legacy_calls:.0f} COM accesses), "
+              f"indexed {indexed_ms:.3f} ms ({indexed_calls:.0f} COM accesses) per call")
+
+
+if __name__ == "__main__":
+    main()
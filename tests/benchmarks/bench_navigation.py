@@ -0,0 +1,57 @@
+"""连续 20 次“下一页”：合并成一条命令 vs 每次点击一条命令
+
+模拟后端 100 页，每次调用 50 ms。
+"""
+import time
+
+from tests.support import get_app, process_until
+
+from controllers.com_worker import ComWorker
+from controllers.navigation import NavigationScheduler
+from controllers.simulated_backend import SimulatedBackend
+
+CLICKS = 20
+LATENCY = 0.05
+
+
+def run_separate():
+    backend = SimulatedBackend(slide_count=100, latency=LATENCY)
+    worker = ComWorker(lambda: backend)
+    worker.start()
+    done = []
+    start = time.perf_counter()
+    for _ in range(CLICKS):
+        worker.submit("next_slide", callback=done.append)
+    process_until(lambda: len(done) == CLICKS, 10)
+    elapsed = time.perf_counter() - start
+    worker.stop()
+    return elapsed, CLICKS, backend.current_index
+
+
+def run_coalesced():
+    backend = SimulatedBackend(slide_count=100, latency=LATENCY)
+    worker = ComWorker(lambda: backend)
+    worker.start()
+    nav = NavigationScheduler(worker)
+    nav.confirm(1, 100)
+    settled = []
+    nav.resync_requested.connect(lambda: settled.append(True))
+    start = time.perf_counter()
+    for _ in range(CLICKS):
+        nav.step(1)
+    process_until(lambda: settled, 10)
+    elapsed = time.perf_counter() - start
+    worker.stop()
+    assert nav.predicted_index == backend.current_index
+    return elapsed, nav.commands_sent, backend.current_index
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    for label, func in (("separate", run_separate), ("coalesced", run_coalesced)):
+        elapsed, commands, page = func()
+        print(f"{label}: {commands} commands, landed on slide {page}, {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
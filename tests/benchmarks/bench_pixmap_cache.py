@@ -0,0 +1,55 @@
+"""两次打开幻灯片选择器：第一次解码磁盘缓存，第二次命中共享的位图缓存
+
+假演示文稿 40 页，缩略图已在磁盘缓存中（320x180 JPG）。
+计时从创建选择器到所有可见卡片显示缩略图为止；选择器只为可见行创建卡片。
+"""
+import os
+import tempfile
+import time
+
+from tests.support import (FakePresentation, fill_thumbnail_cache, get_app, presentation_deck,
+                           process_until, save_jpeg, use_temp_thumbnail_cache)
+
+from controllers.thumbnail_cache import thumbnail_cache
+from ui.pixmap_cache import pixmap_cache
+from ui.widgets import SlideSelectorFlyout
+
+SLIDES = 40
+
+
+def open_selector(pres, exporter):
+    hits = pixmap_cache.hits
+    decoded = pixmap_cache.decoder.decoded_count if pixmap_cache.decoder else 0
+    start = time.perf_counter()
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, exporter)
+    flyout.show()
+    process_until(lambda: flyout.grid.active and all(card.has_image for card in flyout.grid.active_cards()))
+    elapsed = time.perf_counter() - start
+    cards = len(flyout.grid.active)
+    flyout.close()
+    flyout.deleteLater()
+    return {
+        "ms": elapsed * 1000,
+        "cards": cards,
+        "pixmap_hits": pixmap_cache.hits - hits,
+        "decoded": pixmap_cache.decoder.decoded_count - decoded,
+    }
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    with tempfile.TemporaryDirectory() as root:
+        use_temp_thumbnail_cache(root)
+        pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, render=save_jpeg)
+        # 选择器复用导出线程读到的 SlideID
+        exporter = fill_thumbnail_cache(pres)
+        for label in ("first open", "second open"):
+            result = open_selector(pres, exporter)
+            print(f"{label}: {result['ms']:.0f} ms, {result['cards']} cards, "
+                  f"{result['pixmap_hits']} pixmap cache hits, {result['decoded']} decodes")
+        pixmap_cache.shutdown()
+        thumbnail_cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""每个检查周期的进程检测耗时：全量扫描 vs ProcessWatcher
+
+假进程表有 1500 个进程。有演示进程时它排在最后，比较全量扫描和存活检查；
+没有演示进程时按空闲轮询间隔（5 秒，假时钟）模拟 10 分钟，比较每个周期都
+全量扫描和按 rescan_interval 扫描的次数与耗时。
+"""
+import time
+
+from tests import support  # noqa: F401  设置 sys.path
+
+from controllers.poll_scheduler import PollScheduler
+from controllers.process_watcher import ProcessWatcher
+
+PROCESS_COUNT = 1500
+IDLE_MINUTES = 10
+
+
+class FakeProcess:
+    def __init__(self, pid, name):
+        self.pid = pid
+        self.info = {"name": name}
+
+    def is_running(self):
+        return True
+
+
+def make_table(with_presentation=True):
+    table = [FakeProcess(pid, f"service{pid}.exe") for pid in range(PROCESS_COUNT - 1)]
+    if with_presentation:
+        table.append(FakeProcess(PROCESS_COUNT, "POWERPNT.EXE"))
+    return table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_process_iter(table):
+    def process_iter(attrs=None):
+        return iter(table)
+    return process_iter
+
+
+def legacy_tick(process_iter):
+    """基线版本：每个周期遍历全部进程"""
+    for proc in process_iter(['name']):
+        name = (proc.info.get('name', '') or "").lower()
+        if any(keyword in name for keyword in ProcessWatcher.KEYWORDS):
+            return True
+    return False
+
+
+def measure(func, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        assert func()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def measure_idle(process_iter):
+    """没有演示进程：按空闲轮询间隔推进假时钟，返回 (全量扫描次数, 平均每周期微秒)"""
+    ticks = int(IDLE_MINUTES * 60 * 1000 / PollScheduler.DEFAULT_INTERVALS[PollScheduler.IDLE])
+    clock = FakeClock()
+    watcher = ProcessWatcher(process_iter=process_iter, clock=clock)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        assert not watcher.is_running()
+        clock.now += PollScheduler.DEFAULT_INTERVALS[PollScheduler.IDLE] / 1000
+    return ticks, watcher.full_scans, (time.perf_counter() - start) / ticks * 1e6
+
+
+def main(ticks=200):
+    process_iter = make_process_iter(make_table())
+    legacy_us = measure(lambda: legacy_tick(process_iter), ticks)
+    watcher = ProcessWatcher(process_iter=process_iter)
+    watcher.is_running()  # 第一次全量扫描
+    steady_us = measure(watcher.is_running, ticks)
+    print(f"{PROCESS_COUNT} processes: full scan {legacy_us:.0f} us/tick, "
+          f"steady tick {steady_us:.2f} us/tick ({watcher.full_scans} full scans in {ticks + 1} ticks)")
+
+    idle_iter = make_process_iter(make_table(with_presentation=False))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        assert not legacy_tick(idle_iter)
+    legacy_idle_us = (time.perf_counter() - start) / ticks * 1e6
+    idle_ticks, scans, idle_us = measure_idle(idle_iter)
+    print(f"{PROCESS_COUNT} processes, no match, {IDLE_MINUTES} min of idle ticks ({idle_ticks} ticks): "
+          f"full scan every tick {legacy_idle_us:.0f} us/tick; watcher {scans} full scans, "
+          f"{idle_us:.0f} us/tick on average")
+
+
+if __name__ == "__main__":
+    main()
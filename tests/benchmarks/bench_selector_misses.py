@@ -0,0 +1,59 @@
+"""冷缓存下打开幻灯片选择器：缓存未命中交给后台导出服务
+
+假演示文稿 300 页，每次导出 100 ms。记录可交互时间、第一张和全部可见缩略图
+就绪的时间；0.6 秒后滚动到远处，检查已滚出视野的排队请求被取消。
+"""
+import os
+import tempfile
+import time
+
+from tests.support import (FakePresentation, get_app, presentation_deck, process_for, process_until,
+                           save_jpeg, use_temp_thumbnail_cache)
+
+from controllers.slide_export import SlideExportService
+from controllers.thumbnail_cache import thumbnail_cache
+from ui.pixmap_cache import pixmap_cache
+from ui.widgets import SlideSelectorFlyout
+
+SLIDES = 300
+EXPORT_DELAY = 0.1
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    with tempfile.TemporaryDirectory() as root:
+        use_temp_thumbnail_cache(root)
+        pres = FakePresentation(os.path.join(root, "deck.pptx"), SLIDES, export_delay=EXPORT_DELAY,
+                                render=save_jpeg)
+        service = SlideExportService(presentation_factory=lambda: pres)
+        flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, export_service=service)
+        flyout.show()
+
+        def filled():
+            return sum(card.has_image for card in flyout.grid.active_cards())
+
+        process_until(lambda: filled() > 0)
+        first = time.perf_counter() - flyout.opened_at
+        process_for(0.6 - (time.perf_counter() - flyout.opened_at))
+        pending_before = service.pending_count()
+        cancelled_before = service.cancelled
+        flyout.grid.verticalScrollBar().setValue(3000)
+        pending_after = service.pending_count()
+        cancelled = service.cancelled - cancelled_before
+        process_until(lambda: filled() == len(flyout.grid.active), 10)
+        all_visible = time.perf_counter() - flyout.opened_at
+        flyout.close()
+        print(f"{SLIDES} slides, {EXPORT_DELAY * 1000:.0f} ms per export, cold cache:")
+        print(f"  time to interactive {flyout.time_to_interactive * 1000:.0f} ms, "
+              f"first thumbnail {first * 1000:.0f} ms")
+        print(f"  scroll at 0.6 s: {pending_before} requests queued before, {pending_after} after "
+              f"({cancelled} cancelled)")
+        print(f"  all visible cards after the scroll filled at {all_visible * 1000:.0f} ms, "
+              f"{service.exported} exported in total, {service.pending_count()} pending after close")
+        service.stop()
+        pixmap_cache.shutdown()
+        thumbnail_cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""打开幻灯片选择器的耗时与卡片数量随演示文稿页数的变化
+
+缩略图已在磁盘缓存中，只测打开开销（offscreen，选择器 480x520）。
+之后滚动整个列表，检查卡片控件数量不随页数增长。
+"""
+import os
+import tempfile
+import time
+
+from tests.support import (FakePresentation, fill_thumbnail_cache, get_app, presentation_deck, save_jpeg,
+                           use_temp_thumbnail_cache)
+
+from controllers.thumbnail_cache import thumbnail_cache
+from ui.pixmap_cache import pixmap_cache
+from ui.widgets import SlidePreviewCard, SlideSelectorFlyout
+
+
+def measure(root, count):
+    pres = FakePresentation(os.path.join(root, f"deck{count}.pptx"), count, render=save_jpeg)
+    # 选择器复用导出线程读到的 SlideID
+    exporter = fill_thumbnail_cache(pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, exporter)
+    flyout.show()
+    start = time.perf_counter()
+    flyout.load_slides()
+    get_app().processEvents()
+    elapsed = time.perf_counter() - start
+    scrollbar = flyout.grid.verticalScrollBar()
+    for value in range(0, scrollbar.maximum(), 50):
+        scrollbar.setValue(value)
+    widgets = len(flyout.findChildren(SlidePreviewCard))
+    flyout.close()
+    flyout.deleteLater()
+    return elapsed, flyout.grid.cards_created, widgets
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    with tempfile.TemporaryDirectory() as root:
+        use_temp_thumbnail_cache(root)
+        for count in (50, 500, 2000):
+            elapsed, created, widgets = measure(root, count)
+            print(f"{count} slides: open {elapsed * 1000:.0f} ms, {created} cards created, {widgets} card widgets")
+        pixmap_cache.shutdown()
+        thumbnail_cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""每次心跳的 COM 访问次数：旧的逐项读取 vs PPTClient.snapshot()
+
+用计数的假 Application 统计每次属性读取和调用（每一次都是一次跨进程往返）。
+"""
+from tests.support import CountingApp
+
+from controllers.ppt_client import ConnectionState, PPTClient
+
+
+def legacy_tick(app):
+    """基线版本 check_state -> update_page_num -> sync_state 的读取顺序"""
+    # get_active_view
+    view = None
+    if app.SlideShowWindows.Count > 0:
+        view = app.SlideShowWindows(1).View
+    # update_page_num
+    current = view.Slide.SlideIndex
+    total = 0
+    if app.ActivePresentation:
+        total = app.ActivePresentation.Slides.Count
+    # sync_state
+    pointer = view.PointerType
+    return current, total, pointer
+
+
+def main(ticks=100):
+    app = CountingApp()
+    for _ in range(ticks):
+        legacy_tick(app)
+    legacy = app.counter.count / ticks
+
+    app = CountingApp()
+    client = PPTClient()
+    client.app = app
+    client.state = ConnectionState.CONNECTED
+    client.snapshot()  # 第一次解析并缓存视图和演示文稿
+    app.counter.count = 0
+    for _ in range(ticks):
+        client.snapshot()
+    snapshot = app.counter.count / ticks
+
+    print(f"COM accesses per tick: legacy {legacy:.1f}, snapshot {snapshot:.1f} (steady state, {ticks} ticks)")
+
+
+if __name__ == "__main__":
+    main()
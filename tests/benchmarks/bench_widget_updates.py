@@ -0,0 +1,101 @@
+"""静止页面上的控件重绘：按监视线程的真实轮询节奏运行
+
+模拟后端停在同一页不动，监视线程使用默认的轮询间隔（放映中 500 ms），
+page_changed / pointer_changed 像控制器一样接到页码标签和工具栏按钮上。
+统计页码标签和工具栏按钮每分钟收到的 Paint 事件数，以及 publish() 的
+快照比较跳过了多少次没有变化的快照。
+
+作为对照，再用同样的节奏不经过快照比较，直接把相同的值交给
+setText / setChecked，检查 Qt 自身是否会为未变化的值重绘。
+"""
+from PyQt6.QtCore import QEvent, QObject, QTimer
+
+from tests.support import get_app, process_for, process_until
+
+from controllers.poll_scheduler import PollScheduler
+from controllers.presentation_monitor import PresentationMonitor
+from controllers.simulated_backend import SimulatedBackend
+from ui.widgets import PageNavWidget, ToolBarWidget
+
+DURATION = 15.0
+SETTLE = 1.0
+
+
+class PaintCounter(QObject):
+    def __init__(self, widgets):
+        super().__init__()
+        self.paints = 0
+        for widget in widgets:
+            widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.paints += 1
+        return False
+
+
+def show_widgets():
+    nav = PageNavWidget()
+    toolbar = ToolBarWidget()
+    nav.show()
+    toolbar.show()
+    return nav, toolbar
+
+
+def count_paints(nav, toolbar):
+    return (PaintCounter([nav.lbl_page_num]),
+            PaintCounter([toolbar.btn_arrow, toolbar.btn_pen, toolbar.btn_eraser]))
+
+
+def per_minute(count):
+    return count / DURATION * 60
+
+
+def run_monitor():
+    nav, toolbar = show_widgets()
+    monitor = PresentationMonitor(lambda: SimulatedBackend(slide_count=20))
+    monitor.page_changed.connect(nav.update_page)
+    monitor.pointer_changed.connect(toolbar.set_pointer_mode)
+    monitor.start()
+    process_until(lambda: monitor.last_snapshot is not None)
+    process_for(SETTLE)
+    label, buttons = count_paints(nav, toolbar)
+    published, unchanged = monitor.published, monitor.unchanged
+    process_for(DURATION)
+    stats = monitor.get_publish_stats()
+    monitor.stop(timeout=5000)
+    nav.close()
+    toolbar.close()
+    return label.paints, buttons.paints, stats["published"] - published, stats["unchanged"] - unchanged
+
+
+def run_direct():
+    nav, toolbar = show_widgets()
+    nav.update_page(1, 20)
+    toolbar.set_pointer_mode(1)
+    process_for(SETTLE)
+    label, buttons = count_paints(nav, toolbar)
+    timer = QTimer()
+    timer.timeout.connect(lambda: (nav.update_page(1, 20), toolbar.set_pointer_mode(1)))
+    timer.start(PollScheduler.DEFAULT_INTERVALS[PollScheduler.SLIDESHOW])
+    process_for(DURATION)
+    timer.stop()
+    pushes = int(DURATION * 1000 / PollScheduler.DEFAULT_INTERVALS[PollScheduler.SLIDESHOW])
+    nav.close()
+    toolbar.close()
+    return label.paints, buttons.paints, pushes
+
+
+def main():
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    label, buttons, published, unchanged = run_monitor()
+    print(f"static slide, {DURATION:.0f} s at the monitor's default cadence:")
+    print(f"  monitor: {published} snapshots published, {unchanged} unchanged (no signal emitted); "
+          f"page label {per_minute(label):.0f} repaints/min, toolbar {per_minute(buttons):.0f} repaints/min")
+    label, buttons, pushes = run_direct()
+    print(f"  direct setText/setChecked with the same values, ~{pushes} pushes: "
+          f"page label {per_minute(label):.0f} repaints/min, toolbar {per_minute(buttons):.0f} repaints/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import pytest
+
+from tests.support import get_app
+
+
+@pytest.fixture(scope="session")
+def app():
+    return get_app()
+
+
+@pytest.fixture
+def thumbnail_root(tmp_path, monkeypatch):
+    """让全局缩略图缓存使用临时目录"""
+    from controllers.thumbnail_cache import thumbnail_cache
+    thumbnail_cache.close()
+    monkeypatch.setattr(thumbnail_cache, "root", str(tmp_path / "cache"))
+    yield tmp_path
+    thumbnail_cache.close()
+    thumbnail_cache.clear_active()
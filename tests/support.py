@@ -0,0 +1,316 @@
+"""测试和性能测试共用的辅助函数与假对象
+
+导入本模块时切换到 Qt offscreen 平台并把仓库根目录加入 sys.path，
+因此既可以被 pytest 使用，也可以用 python -m tests.benchmarks.xxx 直接运行。
+"""
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from PyQt6.QtCore import QCoreApplication, QObject
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+
+def get_app():
+    return QApplication.instance() or QApplication([])
+
+
+def process_until(predicate, timeout=5.0):
+    """处理 Qt 事件直到 predicate() 为真；超时返回 False"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def process_for(seconds):
+    process_until(lambda: False, seconds)
+
+
+class SignalRecorder(QObject):
+    """记录收到的信号参数；属于界面线程，跨线程信号会排队送达"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def record(self, *args):
+        self.calls.append(args)
+
+    def clear(self):
+        self.calls = []
+
+
+class FrameCounter(QObject):
+    """用定时器模拟界面帧回调，记录每一帧的时间"""
+
+    def __init__(self, interval_ms=16):
+        super().__init__()
+        from PyQt6.QtCore import QTimer
+        self.frames = []
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.interval_ms = interval_ms
+
+    def tick(self):
+        self.frames.append(time.perf_counter())
+
+    def start(self):
+        self.frames = []
+        self.timer.start(self.interval_ms)
+
+    def stop(self):
+        self.timer.stop()
+
+    def max_gap(self):
+        gaps = [b - a for a, b in zip(self.frames, self.frames[1:])]
+        return max(gaps) if gaps else 0.0
+
+
+def write_slide_bytes(slide, path, width, height):
+    """默认的导出方式：写入能识别 SlideID 的内容，便于检查缩略图是否对应正确的幻灯片"""
+    with open(path, "wb") as f:
+        f.write(f"slide-{slide._slide_id}".encode("ascii"))
+
+
+def save_jpeg(slide, path, width, height):
+    """导出真正的 JPG，供需要解码的性能测试使用"""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    slide_id = slide._slide_id
+    image.fill(QColor(slide_id % 255, (slide_id * 7) % 255, (slide_id * 13) % 255))
+    image.save(path, "JPG")
+
+
+class FakeSlide:
+    def __init__(self, presentation, slide_id):
+        self.presentation = presentation
+        self._slide_id = slide_id
+
+    @property
+    def SlideID(self):
+        self.presentation.com_call()
+        return self._slide_id
+
+    @property
+    def SlideIndex(self):
+        return self.presentation.slides.index(self) + 1
+
+    def Export(self, path, filter_name, width, height):
+        self.presentation.exports += 1
+        if self.presentation.export_delay:
+            time.sleep(self.presentation.export_delay)
+        self.presentation.render(self, path, width, height)
+
+
+class FakeSlides:
+    def __init__(self, presentation):
+        self.presentation = presentation
+
+    @property
+    def Count(self):
+        return len(self.presentation.slides)
+
+    def __call__(self, index):
+        self.presentation.com_call()
+        return self.presentation.slides[index - 1]
+
+    def FindBySlideID(self, slide_id):
+        self.presentation.com_call()
+        for slide in self.presentation.slides:
+            if slide._slide_id == slide_id:
+                return slide
+        raise LookupError(slide_id)
+
+
+class FakePresentation:
+    """模拟 COM 的 Presentation：幻灯片带有稳定的 SlideID，可插入、删除、移动和保存
+
+    full_name 指向磁盘上的一个文件，保存时改写该文件，使版本戳变化。
+    com_delay 为 Slides(i) 和 SlideID 每次读取的模拟跨进程延迟（秒）。
+    """
+
+    def __init__(self, full_name, count=0, export_delay=0.0, render=write_slide_bytes, com_delay=0.0):
+        self.FullName = full_name
+        self.com_delay = com_delay
+        self.com_calls = 0
+        # 读取过 Slides(i)/SlideID 的线程，用于确认界面线程不访问 COM
+        self.com_threads = set()
+        self.Slides = FakeSlides(self)
+        self.slides = []
+        self.export_delay = export_delay
+        self.render = render
+        self.exports = 0
+        self._next_id = 256
+        if not os.path.exists(full_name):
+            with open(full_name, "wb") as f:
+                f.write(b"deck")
+        for _ in range(count):
+            self.insert(len(self.slides) + 1)
+
+    def com_call(self):
+        self.com_calls += 1
+        self.com_threads.add(threading.get_ident())
+        if self.com_delay:
+            time.sleep(self.com_delay)
+
+    def insert(self, index):
+        slide = FakeSlide(self, self._next_id)
+        self._next_id += 1
+        self.slides.insert(index - 1, slide)
+        return slide
+
+    def delete(self, index):
+        return self.slides.pop(index - 1)
+
+    def move(self, index, to_index):
+        self.slides.insert(to_index - 1, self.slides.pop(index - 1))
+
+    def save(self):
+        with open(self.FullName, "ab") as f:
+            f.write(b"+")
+
+    def slide_ids(self):
+        return [slide._slide_id for slide in self.slides]
+
+
+def fill_thumbnail_cache(presentation):
+    """同步导出整个演示文稿的缩略图到全局缓存，返回导出线程"""
+    from controllers.slide_export import SlideExportThread
+    from controllers.thumbnail_cache import thumbnail_cache
+    thread = SlideExportThread(thumbnail_cache.deck(presentation.FullName), 1,
+                               presentation_factory=lambda: presentation)
+    thread.run()
+    return thread
+
+
+def use_temp_thumbnail_cache(root):
+    """性能测试脚本使用：让全局缩略图缓存写入临时目录"""
+    from controllers.thumbnail_cache import thumbnail_cache
+    thumbnail_cache.close()
+    thumbnail_cache.root = os.path.join(root, "cache")
+
+
+def presentation_deck(presentation):
+    """演示文稿在全局缩略图缓存中的 DeckThumbnails，供幻灯片选择器使用"""
+    from controllers.thumbnail_cache import thumbnail_cache
+    return thumbnail_cache.deck(presentation.FullName)
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def hit(self, value=None):
+        self.count += 1
+        return value
+
+
+class CountingView:
+    def __init__(self, app):
+        self._app = app
+
+    def Next(self):
+        self._app.counter.hit()
+        if self._app.failures:
+            self._app.failures -= 1
+            raise RuntimeError("RPC server unavailable")
+        self._app.current = min(self._app.current + 1, len(self._app.presentation.slides))
+
+    @property
+    def Slide(self):
+        return self._app.counter.hit(self._app.presentation.slides[self._app.current - 1])
+
+    @property
+    def PointerType(self):
+        return self._app.counter.hit(1)
+
+
+class CountingSlide:
+    def __init__(self, app, index):
+        self._app = app
+        self._index = index
+
+    @property
+    def SlideIndex(self):
+        return self._app.counter.hit(self._index)
+
+
+class CountingSlides:
+    def __init__(self, app):
+        self._app = app
+
+    @property
+    def Count(self):
+        return self._app.counter.hit(len(self._app.presentation.slides))
+
+
+class CountingPresentation:
+    def __init__(self, app, count):
+        self._app = app
+        self.slides = [CountingSlide(app, i) for i in range(1, count + 1)]
+        self._slides = CountingSlides(app)
+
+    @property
+    def Slides(self):
+        return self._app.counter.hit(self._slides)
+
+    @property
+    def FullName(self):
+        return self._app.counter.hit("C:\\deck.pptx")
+
+
+class CountingWindow:
+    def __init__(self, app):
+        self._app = app
+
+    @property
+    def View(self):
+        self._app.view_resolves += 1
+        return self._app.counter.hit(self._app.view)
+
+
+class CountingWindows:
+    def __init__(self, app):
+        self._app = app
+
+    @property
+    def Count(self):
+        return self._app.counter.hit(1)
+
+    def __call__(self, index):
+        return self._app.counter.hit(CountingWindow(self._app))
+
+
+class CountingApp:
+    """计数的假 PowerPoint Application：每次属性读取和调用都计一次跨进程访问
+
+    view_resolves 统计解析放映视图（SlideShowWindows(1).View）的次数；
+    failures 为接下来 Next() 抛出异常的次数，模拟 COM 调用失败。
+    """
+
+    def __init__(self, count=30):
+        self.counter = Counter()
+        self.view_resolves = 0
+        self.failures = 0
+        self.current = 1
+        self.presentation = CountingPresentation(self, count)
+        self.view = CountingView(self)
+        self._windows = CountingWindows(self)
+
+    @property
+    def SlideShowWindows(self):
+        return self.counter.hit(self._windows)
+
+    @property
+    def ActivePresentation(self):
+        return self.counter.hit(self.presentation)
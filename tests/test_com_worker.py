@@ -0,0 +1,72 @@
+import time
+
+from PyQt6.QtCore import QThread
+
+from controllers.com_worker import ComWorker
+from controllers.simulated_backend import SimulatedBackend
+from tests.support import FrameCounter, SignalRecorder, process_until
+
+
+def test_slow_backend_does_not_block_event_loop(app):
+    backend = SimulatedBackend(slide_count=10, latency=0.3)
+    worker = ComWorker(lambda: backend)
+    worker.start()
+    frames = FrameCounter()
+    results = SignalRecorder()
+    callback_threads = []
+
+    def on_done(result):
+        callback_threads.append(QThread.currentThread())
+        results.record(result)
+
+    frames.start()
+    start = time.perf_counter()
+    for _ in range(3):
+        worker.submit("next_slide", callback=on_done)
+    submit_time = time.perf_counter() - start
+    try:
+        assert process_until(lambda: len(results.calls) == 3)
+        elapsed = time.perf_counter() - start
+    finally:
+        frames.stop()
+        worker.stop()
+
+    # 三条命令共约 0.9 秒，提交本身不等待后端
+    assert submit_time < 0.05
+    assert elapsed >= 0.9
+    assert results.calls == [(True,)] * 3
+    assert backend.current_index == 4
+    # 回调回到界面线程执行
+    assert all(thread == app.thread() for thread in callback_threads)
+    # 后端忙时界面帧回调照常进行
+    assert len(frames.frames) >= elapsed / 0.016 * 0.5
+    assert frames.max_gap() < 0.1
+
+
+def test_future_returns_result_and_exception(app):
+    worker = ComWorker(lambda: SimulatedBackend(slide_count=10))
+    worker.start()
+    try:
+        assert worker.submit("goto_slide", 5).result(timeout=2) is True
+        assert worker.submit("has_ink").result(timeout=2) is False
+        failing = worker.submit_call(lambda: 1 / 0)
+        assert isinstance(failing.exception(timeout=2), ZeroDivisionError)
+        # 失败的命令不影响后续命令
+        assert worker.submit("next_slide").result(timeout=2) is True
+        assert worker.client.current_index == 6
+    finally:
+        worker.stop()
+
+
+def test_commands_run_in_submission_order(app):
+    backend = SimulatedBackend(slide_count=30, latency=0.01)
+    worker = ComWorker(lambda: backend)
+    worker.start()
+    try:
+        futures = [worker.submit("goto_slide", 10), worker.submit("next_slide"),
+                   worker.submit("next_slide"), worker.submit("prev_slide")]
+        for future in futures:
+            future.result(timeout=2)
+    finally:
+        worker.stop()
+    assert backend.current_index == 11
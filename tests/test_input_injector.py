@@ -0,0 +1,73 @@
+import time
+
+from controllers.input_injector import InputInjector, InputSink, RecordingSink
+
+
+def test_keys_queued_together_are_one_batch():
+    sink = RecordingSink()
+    injector = InputInjector(sink)
+    injector.activate(1, settle=0.05)
+    injector.press("right", presses=2)
+    injector.hotkey("ctrl", "p")
+    injector.stop()
+    assert [event[1] for event in sink.events] == ["activate", "keys"]
+    assert sink.events[1][2] == [("right", True), ("right", False), ("right", True), ("right", False),
+                                 ("ctrl", True), ("p", True), ("p", False), ("ctrl", False)]
+    assert injector.batches_sent == 1
+
+
+def test_keys_wait_for_focus_settle_without_blocking_caller():
+    sink = RecordingSink(clock=time.perf_counter)
+    injector = InputInjector(sink, clock=time.perf_counter)
+    start = time.perf_counter()
+    injector.activate(1, settle=0.1)
+    injector.press("esc")
+    submit_time = time.perf_counter() - start
+    injector.stop()
+    activated_at = sink.events[0][0]
+    sent_at = sink.events[1][0]
+    assert submit_time < 0.01
+    assert sent_at - activated_at >= 0.1
+
+
+class SlowActivateSink(RecordingSink):
+    """激活窗口耗时 delay 秒，记录激活完成的时间"""
+
+    def __init__(self, delay):
+        super().__init__(clock=time.perf_counter)
+        self.delay = delay
+
+    def activate(self, hwnd):
+        time.sleep(self.delay)
+        self.events.append((self.clock(), "activate", hwnd))
+        return True
+
+
+def test_settle_counts_from_completed_activation():
+    sink = SlowActivateSink(0.15)
+    injector = InputInjector(sink, clock=time.perf_counter)
+    injector.activate(1, settle=0.1)
+    injector.press("right")
+    injector.activate(2, settle=0.1)
+    injector.press("left")
+    injector.stop()
+    kinds = [event[1] for event in sink.events]
+    assert kinds == ["activate", "keys", "activate", "keys"]
+    assert sink.events[1][0] - sink.events[0][0] >= 0.1
+    assert sink.events[3][0] - sink.events[2][0] >= 0.1
+
+
+def test_stop_drains_queue():
+    sink = RecordingSink()
+    injector = InputInjector(sink)
+    injector.activate(1, settle=0.2)
+    injector.write("42")
+    injector.press("enter")
+    injector.stop()
+    assert sink.keys() == ["4", "2", "enter"]
+    assert injector.pending_count() == 0
+    assert not injector._thread.is_alive()
+
+
+def test_default_sink_send_is_noop():
+    assert InputSink().send([("a", True)]) is False
@@ -0,0 +1,50 @@
+from controllers.input_injector import InputInjector, RecordingSink
+from controllers.keyboard_backend import KeyboardBackend
+
+
+class FixedResolver:
+    def __init__(self, hwnd):
+        self.hwnd = hwnd
+
+    def resolve(self):
+        return self.hwnd
+
+
+def make_backend(hwnd=20):
+    sink = RecordingSink()
+    backend = KeyboardBackend(injector=InputInjector(sink))
+    backend.window_resolver = FixedResolver(hwnd)
+    return backend, sink
+
+
+def test_goto_types_number_and_enter():
+    backend, sink = make_backend()
+    assert backend.goto_slide(12)
+    assert backend.goto_slide(10)
+    backend.close()
+    # 无论距离远近都输入页码，不用方向键
+    assert sink.keys() == ["1", "2", "enter", "1", "0", "enter"]
+    assert [event[1] for event in sink.events] == ["activate", "keys", "activate", "keys"]
+
+
+def test_goto_without_window_sends_nothing():
+    backend, sink = make_backend(hwnd=None)
+    assert backend.goto_slide(5) is False
+    backend.close()
+    assert sink.events == []
+
+
+def test_step_slides_is_one_batch():
+    backend, sink = make_backend()
+    assert backend.step_slides(-3)
+    backend.close()
+    assert sink.keys() == ["left"] * 3
+    assert len([event for event in sink.events if event[1] == "keys"]) == 1
+
+
+def test_close_delivers_queued_exit_key():
+    backend, sink = make_backend()
+    backend.exit_show()
+    backend.close()
+    assert sink.keys() == ["esc"]
+    assert not backend.injector._thread.is_alive()
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+from controllers.navigation import NavigationScheduler
+from controllers.ppt_client import ConnectionState, PPTClient
+from tests.support import SignalRecorder, process_until
+
+
+class FakeWorker:
+    """只记录提交的命令，由测试决定何时以什么结果完成"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, command, *args, callback=None):
+        self.submitted.append((command, args, callback))
+
+    def complete(self, result=True):
+        command, args, callback = self.submitted[-1]
+        callback(result)
+
+
+def make_scheduler():
+    worker = FakeWorker()
+    nav = NavigationScheduler(worker)
+    pages = SignalRecorder()
+    resyncs = SignalRecorder()
+    nav.predicted_page_changed.connect(pages.record)
+    nav.resync_requested.connect(resyncs.record)
+    nav.confirm(5, 20)
+    return nav, worker, pages, resyncs
+
+
+def test_burst_is_coalesced_into_one_command(app):
+    nav, worker, pages, _ = make_scheduler()
+    for _ in range(4):
+        nav.step(1)
+    assert pages.calls[-1] == (9, 20)
+    assert process_until(lambda: worker.submitted)
+    assert [(c, a) for c, a, _ in worker.submitted] == [("step_slides", (4,))]
+
+
+def test_confirm_while_busy_is_applied_after_resync(app):
+    nav, worker, pages, resyncs = make_scheduler()
+    nav.step(1)
+    nav.flush()
+    # 快照在命令完成前到达：记下但不覆盖预测值
+    nav.confirm(5, 20)
+    assert nav.confirmed_index == 5
+    assert nav.predicted_index == 6
+    worker.complete(True)
+    assert resyncs.calls == [()]
+    # 重新同步后的快照校准预测值，即使页码没有变化也能纠正
+    nav.confirm(5, 20)
+    assert nav.predicted_index == 5
+    assert pages.calls[-1] == (5, 20)
+
+
+def test_failed_command_falls_back_to_confirmed_page(app):
+    nav, worker, pages, resyncs = make_scheduler()
+    nav.step(1)
+    nav.step(1)
+    nav.flush()
+    assert pages.calls[-1] == (7, 20)
+    worker.complete(False)
+    assert nav.predicted_index == 5
+    assert pages.calls[-1] == (5, 20)
+    assert resyncs.calls == [()]
+
+
+def test_clicks_during_command_are_sent_after_it(app):
+    nav, worker, _, resyncs = make_scheduler()
+    nav.step(1)
+    nav.flush()
+    nav.step(1)
+    nav.step(1)
+    nav.flush()
+    assert len(worker.submitted) == 1
+    worker.complete(True)
+    # 完成时继续发送累积的位移，此时还不请求同步
+    assert [(c, a) for c, a, _ in worker.submitted] == [("step_slides", (1,)), ("step_slides", (2,))]
+    assert resyncs.calls == []
+    worker.complete(True)
+    assert resyncs.calls == [()]
+
+
+class FakeView:
+    def __init__(self, index):
+        self.Slide = SimpleNamespace(SlideIndex=index)
+        self.targets = []
+
+    def GotoSlide(self, index):
+        self.targets.append(index)
+
+
+def test_com_step_slides_clamps_to_slide_count():
+    client = PPTClient()
+    client.app = SimpleNamespace(ActivePresentation=SimpleNamespace(Slides=SimpleNamespace(Count=10)))
+    client.state = ConnectionState.CONNECTED
+    view = FakeView(8)
+    client._view = view
+    # 工作线程上的客户端从未调用 snapshot，_presentation 为空
+    assert client._presentation is None
+    assert client.step_slides(5) is True
+    assert client.step_slides(-20) is True
+    assert view.targets == [10, 1]
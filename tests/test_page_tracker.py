@@ -0,0 +1,112 @@
+from controllers.backend import PresentationSnapshot
+from controllers.page_tracker import PageTracker
+from controllers.poll_scheduler import PollScheduler
+from controllers.ppt_events import SlideShowEventSource
+from controllers.presentation_monitor import PresentationMonitor
+from controllers.simulated_backend import SimulatedBackend
+from tests.support import SignalRecorder, process_until
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def replay(events, probe_interval=1.0):
+    """按时间回放 ("cmd", 命令, 参数...) 和 ("probe", 页码, 总页数)，返回每步之后的页码"""
+    clock = FakeClock()
+    tracker = PageTracker(clock=clock, probe_interval=probe_interval)
+    tracker.start()
+    positions = []
+    for at, kind, *args in events:
+        clock.now = at
+        if kind == "cmd":
+            tracker.apply_command(*args)
+        elif tracker.probe_due():
+            tracker.apply_probe(*args)
+        positions.append(tracker.position())
+    return tracker, positions
+
+
+def test_commands_are_inferred_and_clamped():
+    tracker, positions = replay([
+        (0.0, "probe", 0, 12),
+        (1.0, "cmd", "next_slide"),
+        (1.2, "cmd", "step_slides", 4),
+        (1.4, "cmd", "goto_slide", 11),
+        (1.6, "cmd", "step_slides", 5),
+        (1.8, "cmd", "prev_slide"),
+    ])
+    assert [index for index, _ in positions] == [1, 2, 6, 11, 12, 11]
+    assert tracker.total == 12
+    assert tracker.commands_applied == 5
+
+
+def test_probe_corrects_drift_after_settle():
+    # 点击器直接翻了两页，命令推算不知道；稳定后的探测纠正漂移
+    tracker, positions = replay([
+        (0.0, "probe", 1, 20),
+        (1.0, "cmd", "next_slide"),
+        (1.2, "probe", 1, 20),   # 按键尚未送达，忽略
+        (3.0, "probe", 4, 20),
+    ])
+    assert [index for index, _ in positions] == [1, 2, 2, 4]
+    assert tracker.corrections == 1
+    assert tracker.max_drift == 2
+
+
+def test_probes_are_rate_limited():
+    tracker, positions = replay([
+        (0.0, "probe", 3, 20),
+        (0.2, "probe", 5, 20),
+        (0.9, "probe", 6, 20),
+        (1.0, "probe", 7, 20),
+    ])
+    assert [index for index, _ in positions] == [3, 3, 3, 7]
+    assert tracker.probes == 2
+
+
+def test_unknown_total_and_exit():
+    tracker, positions = replay([
+        (0.0, "probe", 0, 0),
+        (1.0, "cmd", "step_slides", 3),
+        (1.1, "cmd", "exit_show"),
+    ])
+    assert positions == [(1, 0), (4, 0), (0, 0)]
+
+
+class BlindBackend(SimulatedBackend):
+    """读不到放映视图、只能读总页数的后端，相当于WPS兼容模式的COM部分"""
+
+    def snapshot(self):
+        self._call("snapshot")
+        return PresentationSnapshot(connected=True)
+
+    def get_slide_count(self):
+        return self.slide_count
+
+
+def test_monitor_replays_commands_in_wps_mode(app):
+    monitor = PresentationMonitor(
+        lambda: BlindBackend(slide_count=30),
+        event_source=SlideShowEventSource(),
+        poll_scheduler=PollScheduler(intervals={PollScheduler.SLIDESHOW: 20, PollScheduler.APP_OPEN: 20},
+                                     min_interval=10),
+    )
+    monitor.wps_compatibility_mode = True
+    pages = SignalRecorder()
+    monitor.page_changed.connect(pages.record)
+    monitor.start()
+    try:
+        assert process_until(lambda: pages.calls == [(1, 30)])
+        monitor.record_command("next_slide")
+        assert process_until(lambda: pages.calls[-1] == (2, 30))
+        monitor.record_command("step_slides", 5)
+        assert process_until(lambda: pages.calls[-1] == (7, 30))
+        monitor.record_command("goto_slide", 40)
+        assert process_until(lambda: pages.calls[-1] == (30, 30))
+    finally:
+        monitor.stop()
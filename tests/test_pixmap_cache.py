@@ -0,0 +1,58 @@
+from PyQt6.QtCore import QSize
+
+from tests.support import FakePresentation, fill_thumbnail_cache, process_for, process_until, save_jpeg
+from ui.pixmap_cache import PixmapCache
+
+SIZE = QSize(130, 73)
+
+
+def cached_paths(root, count=3):
+    pres = FakePresentation(str(root / "deck.pptx"), count, render=save_jpeg)
+    thread = fill_thumbnail_cache(pres)
+    return [thread.thumb_path(index) for index in range(1, count + 1)]
+
+
+def test_miss_decodes_then_hits(app, thumbnail_root):
+    path = cached_paths(thumbnail_root)[0]
+    cache = PixmapCache()
+    ready = []
+    try:
+        assert cache.load_async(path, SIZE, 2.0, lambda p, pixmap: ready.append(pixmap)) is None
+        assert process_until(lambda: ready)
+        assert (ready[0].width(), ready[0].height()) == (260, 146)
+        assert ready[0].devicePixelRatio() == 2.0
+        assert cache.load_async(path, SIZE, 2.0, lambda p, pixmap: None) is ready[0]
+        assert cache.hits == 1
+    finally:
+        cache.shutdown()
+
+
+def test_cancel_drops_waiter(app, thumbnail_root):
+    paths = cached_paths(thumbnail_root, 20)
+    cache = PixmapCache()
+    ready = []
+    callback = lambda p, pixmap: ready.append(p)  # noqa: E731
+    try:
+        for path in paths:
+            cache.load_async(path, SIZE, 1.0, callback)
+        for path in paths:
+            cache.cancel(path, SIZE, 1.0, callback)
+        assert cache._waiters == {}
+        process_for(0.3)
+        assert ready == []
+        # 取消时已开始的解码结果仍会进入缓存；其余的再次请求时能正常解码
+        for path in paths:
+            if cache.load_async(path, SIZE, 1.0, callback) is not None:
+                ready.append(path)
+        assert process_until(lambda: sorted(ready) == sorted(paths))
+    finally:
+        cache.shutdown()
+
+
+def test_shutdown_clears_waiters(app, thumbnail_root):
+    path = cached_paths(thumbnail_root)[0]
+    cache = PixmapCache()
+    cache.load_async(path, SIZE, 1.0, lambda p, pixmap: None)
+    cache.shutdown()
+    assert cache.decoder is None
+    assert cache._waiters == {}
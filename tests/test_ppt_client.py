@@ -0,0 +1,74 @@
+from controllers.ppt_client import ConnectionState, PPTClient
+from tests.support import CountingApp
+
+
+class CountingClient(PPTClient):
+    """连接总是得到同一个计数的假 Application"""
+
+    def __init__(self, app):
+        super().__init__()
+        self.fake_app = app
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        self.invalidate_view()
+        self.app = self.fake_app
+        self.state = ConnectionState.CONNECTED
+        return True
+
+
+def make_client():
+    app = CountingApp(count=10)
+    client = CountingClient(app)
+    client.connect()
+    return client, app
+
+
+def test_view_is_reused():
+    client, app = make_client()
+    for _ in range(5):
+        assert client.get_current_slide_index() == 1
+    assert app.view_resolves == 1
+    assert client.get_view_cache_stats() == {"hits": 4, "misses": 1}
+
+
+def test_com_error_re_resolves_view():
+    client, app = make_client()
+    client.next_slide()
+    app.failures = 1
+    assert client.next_slide() is False
+    assert client.next_slide() is True
+    assert app.view_resolves == 2
+    assert client.get_current_slide_index() == 3
+
+
+def test_slideshow_begin_and_end_re_resolve_view():
+    client, app = make_client()
+    client.get_current_slide_index()
+    client.on_slideshow_begin()
+    client.get_current_slide_index()
+    client.on_slideshow_end()
+    client.get_current_slide_index()
+    assert app.view_resolves == 3
+    assert client.get_view_cache_stats()["misses"] == 3
+
+
+def test_mark_stale_reconnects_and_re_resolves_view():
+    client, app = make_client()
+    client.get_current_slide_index()
+    client.mark_stale()
+    assert client.get_current_slide_index() == 1
+    assert client.connects == 2
+    assert app.view_resolves == 2
+
+
+def test_snapshot_reuses_view_and_presentation():
+    client, app = make_client()
+    client.snapshot()
+    app.counter.count = 0
+    snapshot = client.snapshot()
+    assert (snapshot.current_index, snapshot.total_slides) == (1, 10)
+    # Slide、SlideIndex、Slides、Count、PointerType
+    assert app.counter.count == 5
+    assert app.view_resolves == 1
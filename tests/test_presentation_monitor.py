@@ -0,0 +1,180 @@
+import time
+
+from PyQt6.QtCore import QObject
+
+from controllers.poll_scheduler import PollScheduler
+from controllers.ppt_events import EventLatencyStats, SlideShowEventSource
+from controllers.presentation_monitor import PresentationMonitor
+from controllers.simulated_backend import SimulatedBackend
+from tests.support import FrameCounter, SignalRecorder, process_for, process_until
+
+FAST_INTERVALS = {
+    PollScheduler.IDLE: 20,
+    PollScheduler.APP_OPEN: 20,
+    PollScheduler.SLIDESHOW: 20,
+    PollScheduler.BURST: 10,
+}
+
+
+class StallingBackend(SimulatedBackend):
+    """第一次放映中的快照卡住 stall 秒，模拟演示程序无响应"""
+
+    def __init__(self, stall=2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.stall = stall
+        self.stalled = False
+
+    def snapshot(self):
+        if not self.stalled and self.snapshot_calls() > 1:
+            self.stalled = True
+            time.sleep(self.stall)
+        return super().snapshot()
+
+    def snapshot_calls(self):
+        return self.call_counts.get("snapshot", 0)
+
+
+class FailingBackend(SimulatedBackend):
+    """前 failures 次快照抛出异常"""
+
+    def __init__(self, failures=1, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def snapshot(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("COM call failed")
+        return super().snapshot()
+
+
+# 轮询间隔远大于测试时长，页码变化只能通过放映事件送达
+SLOW_INTERVALS = {mode: 10000 for mode in FAST_INTERVALS}
+
+
+class LatencyRecorder(QObject):
+    """在界面线程收到 event_delivered 时计算延迟，并记下此时已收到的页码"""
+
+    def __init__(self):
+        super().__init__()
+        self.stats = EventLatencyStats()
+        self.pages = []
+        self.pages_at_event = None
+
+    def on_page(self, current, total):
+        self.pages.append((current, total))
+
+    def on_event(self, kind, timestamp):
+        self.stats.record(kind, time.perf_counter() - timestamp)
+        self.pages_at_event = list(self.pages)
+
+
+class MonitorHarness:
+    def __init__(self, backend, intervals=FAST_INTERVALS):
+        self.backend = backend
+        self.event_source = SlideShowEventSource()
+        self.monitor = PresentationMonitor(
+            lambda: backend,
+            event_source=self.event_source,
+            poll_scheduler=PollScheduler(intervals=intervals, min_interval=10),
+        )
+        self.started = SignalRecorder()
+        self.pages = SignalRecorder()
+        self.monitor.slideshow_started.connect(self.started.record)
+        self.monitor.page_changed.connect(self.pages.record)
+
+    def __enter__(self):
+        self.monitor.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.stop(timeout=5000)
+
+
+def test_stalled_backend_does_not_block_gui(app):
+    backend = StallingBackend(stall=2.0, slide_count=10)
+    frames = FrameCounter()
+    with MonitorHarness(backend) as harness:
+        frames.start()
+        assert process_until(lambda: harness.started.calls)
+        assert process_until(lambda: backend.stalled)
+        start = time.perf_counter()
+        process_for(1.0)
+        frames.stop()
+    # 监视线程卡住的这一秒里界面帧照常进行
+    assert time.perf_counter() - start >= 1.0
+    assert len(frames.frames) >= 1.0 / 0.016 * 0.5
+    assert frames.max_gap() < 0.1
+
+
+def test_page_change_reaches_gui(app):
+    backend = SimulatedBackend(slide_count=10)
+    with MonitorHarness(backend) as harness:
+        assert process_until(lambda: harness.pages.calls)
+        assert harness.pages.calls[-1] == (1, 10)
+        backend.perform_user_action("goto", 7)
+        assert process_until(lambda: harness.pages.calls[-1] == (7, 10))
+
+
+def test_monitoring_survives_exception(app):
+    backend = FailingBackend(failures=2, slide_count=10)
+    with MonitorHarness(backend) as harness:
+        # 前两次检查抛出异常后定时器仍重新启动，之后的检查照常发出信号
+        assert process_until(lambda: harness.started.calls)
+        backend.perform_user_action("goto", 3)
+        assert process_until(lambda: harness.pages.calls and harness.pages.calls[-1] == (3, 10))
+    assert backend.failures == 0
+
+
+def test_request_sync_reemits_unchanged_page(app):
+    backend = SimulatedBackend(slide_count=10)
+    with MonitorHarness(backend) as harness:
+        assert process_until(lambda: harness.pages.calls)
+        process_for(0.1)
+        count = len(harness.pages.calls)
+        # 页码没有变化时轮询不会重复发出 page_changed
+        assert harness.pages.calls == [(1, 10)] * count
+        harness.monitor.request_sync()
+        assert process_until(lambda: len(harness.pages.calls) > count)
+        assert harness.pages.calls[-1] == (1, 10)
+
+
+def test_unchanged_snapshots_are_counted(app):
+    backend = SimulatedBackend(slide_count=10)
+    with MonitorHarness(backend) as harness:
+        assert process_until(lambda: harness.monitor.get_publish_stats()["unchanged"] >= 5)
+        stats = harness.monitor.get_publish_stats()
+        # 静止页面上只有第一次快照发出了页码，其余都被快照比较跳过
+        assert harness.pages.calls == [(1, 10)]
+        assert stats["published"] > stats["unchanged"]
+
+
+def test_slide_changed_event_latency_to_gui(app):
+    backend = SimulatedBackend(slide_count=10)
+    recorder = LatencyRecorder()
+    with MonitorHarness(backend, intervals=SLOW_INTERVALS) as harness:
+        harness.monitor.page_changed.connect(recorder.on_page)
+        harness.monitor.event_delivered.connect(recorder.on_event)
+        assert process_until(lambda: harness.started.calls)
+        wakeups = harness.monitor.poll_scheduler.wakeups_per_minute()
+        backend.perform_user_action("goto", 5)
+        harness.event_source.emit_slide_changed()
+        assert process_until(lambda: recorder.pages_at_event is not None, 1.0)
+        # 期间没有轮询，页码只能来自事件
+        assert harness.monitor.poll_scheduler.wakeups_per_minute() == wakeups
+    stats = recorder.stats.get_stats()["slide_changed"]
+    assert recorder.pages_at_event[-1] == (5, 10)
+    assert stats["count"] == 1
+    assert stats["last"] < 0.1
+
+
+def test_first_check_done_follows_slideshow_started(app):
+    backend = SimulatedBackend(slide_count=10)
+    order = SignalRecorder()
+    with MonitorHarness(backend) as harness:
+        harness.monitor.slideshow_started.connect(lambda snapshot: order.record("started"))
+        harness.monitor.first_check_done.connect(lambda: order.record("first_check_done"))
+        assert process_until(lambda: len(order.calls) == 2)
+        process_for(0.1)
+    # 只发出一次，且排在启动时已在进行的放映之后
+    assert order.calls == [("started",), ("first_check_done",)]
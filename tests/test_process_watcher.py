@@ -0,0 +1,49 @@
+from controllers.poll_scheduler import PollScheduler
+from controllers.process_watcher import ProcessWatcher
+
+IDLE_TICK = PollScheduler.DEFAULT_INTERVALS[PollScheduler.IDLE] / 1000
+
+
+class FakeProcess:
+    def __init__(self, pid, name):
+        self.pid = pid
+        self.info = {"name": name}
+
+    def is_running(self):
+        return True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_watcher(table):
+    clock = FakeClock()
+    return ProcessWatcher(process_iter=lambda attrs=None: iter(table), clock=clock), clock
+
+
+def test_idle_ticks_do_not_scan_every_time():
+    watcher, clock = make_watcher([FakeProcess(pid, f"service{pid}.exe") for pid in range(100)])
+    ticks = int(ProcessWatcher.RESCAN_INTERVAL / IDLE_TICK) * 4
+    for _ in range(ticks):
+        assert not watcher.is_running()
+        clock.now += IDLE_TICK
+    # 重新扫描间隔明显长于空闲轮询间隔，大部分周期不遍历进程表
+    assert ProcessWatcher.RESCAN_INTERVAL >= 4 * IDLE_TICK
+    assert watcher.full_scans == 4
+
+
+def test_request_rescan_finds_new_process_before_interval():
+    table = [FakeProcess(1, "explorer.exe")]
+    watcher, clock = make_watcher(table)
+    assert not watcher.is_running()
+    table.append(FakeProcess(2, "POWERPNT.EXE"))
+    clock.now += IDLE_TICK
+    assert not watcher.is_running()
+    watcher.request_rescan()
+    assert watcher.is_running()
+    assert watcher.pid() == 2
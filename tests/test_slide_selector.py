@@ -0,0 +1,126 @@
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+
+from controllers.slide_export import SlideExportService
+from tests.support import (FakePresentation, fill_thumbnail_cache, presentation_deck, process_for,
+                           process_until, save_jpeg)
+from ui.widgets import PageNavWidget, SlideSelectorFlyout
+
+
+def live_selectors(app):
+    return [w for w in app.allWidgets() if isinstance(w, SlideSelectorFlyout)]
+
+
+def close_flyouts(app):
+    for widget in app.topLevelWidgets():
+        if type(widget).__name__ == "DetachedFlyoutWindow" and widget.isVisible():
+            widget.close()
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def test_closed_selectors_are_released(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30)
+    service = SlideExportService(presentation_factory=lambda: None)
+    nav = PageNavWidget()
+    nav.slide_deck = presentation_deck(pres)
+    nav.update_page(1, 30)
+    nav.export_service = service
+    nav.show()
+    try:
+        for _ in range(5):
+            nav.show_slide_selector()
+            app.processEvents()
+            close_flyouts(app)
+        assert live_selectors(app) == []
+        assert service.receivers(service.thumbnail_ready) == 0
+    finally:
+        nav.close()
+        service.stop()
+
+
+def test_cache_miss_is_exported_in_background(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30, export_delay=0.01, render=save_jpeg)
+    service = SlideExportService(presentation_factory=lambda: pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, export_service=service)
+    flyout.show()
+    try:
+        assert process_until(lambda: flyout.grid.active)
+        # 打开时不在界面线程导出
+        assert flyout.time_to_interactive is not None
+        assert process_until(lambda: service.exported == len(flyout.grid.active))
+        # 导出完成后卡片由 thumbnail_ready 填充
+        assert process_until(lambda: all(card.has_image for card in flyout.grid.active_cards()))
+    finally:
+        flyout.close()
+        service.stop()
+
+
+def test_hidden_selector_cancels_pending_requests(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30, export_delay=0.05)
+    service = SlideExportService(presentation_factory=lambda: pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, export_service=service)
+    flyout.show()
+    try:
+        assert process_until(lambda: service.pending_count())
+        flyout.close()
+        assert service.pending_count() == 0
+        exported = service.exported
+        process_for(0.2)
+        # 最多完成关闭时正在进行的那一张
+        assert service.exported <= exported + 1
+    finally:
+        service.stop()
+
+
+def test_cached_thumbnails_need_no_export(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30)
+    fill_thumbnail_cache(pres)
+    exports = pres.exports
+    service = SlideExportService(presentation_factory=lambda: pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, export_service=service)
+    flyout.show()
+    try:
+        assert process_until(lambda: flyout.grid.active)
+        process_for(0.1)
+        assert pres.exports == exports
+        assert service.pending_count() == 0
+    finally:
+        flyout.close()
+        service.stop()
+
+
+def test_selector_reads_no_slide_ids_on_gui_thread(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30, render=save_jpeg)
+    service = SlideExportService(presentation_factory=lambda: pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, export_service=service)
+    flyout.show()
+    try:
+        assert process_until(lambda: flyout.grid.active)
+        assert process_until(lambda: all(card.has_image for card in flyout.grid.active_cards()))
+        # SlideID 由服务线程读取后经 slide_resolved 回到界面线程
+        assert threading.get_ident() not in pres.com_threads
+        assert all(index in flyout.slide_keys for index in flyout.grid.active)
+    finally:
+        flyout.close()
+        service.stop()
+
+
+def test_selector_reuses_exporter_slide_ids(app, thumbnail_root):
+    pres = FakePresentation(str(thumbnail_root / "deck.pptx"), 30, render=save_jpeg)
+    exporter = fill_thumbnail_cache(pres)
+    calls = pres.com_calls
+    service = SlideExportService(presentation_factory=lambda: pres)
+    flyout = SlideSelectorFlyout(presentation_deck(pres), pres.Slides.Count, exporter=exporter, export_service=service)
+    flyout.show()
+    try:
+        assert process_until(lambda: all(card.has_image for card in flyout.grid.active_cards()))
+        process_for(0.1)
+        # 导出线程已读过全部 SlideID，选择器不再提交任何读取请求
+        assert pres.com_calls == calls
+        assert not service.isRunning()
+    finally:
+        flyout.close()
+        service.stop()
@@ -0,0 +1,265 @@
+import os
+
+import pytest
+
+from controllers.slide_export import SlideExportThread
+from controllers.thumbnail_cache import ThumbnailCache, thumbnail_cache
+from controllers.thumbnail_pack import ThumbnailPack
+from tests.support import FakePresentation
+
+
+def export(pres):
+    """同步运行一次导出，返回导出线程"""
+    thread = SlideExportThread(thumbnail_cache.deck(pres.FullName), 1, presentation_factory=lambda: pres)
+    ready = []
+    thread.thumbnail_ready.connect(lambda index, path: ready.append((index, path)))
+    thread.run()
+    thread.ready = ready
+    return thread
+
+
+def assert_thumbnails_match(pres, thread):
+    """每页的缩略图都对应该页的 SlideID"""
+    assert sorted(index for index, _ in thread.ready) == list(range(1, len(pres.slides) + 1))
+    for index, path in thread.ready:
+        slide_id = pres.slides[index - 1].SlideID
+        assert thumbnail_cache.read(path, bytes) == f"slide-{slide_id}".encode("ascii")
+
+
+def make_deck(root, count=5):
+    return FakePresentation(str(root / "deck.pptx"), count)
+
+
+def test_first_export_then_all_cached(thumbnail_root):
+    pres = make_deck(thumbnail_root)
+    first = export(pres)
+    assert (first.exported, first.cached) == (5, 0)
+    second = export(pres)
+    assert (second.exported, second.cached) == (0, 5)
+    assert pres.exports == 5
+    assert_thumbnails_match(pres, second)
+
+
+def test_insert_exports_only_new_slide(thumbnail_root):
+    pres = make_deck(thumbnail_root)
+    export(pres)
+    pres.insert(3)
+    thread = export(pres)
+    assert (thread.exported, thread.cached) == (1, 5)
+    assert_thumbnails_match(pres, thread)
+
+
+def test_delete_and_reorder_reuse_thumbnails(thumbnail_root):
+    pres = make_deck(thumbnail_root)
+    export(pres)
+    deleted = pres.delete(2)
+    pres.move(1, 4)
+    thread = export(pres)
+    assert (thread.exported, thread.cached) == (0, 4)
+    assert_thumbnails_match(pres, thread)
+    # 完成的导出清理已删除页的缩略图
+    deck = thumbnail_cache.deck(pres.FullName)
+    assert not deck.has(deck.path_for(deleted.SlideID))
+
+
+def test_save_invalidates_deck(thumbnail_root):
+    pres = make_deck(thumbnail_root)
+    first = export(pres)
+    old_paths = [path for _, path in first.ready]
+    pres.save()
+    thread = export(pres)
+    assert (thread.exported, thread.cached) == (5, 0)
+    assert_thumbnails_match(pres, thread)
+    # 旧版本戳的缩略图已被清理
+    assert not any(thumbnail_cache.contains(path, record=False) for path in old_paths)
+
+
+def test_pack_survives_reopen(thumbnail_root):
+    pres = make_deck(thumbnail_root)
+    export(pres)
+    thumbnail_cache.close()
+    thread = export(pres)
+    assert (thread.exported, thread.cached) == (0, 5)
+    assert_thumbnails_match(pres, thread)
+
+
+class FakeExportThread:
+    created = []
+
+    def __init__(self, deck, current_index):
+        self.deck = deck
+        self.finished = type("Signal", (), {"connect": lambda self, slot: None})()
+        FakeExportThread.created.append(self)
+
+    def start(self):
+        pass
+
+
+def test_controller_re_exports_when_deck_changes(thumbnail_root, monkeypatch):
+    from types import SimpleNamespace
+
+    import controllers.business_logic as business_logic
+
+    FakeExportThread.created = []
+    monkeypatch.setattr(business_logic, "SlideExportThread", FakeExportThread)
+    monkeypatch.setattr(business_logic, "SlideExportService", lambda: None)
+    pres = make_deck(thumbnail_root)
+    controller = SimpleNamespace(
+        navigator=SimpleNamespace(confirmed_index=1),
+        nav_left=SimpleNamespace(), nav_right=SimpleNamespace(),
+        slides_loaded=False, stop_loading_slides=lambda: None, on_slides_loaded=lambda: None,
+    )
+    start = business_logic.BusinessLogicController.start_loading_slides
+
+    start(controller, pres.FullName)
+    start(controller, pres.FullName)
+    # 同一演示文稿再次开始放映不重复导出
+    assert len(FakeExportThread.created) == 1
+    pres.save()
+    start(controller, pres.FullName)
+    # 保存后版本戳变化，重新导出
+    assert len(FakeExportThread.created) == 2
+    assert FakeExportThread.created[1].deck.stamp != FakeExportThread.created[0].deck.stamp
+    # 选择器使用同一个缓存键，不再经界面线程读取 ActivePresentation
+    assert controller.nav_left.slide_deck.stamp == FakeExportThread.created[1].deck.stamp
+
+
+def make_pack(cache, name, size, mtime):
+    """创建一个含 size 字节缩略图的包，并把最近使用时间设为 mtime"""
+    deck_dir = os.path.join(cache.root, name)
+    pack = cache.pack(deck_dir)
+    pack.add(1, "stamp", b"x" * size)
+    pack.flush()
+    cache.close()
+    path = deck_dir + ThumbnailCache.PACK_SUFFIX
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_compact_evicts_least_recently_used_until_under_budget(tmp_path):
+    cache = ThumbnailCache(root=str(tmp_path))
+    packs = {name: make_pack(cache, name, 10000, mtime)
+             for name, mtime in (("old", 1000), ("older", 500), ("new", 3000), ("middle", 2000))}
+    size = os.path.getsize(packs["old"])
+    cache.budget_bytes = 2 * size
+    assert cache.compact() == 2
+    assert [name for name, path in packs.items() if os.path.exists(path)] == ["new", "middle"]
+    assert cache.get_stats()["entries"] == 2
+    assert cache.bytes == 2 * size
+    # 已在预算内时不再删除
+    assert cache.compact() == 0
+
+
+def test_compact_skips_active_deck(tmp_path):
+    cache = ThumbnailCache(root=str(tmp_path))
+    presenting = make_pack(cache, "presenting", 10000, 100)
+    other = make_pack(cache, "other", 10000, 200)
+    newest = make_pack(cache, "newest", 10000, 300)
+    cache.budget_bytes = 2 * os.path.getsize(newest)
+    cache.set_active(presenting)
+    # 最久未用的是正在放映的包，跳过它，改为删除下一个
+    assert cache.compact() == 1
+    assert os.path.exists(presenting)
+    assert not os.path.exists(other)
+    assert os.path.exists(newest)
+
+
+def test_legacy_directory_is_migrated_into_pack(tmp_path):
+    cache = ThumbnailCache(root=str(tmp_path))
+    deck_dir = os.path.join(cache.root, "deck")
+    os.makedirs(deck_dir)
+    for slide_id in (256, 257):
+        with open(os.path.join(deck_dir, f"slide_{slide_id}_abc.jpg"), "wb") as f:
+            f.write(f"legacy-{slide_id}".encode("ascii"))
+    # 更早的按页序号命名的文件无法对应到 SlideID，直接丢弃
+    with open(os.path.join(deck_dir, "slide_3.jpg"), "wb") as f:
+        f.write(b"by-index")
+    pack = cache.pack(deck_dir)
+    assert cache.migrated == 2
+    assert not os.path.exists(deck_dir)
+    assert len(pack) == 2
+    assert pack.read(257, "abc", bytes) == b"legacy-257"
+    cache.close()
+    # 重新打开后数据仍在
+    assert cache.pack(deck_dir).read(256, "abc", bytes) == b"legacy-256"
+    cache.close()
+
+
+def test_retain_compacts_when_garbage_dominates(tmp_path, monkeypatch):
+    monkeypatch.setattr(ThumbnailPack, "COMPACT_MIN_GARBAGE", 0)
+    pack = ThumbnailPack(str(tmp_path / "deck.pack"))
+    for slide_id in range(1, 6):
+        pack.add(slide_id, "v1", bytes([slide_id]) * 1000)
+    pack.flush()
+    size_before = os.path.getsize(pack.path)
+    pack.retain({1: "v1", 2: "v1"})
+    assert os.path.getsize(pack.path) < size_before
+    assert pack.garbage_bytes == 0
+    assert len(pack) == 2
+    assert pack.read(2, "v1", bytes) == b"\x02" * 1000
+    assert pack.read(3, "v1", bytes) is None
+    pack.close()
+
+
+def test_retain_keeps_garbage_below_threshold(tmp_path):
+    pack = ThumbnailPack(str(tmp_path / "deck.pack"))
+    for slide_id in range(1, 4):
+        pack.add(slide_id, "v1", b"x" * 100)
+    pack.retain({1: "v1"})
+    assert pack.garbage_bytes > pack.live_bytes
+    assert len(pack) == 1
+    pack.close()
+
+
+def test_reopen_ignores_unflushed_tail(tmp_path):
+    path = str(tmp_path / "deck.pack")
+    pack = ThumbnailPack(path)
+    pack.add(1, "v1", b"flushed")
+    pack.flush()
+    pack.add(2, "v1", b"appended-after-index")
+    # 模拟未写索引就退出
+    pack._close_handles()
+    pack = ThumbnailPack(path)
+    assert pack.read(1, "v1", bytes) == b"flushed"
+    assert not pack.contains(2, "v1")
+    assert pack.garbage_bytes >= len(b"appended-after-index")
+    # 之后的追加写在尾部垃圾之后，不会覆盖有效数据
+    pack.add(3, "v1", b"new")
+    pack.close()
+    pack = ThumbnailPack(path)
+    assert pack.read(1, "v1", bytes) == b"flushed"
+    assert pack.read(3, "v1", bytes) == b"new"
+    pack.close()
+
+
+def test_bad_header_recreates_pack(tmp_path):
+    path = str(tmp_path / "deck.pack")
+    with open(path, "wb") as f:
+        f.write(b"not a thumbnail pack at all")
+    pack = ThumbnailPack(path)
+    assert len(pack) == 0
+    pack.add(1, "v1", b"data")
+    pack.close()
+    pack = ThumbnailPack(path)
+    assert pack.read(1, "v1", bytes) == b"data"
+    pack.close()
+
+
+def test_truncated_index_recreates_pack(tmp_path):
+    path = str(tmp_path / "deck.pack")
+    pack = ThumbnailPack(path)
+    pack.add(1, "v1", b"data")
+    pack.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 4)
+    pack = ThumbnailPack(path)
+    assert len(pack) == 0
+    pack.close()
+
+
+def test_long_fingerprint_is_rejected(tmp_path):
+    pack = ThumbnailPack(str(tmp_path / "deck.pack"))
+    pack.add(1, "x" * ThumbnailPack.FINGERPRINT_SIZE, b"data")
+    with pytest.raises(ValueError):
+        pack.add(2, "x" * (ThumbnailPack.FINGERPRINT_SIZE + 1), b"data")
+    pack.close()
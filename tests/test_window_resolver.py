@@ -0,0 +1,68 @@
+from controllers.window_resolver import WindowResolver
+
+
+class FakeWindowApi:
+    """假窗口表：hwnd -> (标题, 类名, 是否可见)，并统计枚举次数"""
+
+    def __init__(self, windows):
+        self.windows = dict(windows)
+        self.enumerations = 0
+
+    def EnumWindows(self, callback, extra):
+        self.enumerations += 1
+        for hwnd in list(self.windows):
+            callback(hwnd, extra)
+
+    def IsWindow(self, hwnd):
+        return hwnd in self.windows
+
+    def IsWindowVisible(self, hwnd):
+        return hwnd in self.windows and self.windows[hwnd][2]
+
+    def GetWindowText(self, hwnd):
+        return self.windows[hwnd][0]
+
+    def GetClassName(self, hwnd):
+        return self.windows[hwnd][1]
+
+
+EDITOR = (10, ("Deck.pptx - PowerPoint", "PPTFrameClass", True))
+SLIDESHOW = (20, ("PowerPoint 幻灯片放映 - Deck.pptx", "screenClass", True))
+NOTEPAD = (5, ("notes.txt - Notepad", "Notepad", True))
+
+
+def test_slideshow_window_is_cached():
+    api = FakeWindowApi([NOTEPAD, EDITOR, SLIDESHOW])
+    resolver = WindowResolver(api)
+    assert resolver.resolve() == 20
+    for _ in range(5):
+        assert resolver.resolve() == 20
+    assert api.enumerations == 1
+    assert resolver.hits == 5
+
+
+def test_slideshow_replaces_cached_editor_window():
+    api = FakeWindowApi([NOTEPAD, EDITOR])
+    resolver = WindowResolver(api)
+    assert resolver.resolve() == 10
+    # 只找到编辑窗口时不走缓存，放映窗口一出现就切换过去
+    assert resolver.resolve() == 10
+    assert api.enumerations == 2
+    api.windows[SLIDESHOW[0]] = SLIDESHOW[1]
+    assert resolver.resolve() == 20
+    assert resolver.resolve() == 20
+    assert api.enumerations == 3
+
+
+def test_closed_slideshow_window_is_re_resolved():
+    api = FakeWindowApi([EDITOR, SLIDESHOW])
+    resolver = WindowResolver(api)
+    assert resolver.resolve() == 20
+    del api.windows[20]
+    assert resolver.resolve() == 10
+    assert resolver.misses == 2
+
+
+def test_no_candidate_returns_none():
+    resolver = WindowResolver(FakeWindowApi([NOTEPAD]))
+    assert resolver.resolve() is None
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtGui import QPixmap
+
+from controllers.thumbnail_cache import thumbnail_cache
+from .thumbnail_decoder import ThumbnailDecoder
+
+
+class PixmapCache(QObject):
+    """进程内共享的缩略图 QPixmap LRU 缓存
+
+    缓存的是已解码并缩放到显示尺寸的位图，键为 (缩略图路径, 宽, 高, 设备像素比)；
+    缩略图路径本身已包含演示文稿目录、SlideID 和文件版本戳。再次打开幻灯片
+    选择器时命中缓存，不读磁盘也不解码。总占用超过 budget_mb 时淘汰最久未用的项。
+    未命中时由解码线程池按目标尺寸解码，界面线程只做 QImage 到 QPixmap 的转换。
+    """
+    DEFAULT_BUDGET_MB = 32
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        super().__init__()
+        self.decoder = None
+        self._waiters = {}
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._items = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path, size, dpr):
+        return (path, size.width(), size.height(), dpr)
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key):
+        pixmap = self._items.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.resident_bytes -= self.pixmap_bytes(old)
+        self._items[key] = pixmap
+        self.resident_bytes += self.pixmap_bytes(pixmap)
+        while self.resident_bytes > self.budget_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.resident_bytes -= self.pixmap_bytes(evicted)
+            self.evictions += 1
+
+    def load_async(self, path, size, dpr, callback):
+        """命中时直接返回位图；未命中时交给解码线程池，完成后在界面线程调用 callback(path, pixmap)"""
+        key = self.make_key(path, size, dpr)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            return pixmap
+        if not path or not thumbnail_cache.contains(path, record=False):
+            return None
+        if self.decoder is None:
+            self.decoder = ThumbnailDecoder()
+            self.decoder.decoded.connect(self._on_decoded)
+        self._waiters.setdefault(key, []).append(callback)
+        self.decoder.request(key, path, round(size.width() * dpr), round(size.height() * dpr))
+        return None
+
+    def cancel(self, path, size, dpr, callback):
+        """撤销 load_async 登记的回调；没有其他等待者时丢弃尚未开始的解码"""
+        key = self.make_key(path, size, dpr)
+        callbacks = self._waiters.get(key)
+        if not callbacks or callback not in callbacks:
+            return
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._waiters[key]
+            self.decoder.cancel(key)
+
+    def shutdown(self):
+        if self.decoder is not None:
+            self.decoder.shutdown()
+            self.decoder = None
+        self._waiters.clear()
+
+    def _on_decoded(self, key, image):
+        callbacks = self._waiters.pop(key, [])
+        if image is None:
+            return
+        pixmap = self._store(key, image, key[3])
+        for callback in callbacks:
+            callback(key[0], pixmap)
+
+    def _store(self, key, image, dpr):
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        self.put(key, pixmap)
+        return pixmap
+
+    def clear(self):
+        self._items.clear()
+        self.resident_bytes = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        return {
+            "entries": len(self._items),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "evictions": self.evictions,
+            "decoded": self.decoder.decoded_count if self.decoder else 0,
+            "decode_time": self.decoder.decode_time if self.decoder else 0.0,
+        }
+
+
+# 全局缩略图位图缓存（只能在界面线程使用）
+pixmap_cache = PixmapCache()
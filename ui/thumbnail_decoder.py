@@ -0,0 +1,83 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QBuffer, QByteArray, QIODevice, QSize, pyqtSignal
+from PyQt6.QtGui import QImageReader
+
+from controllers.thumbnail_cache import thumbnail_cache
+
+
+def decode_scaled(path, width, height):
+    """从缩略图包解码出 width x height（物理像素）的 QImage；没有缩略图返回 None
+
+    QImageReader.setScaledSize 让 JPEG 解码器直接按目标尺寸解码，不会先
+    解出 320x180 的整图再缩放。
+    """
+    # 在缩略图包的锁内只复制压缩数据（十几 KB），解码在锁外进行，多个线程不会互相等待
+    data = thumbnail_cache.read(path, bytes)
+    if data is None:
+        return None
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setScaledSize(QSize(width, height))
+    image = reader.read()
+    return None if image.isNull() else image
+
+
+class ThumbnailDecoder(QObject):
+    """缩略图解码线程池
+
+    解码在工作线程中进行，结果 (键, QImage) 通过 decoded 信号回到界面线程，
+    界面线程只需把 QImage 转成 QPixmap。键为 (缩略图路径, 物理宽, 物理高, 其他)，
+    同一个键同时只解码一次；cancel 可丢弃尚未开始的请求。
+    """
+    decoded = pyqtSignal(object, object)
+
+    WORKERS = 2
+
+    def __init__(self, workers=WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ThumbnailDecoder")
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._cancelled = set()
+        self.decoded_count = 0
+        self.decode_time = 0.0
+
+    def request(self, key, path, width, height):
+        with self._lock:
+            self._cancelled.discard(key)
+            if key in self._in_flight:
+                return
+            self._in_flight.add(key)
+        self._executor.submit(self._decode, key, path, width, height)
+
+    def cancel(self, key):
+        with self._lock:
+            if key in self._in_flight:
+                self._cancelled.add(key)
+
+    def _decode(self, key, path, width, height):
+        with self._lock:
+            if key in self._cancelled:
+                self._cancelled.discard(key)
+                self._in_flight.discard(key)
+                return
+        start = time.perf_counter()
+        try:
+            image = decode_scaled(path, width, height)
+        except Exception as e:
+            print(f"Thumbnail decode error: {e}")
+            image = None
+        with self._lock:
+            self._in_flight.discard(key)
+            self._cancelled.discard(key)
+            self.decoded_count += 1
+            self.decode_time += time.perf_counter() - start
+        self.decoded.emit(key, image)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
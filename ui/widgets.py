@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QButtonGroup, 
                              QLabel, QFrame, QPushButton, QGridLayout, QStackedWidget,
                              QScrollArea, QSizePolicy)
@@ -7,14 +8,16 @@ from PyQt6.QtCore import (Qt, QSize, pyqtSignal, QEvent, QRect, QPropertyAnimati
                           QEasingCurve, QAbstractAnimation, QTimer, QSequentialAnimationGroup, 
                           QPoint, QPointF, QThread)
 from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QPen, QPainterPath
+from PyQt6 import sip
 from qfluentwidgets import (TransparentToolButton, ToolButton, SpinBox,
                             PrimaryPushButton, PushButton, TabWidget,
                             ToolTipFilter, ToolTipPosition, Flyout, FlyoutAnimationType,
                             Pivot, SegmentedWidget, TimePicker, Theme, isDarkTheme,
                             FluentIcon, StrongBodyLabel, TitleLabel, LargeTitleLabel,
-                            BodyLabel, CaptionLabel, IndeterminateProgressRing,
-                            SmoothScrollArea, FlowLayout)
+                            BodyLabel, CaptionLabel,
+                            SmoothScrollArea)
 from qfluentwidgets.components.material import AcrylicFlyout
+from .pixmap_cache import pixmap_cache
 from .detached_flyout import DetachedFlyoutWindow
 
 def icon_path(name):
@@ -160,9 +163,6 @@ class SlidePreviewCard(QFrame):
         self.img_label = QLabel()
         self.img_label.setFixedSize(130, 73) # 16:9 approx
         self.img_label.setStyleSheet("background-color: rgba(128, 128, 128, 0.2); border-radius: 4px;")
-        self.img_label.setScaledContents(True)
-        if image_path and os.path.exists(image_path):
-            self.img_label.setPixmap(QPixmap(image_path))
             
         self.txt_label = CaptionLabel(f"{index}", self)
         self.txt_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -170,40 +170,178 @@ class SlidePreviewCard(QFrame):
         layout.addWidget(self.img_label)
         layout.addWidget(self.txt_label)
         
+        self.image_path = None
+        self.has_image = False
+        self.set_image(image_path)
+        
+    def bind(self, index, image_path):
+        """回收复用时重新绑定到另一页"""
+        self.release()
+        self.index = index
+        self.txt_label.setText(f"{index}")
+        self.img_label.clear()
+        self.has_image = False
+        self.set_image(image_path)
+        
+    def set_image(self, image_path):
+        self.image_path = image_path
+        if not image_path:
+            return
+        # 位图已按显示尺寸缩放并在进程内缓存；未命中时在解码线程池中解码，完成后再显示
+        pixmap = pixmap_cache.load_async(image_path, self.img_label.size(), self.devicePixelRatioF(),
+                                         self.on_pixmap_ready)
+        if pixmap is not None:
+            self.on_pixmap_ready(image_path, pixmap)
+
+    def release(self):
+        """撤销尚未完成的解码请求（卡片被回收或选择器关闭时）"""
+        if self.image_path and not self.has_image:
+            pixmap_cache.cancel(self.image_path, self.img_label.size(), self.devicePixelRatioF(),
+                                self.on_pixmap_ready)
+
+    def on_pixmap_ready(self, image_path, pixmap):
+        # 卡片可能已被回收复用或关闭
+        if sip.isdeleted(self) or image_path != self.image_path:
+            return
+        self.img_label.setPixmap(pixmap)
+        self.has_image = True
+
     def mousePressEvent(self, event):
         self.clicked.emit(self.index)
 
 
-class LoadingOverlay(QWidget):
-    def __init__(self, parent=None):
+class VirtualSlideGrid(SmoothScrollArea):
+    """只为可见行（加少量预留行）创建卡片的幻灯片网格
+
+    滚动时超出范围的卡片被回收并重新绑定到新进入范围的页，卡片数量只与
+    视口大小有关，与幻灯片总数无关。bind_card(card, index) 负责把卡片绑定
+    到第 index 页（设置缩略图等）。
+    """
+    card_clicked = pyqtSignal(int)
+    visible_changed = pyqtSignal(list)
+
+    CARD_WIDTH = 140
+    CARD_HEIGHT = 100
+    SPACING = 12
+    OVERSCAN_ROWS = 1
+
+    def __init__(self, bind_card, parent=None):
         super().__init__(parent)
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        from PyQt6.QtWidgets import QApplication
-        self.setGeometry(QApplication.primaryScreen().geometry())
-        
-        layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        self.ring = IndeterminateProgressRing(self)
-        self.ring.setFixedSize(60, 60)
-        
-        layout.addWidget(self.ring)
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setBrush(QColor(0, 0, 0, 80)) # Reduced opacity (more transparent)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRect(self.rect())
+        self.bind_card = bind_card
+        self.count = 0
+        self.active = {}
+        self.pool = []
+        self.cards_created = 0
+        self._visible = []
+
+        self.setWidgetResizable(True)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setStyleSheet("background-color: transparent; border: none;")
+        self.container = QWidget()
+        self.container.setStyleSheet("background-color: transparent;")
+        self.setWidget(self.container)
+        self.verticalScrollBar().valueChanged.connect(self.relayout)
+
+    def columns(self):
+        width = self.viewport().width()
+        return max(1, (width + self.SPACING) // (self.CARD_WIDTH + self.SPACING))
+
+    def row_height(self):
+        return self.CARD_HEIGHT + self.SPACING
+
+    def set_count(self, count):
+        self.count = count
+        for card in list(self.active.values()):
+            self._recycle(card)
+        self.active = {}
+        self._update_height()
+        self.relayout()
+
+    def _update_height(self):
+        rows = (self.count + self.columns() - 1) // self.columns()
+        self.container.setFixedHeight(max(0, rows * self.row_height() - self.SPACING))
+
+    def scroll_to_index(self, index):
+        row = (index - 1) // self.columns()
+        self.verticalScrollBar().setValue(row * self.row_height())
+
+    def _row_range(self, overscan):
+        top = self.verticalScrollBar().value()
+        rows = (self.count + self.columns() - 1) // self.columns()
+        first = max(0, top // self.row_height() - overscan)
+        last = min(rows - 1, (top + self.viewport().height()) // self.row_height() + overscan)
+        return first, last
+
+    def relayout(self, *args):
+        if not self.count:
+            return
+        columns = self.columns()
+        first, last = self._row_range(self.OVERSCAN_ROWS)
+        wanted = range(first * columns + 1, min(self.count, (last + 1) * columns) + 1)
+
+        for index in [index for index in self.active if index not in wanted]:
+            self._recycle(self.active.pop(index))
+        for index in wanted:
+            if index in self.active:
+                continue
+            card = self.pool.pop() if self.pool else self._create_card()
+            self.bind_card(card, index)
+            row, column = divmod(index - 1, columns)
+            card.move(column * (self.CARD_WIDTH + self.SPACING), row * self.row_height())
+            card.show()
+            self.active[index] = card
+
+        first, last = self._row_range(0)
+        visible = list(range(first * columns + 1, min(self.count, (last + 1) * columns) + 1))
+        if visible != self._visible:
+            self._visible = visible
+            self.visible_changed.emit(visible)
+
+    def _create_card(self):
+        self.cards_created += 1
+        card = SlidePreviewCard(0, None, self.container)
+        card.clicked.connect(self.card_clicked.emit)
+        return card
+
+    def _recycle(self, card):
+        card.release()
+        card.hide()
+        self.pool.append(card)
+
+    def visible_indices(self):
+        return list(self._visible)
+
+    def active_cards(self):
+        return self.active.values()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_height()
+        for card in list(self.active.values()):
+            self._recycle(card)
+        self.active = {}
+        self.relayout()
 
 
 class SlideSelectorFlyout(QWidget):
     slide_selected = pyqtSignal(int)
     
-    def __init__(self, ppt_app, parent=None):
+    def __init__(self, deck, count, exporter=None, current_index=0, export_service=None, parent=None):
         super().__init__(parent)
-        self.ppt_app = ppt_app
+        self.opened_at = time.perf_counter()
+        self.time_to_interactive = None
+        # 与导出线程共用缓存键：按 SlideID 和文件版本戳定位缩略图。页数取自监视线程的快照，
+        # 选择器不在界面线程访问演示文稿
+        self.deck = deck
+        self.count = count
+        # 后台缩略图导出线程；导出中的页先显示占位，就绪后再填充
+        self.exporter = exporter
+        # 按需导出服务：整体导出结束后，缺失的缩略图交给它在后台导出
+        self.export_service = export_service
+        self.current_index = current_index
+        self.exporting = False
+        # 页序号 -> (SlideID, 缩略图路径)；取自导出线程或按需导出服务，界面线程不读取 SlideID
+        self.slide_keys = {}
         self.setFixedSize(480, 520)
         
         layout = QVBoxLayout(self)
@@ -213,61 +351,90 @@ class SlideSelectorFlyout(QWidget):
         title = StrongBodyLabel("幻灯片预览", self)
         layout.addWidget(title)
         
-        self.scroll = SmoothScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("background-color: transparent; border: none;")
+        self.grid = VirtualSlideGrid(self.bind_card)
+        self.grid.card_clicked.connect(self.on_card_clicked)
+        layout.addWidget(self.grid)
         
-        self.container = QWidget()
-        self.container.setStyleSheet("background-color: transparent;")
-        self.flow = FlowLayout(self.container)
-        self.flow.setContentsMargins(0, 0, 0, 0)
-        self.flow.setHorizontalSpacing(12)
-        self.flow.setVerticalSpacing(12)
-        
-        self.scroll.setWidget(self.container)
-        layout.addWidget(self.scroll)
+        if self.exporter is not None:
+            self.exporter.thumbnail_ready.connect(self.on_thumbnail_ready)
+        if self.export_service is not None:
+            self.export_service.thumbnail_ready.connect(self.on_thumbnail_ready)
+            self.export_service.slide_resolved.connect(self.on_slide_resolved)
+        self.grid.visible_changed.connect(self.request_visible_thumbnails)
         
-        # We will load slides in background if possible, but here we just trigger load
-        QTimer.singleShot(10, self.load_slides)
+        QTimer.singleShot(0, self.load_slides)
         
-    def get_cache_dir(self, presentation_path):
-        import hashlib
-        import os
-        try:
-            path_hash = hashlib.md5(presentation_path.encode('utf-8')).hexdigest()
-        except:
-            path_hash = "default"
-        cache_dir = os.path.join(os.environ['APPDATA'], 'PPTAssistant', 'Cache', path_hash)
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
-        return cache_dir
-
     def load_slides(self):
-        try:
-            presentation = self.ppt_app.ActivePresentation
-            slides_count = presentation.Slides.Count
-            presentation_path = presentation.FullName
-            cache_dir = self.get_cache_dir(presentation_path)
+        self.exporting = self.exporter is not None and self.exporter.isRunning()
+        self.grid.set_count(self.count)
+        if self.current_index:
+            self.grid.scroll_to_index(self.current_index)
+        self.time_to_interactive = time.perf_counter() - self.opened_at
             
-            for i in range(1, slides_count + 1):
-                slide = presentation.Slides(i)
-                thumb_path = os.path.join(cache_dir, f"slide_{i}.jpg")
-                
-                # Check if exists (assuming cache is handled by BusinessLogic or previous run)
-                # If not, we might lag here exporting. 
-                # Ideally BusinessLogic pre-caches.
-                if not os.path.exists(thumb_path):
-                    try:
-                        slide.Export(thumb_path, "JPG", 320, 180) 
-                    except:
-                        pass
-                    
-                card = SlidePreviewCard(i, thumb_path)
-                card.clicked.connect(self.on_card_clicked)
-                self.flow.addWidget(card)
-                
-        except Exception as e:
-            print(f"Error loading slides: {e}")
+    def slide_key(self, index):
+        """已知的 (SlideID, 缩略图路径)；导出线程还没读到该页时返回 None"""
+        if index not in self.slide_keys and self.exporter is not None:
+            slide_id = self.exporter.known_slide_id(index)
+            if slide_id is not None:
+                self.slide_keys[index] = (slide_id, self.deck.path_for(slide_id))
+        return self.slide_keys.get(index)
+        
+    def bind_card(self, card, index):
+        key = self.slide_key(index)
+        if key is None:
+            # SlideID 未知时先显示占位：整体导出仍在进行就等它读到该页，否则交给按需导出服务读取
+            card.bind(index, None)
+            if not self.exporting and self.export_service is not None:
+                self.export_service.request_index(index, self.deck)
+            return
+        slide_id, thumb_path = key
+        card.bind(index, thumb_path)
+        
+        # 缓存未命中时先显示占位：整体导出仍在进行就交给它，否则提交给按需导出服务
+        if not card.has_image and not self.exporting and self.export_service is not None:
+            if not self.deck.has(thumb_path):
+                self.export_service.request(index, slide_id, thumb_path)
+            
+    def request_visible_thumbnails(self, visible):
+        """把可见范围内的页提到导出队列前面，并取消已滚出范围的按需导出"""
+        if self.exporting:
+            self.exporter.request_visible(visible)
+        if self.export_service is not None:
+            self.export_service.retain({card.image_path or card.index for card in self.grid.active_cards()})
+            
+    def hideEvent(self, event):
+        # 选择器关闭后不再需要尚未开始的导出，也不再接收缩略图就绪通知
+        for source in (self.exporter, self.export_service):
+            if source is None:
+                continue
+            try:
+                source.thumbnail_ready.disconnect(self.on_thumbnail_ready)
+            except TypeError:
+                pass
+        if self.export_service is not None:
+            try:
+                self.export_service.slide_resolved.disconnect(self.on_slide_resolved)
+            except TypeError:
+                pass
+            self.export_service.cancel_all()
+        for card in self.grid.active_cards():
+            card.release()
+        super().hideEvent(event)
+        
+    def on_slide_resolved(self, index, slide_id, image_path):
+        self.slide_keys[index] = (slide_id, image_path)
+        for card in self.grid.active_cards():
+            if card.index == index and card.image_path is None:
+                card.bind(index, image_path)
+            
+    def on_thumbnail_ready(self, index, image_path):
+        # 按路径（即 SlideID）匹配卡片，导出开始后插入或移动过的页也不会错位；
+        # 还没有路径的卡片说明它的 SlideID 刚由导出线程读到
+        for card in self.grid.active_cards():
+            if card.image_path is None and card.index == index:
+                card.bind(index, image_path)
+            elif card.image_path == image_path and not card.has_image:
+                card.set_image(image_path)
             
     def on_card_clicked(self, index):
         self.slide_selected.emit(index)
@@ -393,7 +560,12 @@ class PageNavWidget(QWidget):
     
     def __init__(self, parent=None, is_right=False):
         super().__init__(parent)
-        self.ppt_app = None 
+        # 正在放映的演示文稿的缩略图缓存（DeckThumbnails），由控制器在放映开始时设置
+        self.slide_deck = None
+        self.slide_exporter = None
+        self.export_service = None
+        self.current_index = 0
+        self.total = 0
         self.is_right = is_right
         self.current_theme = Theme.DARK
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
@@ -560,10 +732,11 @@ class PageNavWidget(QWidget):
         return super().eventFilter(obj, event)
 
     def show_slide_selector(self):
-        if not self.ppt_app:
+        if self.slide_deck is None or not self.total:
             return
             
-        view = SlideSelectorFlyout(self.ppt_app)
+        view = SlideSelectorFlyout(self.slide_deck, self.total, self.slide_exporter, self.current_index,
+                                   self.export_service)
         view.slide_selected.connect(self.request_slide_jump.emit)
         
         # Ensure view has a background
@@ -574,11 +747,16 @@ class PageNavWidget(QWidget):
         view.setStyleSheet(f"SlideSelectorFlyout {{ background-color: {bg_color}; border-radius: 8px; }}")
 
         win = DetachedFlyoutWindow(view, self)
+        # 每次打开都新建选择器，关闭后连同卡片一起释放
+        win.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         view.slide_selected.connect(win.close)
         win.show_at(self.page_info_widget)
 
     def update_page(self, current, total):
-        self.lbl_page_num.setText(f"{current}/{total}")
+        self.current_index = current
+        self.total = total
+        text = f"{current}/{total or '--'}"
+        self.lbl_page_num.setText(text)
     
     def apply_settings(self):
         self.btn_prev.setToolTip("上一页")
@@ -710,6 +888,16 @@ class ToolBarWidget(QWidget):
     def mousePressEvent(self, event):
         super().mousePressEvent(event)
 
+    def set_pointer_mode(self, pointer_type):
+        """根据演示程序的指针类型同步按钮选中状态"""
+        btn = {
+            1: self.btn_arrow,
+            2: self.btn_pen,
+            5: self.btn_eraser, # Eraser
+        }.get(pointer_type)
+        if btn:
+            btn.setChecked(True)
+
     def show_pen_settings(self):
         view = PenSettingsFlyout(self)
         view.color_selected.connect(self.request_pen_color.emit)